@@ -1,6 +1,7 @@
 """コマンドライン引数"""
 
 import argparse
+import os
 
 
 class CLIArgs:
@@ -15,11 +16,19 @@ class CLIArgs:
             formatter_class=argparse.RawDescriptionHelpFormatter,
             epilog=self._epilog(),
         )
+        p.add_argument(
+            "command",
+            nargs="?",
+            choices=["snapshot", "batch"],
+            help="snapshot: 全期間の not-afk 区間をスナップショットファイルに書き出す（-o で出力先）"
+            "。batch: --input のディレクトリのエクスポートを1ファイル1人として集計し、"
+            "人の列付きCSV（-o で出力先）と人ごとの合計を出力",
+        )
         p.add_argument(
             "--month",
             "-m",
             default="this",
-            help="対象月: this(今月), last(先月), all(全期間), YYYY-MM",
+            help="対象月: this(今月), last(先月), all(全期間), YYYY-MM, YYYY-MM..YYYY-MM",
         )
         p.add_argument("--output", "-o", help="出力ファイル名")
         p.add_argument("--quiet", "-q", action="store_true", help="進捗非表示")
@@ -28,7 +37,55 @@ class CLIArgs:
         )
         p.add_argument("--html", action="store_true", help="HTML形式でブラウザ表示")
         p.add_argument(
-            "--bucket", "-b", help="使用するAFKバケットのPC名（例: Mac, PC-NAME.local）"
+            "--bucket",
+            "-b",
+            help="使用するAFKバケットのPC名（例: Mac, PC-NAME.local）"
+            "。カンマ区切りまたは all で複数PCを合算",
+        )
+        p.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help="HTMLサーバーの同時処理数（デフォルト: 8）",
+        )
+        p.add_argument(
+            "--jobs",
+            "-j",
+            type=int,
+            default=None,
+            help="勤務月ごとの並列集計プロセス数（--month=all 向け・デフォルト: 1"
+            "、batch は人ごとに並列でCPUコア数）",
+        )
+        p.add_argument(
+            "--check-holidays",
+            type=int,
+            metavar="YEAR",
+            help="規則から算出した祝日を holidays-jp API と照合して終了",
+        )
+        p.add_argument(
+            "--from-snapshot",
+            metavar="FILE",
+            help="ActivityWatch の代わりにスナップショットファイルから集計",
+        )
+        p.add_argument(
+            "--input",
+            "-i",
+            metavar="FILE",
+            help="ActivityWatch の代わりにエクスポートJSON・イベント配列・NDJSON から集計"
+            "（-b でバケットのPC名を選択）",
+        )
+        p.add_argument(
+            "--watch",
+            nargs="?",
+            const=30,
+            type=int,
+            metavar="SECONDS",
+            help="今日の行を指定秒ごと（デフォルト: 30）に差分更新し続ける（テキスト出力のみ）",
+        )
+        p.add_argument(
+            "--profile",
+            action="store_true",
+            help="処理段階ごとの所要時間を標準エラーに出力",
         )
         p.add_argument(
             "--min-event",
@@ -45,13 +102,37 @@ class CLIArgs:
             "  aw-work-hours --month=last       先月の勤務時間を出力",
             "  aw-work-hours --month=2025-11    2025年11月の勤務時間を出力",
             "  aw-work-hours --month=all        全期間の勤務時間を出力",
+            "  aw-work-hours --month=2025-01..2025-12",
+            "                                   2025年の勤務時間を週計・月計付きで出力",
+            "  aw-work-hours --month=all -j 4   全期間を4プロセスで並列集計",
             "  aw-work-hours -o work.csv        ファイルに出力",
+            "  aw-work-hours --watch            今日の勤務時間を30秒ごとに更新",
+            "  aw-work-hours snapshot -o aw.snap",
+            "                                   全期間の区間をスナップショットに書き出す",
+            "  aw-work-hours --from-snapshot aw.snap --month=2025-01..2025-12",
+            "                                   スナップショットから2025年を集計",
+            "  aw-work-hours --input aw-buckets-export.json --month=all",
+            "                                   エクスポートファイルから全期間を集計",
+            "  aw-work-hours batch --input exports/ --month=last -o team.csv",
+            "                                   チーム全員の先月をまとめてCSVに出力",
         ]
     )
 
     def _epilog(self) -> str:
         return self._EPILOG
 
+    @property
+    def command(self) -> str | None:
+        return self._args.command
+
+    @property
+    def from_snapshot(self) -> str | None:
+        return self._args.from_snapshot
+
+    @property
+    def input(self) -> str | None:
+        return self._args.input
+
     @property
     def month(self) -> str:
         return self._args.month
@@ -76,6 +157,33 @@ class CLIArgs:
     def bucket(self) -> str | None:
         return self._args.bucket
 
+    @property
+    def workers(self) -> int:
+        return max(1, self._args.workers)
+
+    @property
+    def jobs(self) -> int:
+        return max(1, self._args.jobs or 1)
+
+    @property
+    def batch_jobs(self) -> int:
+        """batch の並列数（未指定はCPUコア数）"""
+        return max(1, self._args.jobs or os.cpu_count() or 1)
+
+    @property
+    def check_holidays(self) -> int | None:
+        return self._args.check_holidays
+
+    @property
+    def watch(self) -> int | None:
+        if self._args.watch is None:
+            return None
+        return max(1, self._args.watch)
+
+    @property
+    def profile(self) -> bool:
+        return self._args.profile
+
     @property
     def min_event(self) -> int | None:
         return self._args.min_event
@@ -1,17 +1,27 @@
 """メインCLI処理"""
 
 import sys
+import time
 from datetime import date
+from pathlib import Path
 
 from ..types import APIConnectionError, CLIError
 from ..settings import Settings
 from ..domain.afk_bucket import AFKBucket
+from ..domain.event_file import EventFile
+from ..domain.event_snapshot import EventSnapshot
+from ..domain.holiday_calendar import HolidayCalendar
+from ..domain.live_work import LiveWork
 from ..domain.month_period import MonthPeriod
+from ..domain.stage_clock import StageClock
+from ..domain.team_work import TeamWork
 from ..domain.work_calendar import WorkCalendar
+from ..domain.work_day import WorkDay
+from ..domain.work_rollup import WorkRollup
 from ..domain.work_rule import WorkRule
-from ..web.work_http_server import WorkHTTPServer
 from .cli_args import CLIArgs
 from .cli_output import CLIOutput
+from .cli_watch import CLIWatch
 
 
 class CLIMain:
@@ -26,8 +36,19 @@ class CLIMain:
             self._apply_args(settings)
             WorkRule.MIN_EVENT_SECONDS = settings.min_event_seconds
             AFKBucket.set_preference(settings.bucket)
-            if self._args.html:
+            batch: bool = self._args.command == "batch"
+            if not batch and (self._args.from_snapshot or self._args.input):
+                self._use_source()
+            if self._args.command == "snapshot":
+                self._write_snapshot()
+            elif batch:
+                self._run_batch(settings)
+            elif self._args.check_holidays is not None:
+                self._check_holidays(self._args.check_holidays)
+            elif self._args.html:
                 self._run_html(settings)
+            elif self._args.watch is not None:
+                self._run_watch(settings, self._args.watch)
             else:
                 self._run_text(settings)
         except (CLIError, APIConnectionError) as e:
@@ -48,10 +69,50 @@ class CLIMain:
         if changed:
             settings.save()
 
+    def _use_source(self) -> None:
+        source: EventSnapshot | EventFile
+        if self._args.from_snapshot and self._args.input:
+            raise CLIError("--from-snapshot と --input は併用できません")
+        if self._args.from_snapshot:
+            source = EventSnapshot(Path(self._args.from_snapshot))
+            self._status(f"スナップショットから集計: {self._args.from_snapshot}")
+        else:
+            # 保存済みの --bucket（all など）ではなく、今回指定したPC名だけで選ぶ
+            source = EventFile(Path(self._args.input), self._args.bucket)
+            self._status(f"入力ファイルから集計: {self._args.input}")
+        WorkCalendar.use_source(source)
+        AFKBucket.pin(source.bucket_id)
+
+    def _write_snapshot(self) -> None:
+        path: Path = Path(self._args.output or "aw-work-hours.snapshot")
+        self._status("ActivityWatchからデータを取得中...")
+        _, _, events = WorkCalendar.from_period(MonthPeriod.parse("all"))
+        EventSnapshot.write(path, AFKBucket.id(), events.intervals)
+        self._status(f"出力完了: {path}（{len(events.intervals)}区間）")
+
+    def _run_batch(self, settings: Settings) -> None:
+        directory: Path = Path(self._args.input or "")
+        if not self._args.input or not directory.is_dir():
+            raise CLIError(
+                "batch には --input でエクスポートのディレクトリを指定してください"
+            )
+        period: MonthPeriod = MonthPeriod.parse(self._args.month)
+        team: TeamWork = TeamWork(
+            directory, period, self._args.batch_jobs, self._args.bucket
+        )
+        self._status(f"{directory} のエクスポートを人ごとに並列集計中...")
+        days: dict[str, dict[date, WorkDay]] = team.aggregate()
+        for person, message in team.failures.items():
+            print(f"警告: {person} を集計できませんでした\n{message}", file=sys.stderr)
+        CLIOutput(self._args, settings).run_team(days, period)
+
     def _run_html(self, settings: Settings) -> None:
+        # HTTPサーバー・ブラウザ起動まわりは --html のときだけ読み込む
+        from ..web.work_http_server import WorkHTTPServer
+
         AFKBucket.id()
         init_month: str | None = self._resolve_init_month()
-        server: WorkHTTPServer = WorkHTTPServer()
+        server: WorkHTTPServer = WorkHTTPServer(workers=self._args.workers)
         server.start(init_month, self._args.quiet)
 
     def _resolve_init_month(self) -> str | None:
@@ -63,15 +124,71 @@ class CLIMain:
         return None
 
     def _run_text(self, settings: Settings) -> None:
+        started: float = time.perf_counter()
         period: MonthPeriod = MonthPeriod.parse(self._args.month)
         labels: dict[str, str] = {"all": "全期間", "this": "今月", "last": "先月"}
         self._status(f"対象期間: {labels.get(self._args.month, self._args.month)}")
         self._status("ActivityWatchからデータを取得中...")
-        calendar, daily_work, events = WorkCalendar.from_period(period)
-        self._status(f"取得イベント数: {len(events.raw)}")
-        self._status(f"勤務日数: {calendar.days}")
+        days: dict[date, WorkDay] = self._work_days(period)
+        self._status(f"勤務日数: {len(days)}")
         output: CLIOutput = CLIOutput(self._args, settings)
-        output.run(calendar, daily_work, period)
+        output.run(days, period)
+        if self._args.profile:
+            self._print_profile(time.perf_counter() - started)
+
+    def _work_days(self, period: MonthPeriod) -> dict[date, WorkDay]:
+        if period.ranged and not WorkCalendar.source():
+            # 確定済みの日は日別集計キャッシュから読み、残りの日だけを集計する
+            days, recomputed = WorkRollup(AFKBucket.id()).days(period)
+            self._status(f"集計し直した日数: {recomputed}/{len(period.date_range())}")
+            return days
+        if self._args.jobs > 1:
+            calendar, daily_work, count = WorkCalendar.from_period_parallel(
+                period, self._args.jobs
+            )
+        else:
+            calendar, daily_work, events = WorkCalendar.from_period(period)
+            count = len(events.raw) or len(events.intervals)
+        self._status(f"取得した not-afk イベント数: {count}")
+        return calendar.work_days(daily_work)
+
+    def _run_watch(self, settings: Settings, interval: int) -> None:
+        # 差分更新は1つのバケットのイベント列を前提にしている
+        if self._args.output:
+            raise CLIError("--watch はテキスト出力のみ対応しています（-o と併用不可）")
+        if WorkCalendar.source():
+            raise CLIError("--watch は --from-snapshot・--input と併用できません")
+        period: MonthPeriod = MonthPeriod.parse(self._args.month)
+        if period.ranged:
+            # 行の位置は日ごとの行だけの表示を前提にしている（小計の行は書き換えられない）
+            raise CLIError("--watch は月範囲（A..B）と併用できません")
+        bucket_ids: list[str] = AFKBucket.ids()
+        if len(bucket_ids) != 1:
+            raise CLIError("--watch は1つのバケットのみ対応しています")
+        self._status("ActivityWatchからデータを取得中...")
+        calendar, daily_work, events = WorkCalendar.from_period(period)
+        live: LiveWork = LiveWork(bucket_ids[0], daily_work, events)
+        self._status(f"{interval}秒ごとに更新します（Ctrl+C で終了）")
+        watch: CLIWatch = CLIWatch(
+            live, calendar.work_days(daily_work), period, settings.no_colon
+        )
+        watch.run(interval)
+
+    def _check_holidays(self, year: int) -> None:
+        differences: list[str] = HolidayCalendar().cross_check(year)
+        for line in differences:
+            print(line)
+        if differences:
+            sys.exit(1)
+        self._status(f"{year}年の祝日は holidays-jp API と一致しました")
+
+    def _print_profile(self, elapsed: float) -> None:
+        """段階ごとの合計秒数と呼び出し回数（入れ子の段階は外側の段階にも含まれる）"""
+        lines: list[str] = ["処理段階ごとの所要時間:"]
+        for stage, (count, total) in StageClock.totals().items():
+            lines.append(f"  {stage:<16} {total:8.3f}s  x{count}")
+        lines.append(f"  {'total':<16} {elapsed:8.3f}s")
+        print("\n".join(lines), file=sys.stderr)
 
     def _status(self, msg: str) -> None:
         if not self._args.quiet:
@@ -1,13 +1,17 @@
 """CLI出力処理"""
 
 import sys
+from collections.abc import Callable
+from datetime import date
 
 from ..settings import Settings
-from ..domain.daily_work import DailyWork
 from ..domain.holiday_calendar import HolidayCalendar
 from ..domain.month_period import MonthPeriod
-from ..domain.work_calendar import WorkCalendar
+from ..domain.stage_clock import StageClock
+from ..domain.work_day import WorkDay
+from ..output.team_csv import TeamCSV
 from ..output.work_csv import WorkCSV
+from ..output.work_subtotals import WorkSubtotals
 from ..output.work_text import WorkText
 from .cli_args import CLIArgs
 
@@ -19,43 +23,43 @@ class CLIOutput:
         self._args: CLIArgs = args
         self._settings: Settings = settings
 
-    def run(
-        self, calendar: WorkCalendar, daily_work: DailyWork, period: MonthPeriod
-    ) -> None:
-        holidays: HolidayCalendar = HolidayCalendar()
+    def run(self, days: dict[date, WorkDay], period: MonthPeriod) -> None:
         if self._args.output:
-            self._write_csv(calendar, daily_work, period)
+            self._write_csv(days, period)
         else:
-            self._print_text(calendar, daily_work, period, holidays)
+            self._print_text(days, period, HolidayCalendar())
 
-    def _write_csv(
-        self, calendar: WorkCalendar, daily_work: DailyWork, period: MonthPeriod
+    def run_team(
+        self, team: dict[str, dict[date, WorkDay]], period: MonthPeriod
     ) -> None:
-        csv: WorkCSV = WorkCSV(
-            calendar.daily, daily_work.active, daily_work.gaps, period
-        )
+        """チームのCSVを書き出し、人ごとの合計を標準出力に出す"""
+        csv: TeamCSV = TeamCSV(team, period)
+        self._write(csv.content, self._args.output or "aw-work-hours-team.csv")
+        for person, days in team.items():
+            dates: list[date] = period.date_range() or sorted(days)
+            print(WorkSubtotals(days).line(person, dates))
+
+    def _write_csv(self, days: dict[date, WorkDay], period: MonthPeriod) -> None:
         assert self._args.output is not None
-        output_abspath: str = self._args.output
+        self._write(WorkCSV(days, period).content, self._args.output)
+
+    def _write(self, content: Callable[[], str], output_abspath: str) -> None:
+        with StageClock.measure("csv"):
+            text: str = content()
         with open(output_abspath, "w", encoding="utf-8-sig") as f:
-            f.write(csv.content())
+            f.write(text)
         self._status(f"出力完了: {output_abspath}")
 
     def _print_text(
         self,
-        calendar: WorkCalendar,
-        daily_work: DailyWork,
+        days: dict[date, WorkDay],
         period: MonthPeriod,
         holidays: HolidayCalendar,
     ) -> None:
-        text: WorkText = WorkText(
-            calendar.daily,
-            daily_work.active,
-            daily_work.gaps,
-            period,
-            holidays,
-            self._settings.no_colon,
-        )
-        print(text.content(), end="")
+        text: WorkText = WorkText(days, period, holidays, self._settings.no_colon)
+        with StageClock.measure("text"):
+            content: str = text.content()
+        print(content, end="")
 
     def _status(self, msg: str) -> None:
         if not self._args.quiet:
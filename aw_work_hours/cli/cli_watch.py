@@ -0,0 +1,84 @@
+"""--watch の表示更新"""
+
+import sys
+import time
+from datetime import date, datetime
+
+from ..types import _TIMEZONE, APIConnectionError
+from ..domain.holiday_calendar import HolidayCalendar
+from ..domain.live_work import LiveWork
+from ..domain.month_period import MonthPeriod
+from ..domain.work_day import WorkDay
+from ..output.work_text import WorkText
+
+
+class CLIWatch:
+    """--watch の表示更新（変わった日の行だけを書き換える）
+
+    端末ではカーソルを該当行まで戻して1行だけ再描画し、
+    端末以外（パイプ・ファイル）には変わった行を追記する。
+    接続エラーは、端末では表の直下の1行（カーソルのある行）を改行せずに上書きするため、
+    行数を数えたカーソル移動はずれない。
+    """
+
+    def __init__(
+        self,
+        live: LiveWork,
+        days: dict[date, WorkDay],
+        period: MonthPeriod,
+        no_colon: bool,
+    ) -> None:
+        self._live: LiveWork = live
+        self._days: dict[date, WorkDay] = days
+        self._text: WorkText = WorkText(days, period, HolidayCalendar(), no_colon)
+        self._dates: list[date] = []
+        self._since: datetime = datetime.now(_TIMEZONE)
+        self._status_shown: bool = False
+
+    def run(self, interval: int) -> None:
+        content: str = self._text.content()
+        sys.stdout.write(content)
+        sys.stdout.flush()
+        self._dates = [date.fromisoformat(line[:10]) for line in content.splitlines()]
+        try:
+            while True:
+                time.sleep(interval)
+                self._refresh()
+        except KeyboardInterrupt:
+            print("\n終了します", file=sys.stderr)
+
+    def _refresh(self) -> None:
+        try:
+            changed: dict[date, WorkDay] = self._live.poll(self._since)
+        except APIConnectionError as e:
+            # 一時的な接続失敗では終了せず、次の更新で取り直す
+            self._status(str(e).splitlines()[0])
+            return
+        if self._status_shown:
+            sys.stdout.write("\x1b[2K")
+            self._status_shown = False
+        self._days.update(changed)
+        for d in sorted(changed):
+            self._redraw(d)
+        sys.stdout.flush()
+
+    def _status(self, message: str) -> None:
+        """エラーの表示（端末では表の直下の行を上書きし、カーソルを次の行へ進めない）"""
+        if not (sys.stdout.isatty() and sys.stderr.isatty()):
+            print(message, file=sys.stderr)
+            return
+        sys.stdout.flush()
+        sys.stderr.write(f"\x1b[2K{message}\r")
+        sys.stderr.flush()
+        self._status_shown = True
+
+    def _redraw(self, d: date) -> None:
+        line: str = self._text.line(d)
+        if d not in self._dates or not sys.stdout.isatty():
+            # 表示範囲外の新しい日（日付が変わった場合など）は末尾に追加する
+            if d not in self._dates:
+                self._dates.append(d)
+            sys.stdout.write(line + "\n")
+            return
+        up: int = len(self._dates) - self._dates.index(d)
+        sys.stdout.write(f"\x1b[{up}F\x1b[2K{line}\x1b[{up}E")
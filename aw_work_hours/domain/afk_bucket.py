@@ -1,10 +1,11 @@
 """ActivityWatchのAFKバケット"""
 
-import json
 import urllib.error
-import urllib.request
+from datetime import datetime
 
-from ..types import _API_BASE, APIConnectionError
+from ..types import _API_BASE, _TIMEZONE, APIConnectionError
+from .afk_bucket_cache import AFKBucketCache
+from .api_client import APIClient
 from .afk_bucket_candidates import AFKBucketCandidates
 
 
@@ -13,10 +14,17 @@ class AFKBucket:
 
     _cached_id: str | None = None
     _preference: str | None = None
+    _pinned: str | None = None
 
     @classmethod
     def clear_cache(cls) -> None:
-        cls._cached_id = None
+        cls._cached_id = cls._pinned
+
+    @classmethod
+    def pin(cls, bucket_id: str | None) -> None:
+        """解決済みのバケットIDを固定する（スナップショット使用時はAPIに問い合わせない）"""
+        cls._pinned = bucket_id
+        cls._cached_id = bucket_id
 
     @classmethod
     def set_preference(cls, hostname: str | None) -> None:
@@ -24,27 +32,51 @@ class AFKBucket:
 
     @classmethod
     def id(cls) -> str:
+        """解決済みのバケットID（複数PCを指定した場合はカンマ区切り）"""
         if cls._cached_id:
             return cls._cached_id
-        afk_ids: list[str] = cls.fetch_ids()
-        cls._cached_id = cls._resolve(afk_ids)
+        # 前回の解決結果が新しければ /buckets への問い合わせ自体を省く
+        # （all は新しいPCのバケットを含められるよう、毎回 /buckets から解決する）
+        cache: AFKBucketCache = AFKBucketCache()
+        key: str = cls._preference or ""
+        resolved: object = cache.fresh("resolved").get(key)
+        if isinstance(resolved, str) and key != "all":
+            cls._cached_id = resolved
+            return resolved
+        cls._cached_id = cls._resolve(cls.fetch_ids(), cache)
+        if key != "all":
+            cache.update("resolved", {key: cls._cached_id})
         return cls._cached_id
 
+    @classmethod
+    def ids(cls) -> list[str]:
+        return cls.id().split(",")
+
     @classmethod
     def fetch_ids(cls) -> list[str]:
+        return [b for b in cls._fetch_buckets() if b.startswith("aw-watcher-afk_")]
+
+    @classmethod
+    def created(cls, bucket_id: str) -> datetime:
+        """バケットの作成日時（これより前のイベントは存在しない）"""
+        bucket: dict[str, str] = cls._fetch_buckets()[bucket_id]
+        return datetime.fromisoformat(bucket["created"]).astimezone(_TIMEZONE)
+
+    @classmethod
+    def _fetch_buckets(cls) -> dict[str, dict[str, str]]:
         url: str = f"{_API_BASE}/buckets"
         try:
-            with urllib.request.urlopen(url, timeout=10) as resp:
-                buckets: dict[str, object] = json.loads(resp.read().decode())
+            return APIClient.json(url)
         except urllib.error.URLError as e:
             raise APIConnectionError(
                 "エラー: ActivityWatch APIに接続できません\n"
                 "ActivityWatchが起動しているか確認してください\n"
                 f"詳細: {e}"
             ) from e
-        return [b for b in buckets if b.startswith("aw-watcher-afk_")]
 
     @classmethod
-    def _resolve(cls, afk_ids: list[str]) -> str:
-        candidates: AFKBucketCandidates = AFKBucketCandidates(afk_ids, cls._preference)
+    def _resolve(cls, afk_ids: list[str], cache: AFKBucketCache) -> str:
+        candidates: AFKBucketCandidates = AFKBucketCandidates(
+            afk_ids, cls._preference, cache
+        )
         return candidates.selected
@@ -0,0 +1,59 @@
+"""AFKバケット解決結果のファイルキャッシュ"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class AFKBucketCache:
+    """AFKバケット解決結果のファイルキャッシュ（TTL付き・起動をまたいで共有）
+
+    - resolved: 指定PC名（未指定は ""）→ 解決済みのバケットID
+    - last_events: バケットID → 最終イベントの開始時刻（ISO形式、データなしは None）
+    """
+
+    _PATH: Path = Path.home() / ".config" / "aw-work-hours" / "buckets.json"
+    _TTL_SECONDS: float = 60 * 60
+    _LOCK: threading.Lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self._data: dict[str, dict[str, dict[str, object]]] = self._load()
+
+    def _load(self) -> dict[str, dict[str, dict[str, object]]]:
+        try:
+            with open(self._PATH, encoding="utf-8") as f:
+                result: dict[str, dict[str, dict[str, object]]] = json.load(f)
+                return result
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def fresh(self, section: str) -> dict[str, object]:
+        """TTL内に保存された値だけを返す"""
+        now: float = time.time()
+        result: dict[str, object] = {}
+        for key, entry in self._data.get(section, {}).items():
+            saved: object = entry.get("saved")
+            if isinstance(saved, (int, float)) and now - saved < self._TTL_SECONDS:
+                result[key] = entry.get("value")
+        return result
+
+    def update(self, section: str, values: dict[str, object]) -> None:
+        """値を現在時刻つきで保存する（他のスレッド・プロセスの保存分は読み直して残す）"""
+        saved: float = time.time()
+        with self._LOCK:
+            self._data = self._load()
+            entries: dict[str, dict[str, object]] = self._data.setdefault(section, {})
+            for key, value in values.items():
+                entries[key] = {"value": value, "saved": saved}
+            self._save()
+
+    def _save(self) -> None:
+        # 読み込み途中のプロセスが壊れたファイルを見ないよう、置き換えで保存する
+        self._PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp: Path = self._PATH.with_name(f"{self._PATH.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        tmp.replace(self._PATH)
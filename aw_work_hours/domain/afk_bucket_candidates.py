@@ -1,20 +1,28 @@
 """AFKバケットの候補群"""
 
-import json
 import sys
 import urllib.error
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from ..types import _API_BASE, _TIMEZONE, AWEvent, CLIError
+from .afk_bucket_cache import AFKBucketCache
+from .api_client import APIClient
 
 
 class AFKBucketCandidates:
-    """AFKバケットの候補群"""
+    """AFKバケットの候補群
 
-    def __init__(self, afk_ids: list[str], preference: str | None) -> None:
+    PC名の指定は1つ、カンマ区切りの複数、または all（すべてのAFKバケット）。
+    複数の場合、選択結果はバケットIDのカンマ区切りになる。
+    """
+
+    def __init__(
+        self, afk_ids: list[str], preference: str | None, cache: AFKBucketCache
+    ) -> None:
         self._afk_ids: list[str] = afk_ids
         self._preference: str | None = preference
+        self._cache: AFKBucketCache = cache
 
     @property
     def selected(self) -> str:
@@ -23,18 +31,21 @@ class AFKBucketCandidates:
                 "エラー: AFKバケットが見つかりません\n"
                 "aw-watcher-afkが有効か確認してください"
             )
+        if self._preference == "all":
+            return ",".join(self._afk_ids)
         if self._preference:
-            return self._by_preference()
+            parts: list[str] = [p.strip() for p in self._preference.split(",")]
+            selected: list[str] = [self._by_preference(p) for p in parts if p]
+            return ",".join(dict.fromkeys(selected))
         if len(self._afk_ids) == 1:
             return self._afk_ids[0]
         return self._by_latest()
 
-    def _by_preference(self) -> str:
-        pref: str = self._preference or ""
+    def _by_preference(self, pref: str) -> str:
         matched: list[str] = [b for b in self._afk_ids if pref.lower() in b.lower()]
         if not matched:
             lines: list[str] = [
-                f"エラー: '{self._preference}' にマッチするバケットが見つかりません",
+                f"エラー: '{pref}' にマッチするバケットが見つかりません",
                 "利用可能なバケット:",
             ]
             for bid in self._afk_ids:
@@ -42,7 +53,7 @@ class AFKBucketCandidates:
             raise CLIError("\n".join(lines))
         if len(matched) > 1:
             lines = [
-                f"エラー: '{self._preference}' に複数のバケットがマッチしました:",
+                f"エラー: '{pref}' に複数のバケットがマッチしました:",
             ]
             for bid in matched:
                 lines.append(f"  {bid.replace('aw-watcher-afk_', '')}")
@@ -50,10 +61,11 @@ class AFKBucketCandidates:
         return matched[0]
 
     def _by_latest(self) -> str:
-        ranked: list[tuple[str, datetime | None, str]] = []
-        for bid in self._afk_ids:
-            hostname: str = bid.replace("aw-watcher-afk_", "")
-            ranked.append((bid, self._last_event(bid), hostname))
+        last_events: dict[str, datetime | None] = self._last_events()
+        ranked: list[tuple[str, datetime | None, str]] = [
+            (bid, last_events[bid], bid.replace("aw-watcher-afk_", ""))
+            for bid in self._afk_ids
+        ]
         ranked.sort(
             key=lambda x: x[1] or datetime.min.replace(tzinfo=_TIMEZONE), reverse=True
         )
@@ -70,15 +82,35 @@ class AFKBucketCandidates:
         print("特定のバケットを使う場合: --bucket=PC名", file=sys.stderr)
         return ranked[0][0]
 
+    def _last_events(self) -> dict[str, datetime | None]:
+        """各バケットの最終イベント時刻（キャッシュにないものだけを並行して問い合わせ）"""
+        cached: dict[str, object] = self._cache.fresh("last_events")
+        result: dict[str, datetime | None] = {
+            bid: datetime.fromisoformat(v) if isinstance(v, str) else None
+            for bid, v in cached.items()
+            if bid in self._afk_ids
+        }
+        missing: list[str] = [b for b in self._afk_ids if b not in result]
+        if missing:
+            with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+                probed: list[datetime | None] = list(
+                    pool.map(self._last_event, missing)
+                )
+            result.update(zip(missing, probed))
+            self._cache.update(
+                "last_events",
+                {b: t.isoformat() if t else None for b, t in zip(missing, probed)},
+            )
+        return result
+
     def _last_event(self, bucket_id: str) -> datetime | None:
         url: str = f"{_API_BASE}/buckets/{bucket_id}/events?limit=1"
         try:
-            with urllib.request.urlopen(url, timeout=5) as resp:
-                events: list[AWEvent] = json.loads(resp.read().decode())
-                if events:
-                    return datetime.fromisoformat(events[0]["timestamp"]).astimezone(
-                        _TIMEZONE
-                    )
+            events: list[AWEvent] = APIClient.json(url)
+            if events:
+                return datetime.fromisoformat(events[0]["timestamp"]).astimezone(
+                    _TIMEZONE
+                )
         except (urllib.error.URLError, KeyError, IndexError):
             # Ignore failures when fetching/parsing the last event and treat as "no data"
             pass
@@ -0,0 +1,138 @@
+"""AFKイベントのローカル履歴"""
+
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from ..types import _TIMEZONE, AWEvent
+from .afk_event_windows import AFKEventWindows
+from .afk_events import AFKEvents
+from .stage_clock import StageClock
+
+
+class AFKEventHistory:
+    """AFKイベントのローカル履歴（SQLite・バケットごとの差分同期付き）"""
+
+    _PATH: Path = Path.home() / ".config" / "aw-work-hours" / "events.sqlite3"
+    _SCHEMA: str = """
+        CREATE TABLE IF NOT EXISTS events (
+            bucket TEXT NOT NULL,
+            id INTEGER NOT NULL,
+            timestamp TEXT NOT NULL,
+            duration REAL NOT NULL,
+            data TEXT NOT NULL,
+            start_epoch REAL NOT NULL,
+            end_epoch REAL NOT NULL,
+            PRIMARY KEY (bucket, id)
+        );
+        CREATE INDEX IF NOT EXISTS events_start ON events (bucket, start_epoch);
+        CREATE TABLE IF NOT EXISTS synced (
+            bucket TEXT PRIMARY KEY,
+            timestamp TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, bucket_id: str, path: Path | None = None) -> None:
+        self._bucket_id: str = bucket_id
+        self._path: Path = path or self._PATH
+
+    @property
+    def bucket_id(self) -> str:
+        return self._bucket_id
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def events(self, start: str | None, end: str | None) -> AFKEvents:
+        """差分同期してから期間内のイベントを返す（APIと同じく重なり判定）"""
+        self.sync()
+        return self.stored(start, end)
+
+    def stored(self, start: str | None, end: str | None) -> AFKEvents:
+        """同期せずに保存済みのイベントを返す（並列集計のワーカー用）"""
+        with StageClock.measure("history.select"):
+            return AFKEvents(self._select(start, end))
+
+    def span(self) -> tuple[datetime, datetime] | None:
+        """保存済みイベントの最初と最後の開始時刻"""
+        with closing(self._connect()) as conn:
+            row: tuple[float | None, float | None] = conn.execute(
+                "SELECT MIN(start_epoch), MAX(start_epoch) FROM events"
+                " WHERE bucket = ?",
+                (self._bucket_id,),
+            ).fetchone()
+        if row[0] is None or row[1] is None:
+            return None
+        return (
+            datetime.fromtimestamp(row[0], _TIMEZONE),
+            datetime.fromtimestamp(row[1], _TIMEZONE),
+        )
+
+    def sync(self) -> None:
+        """前回の同期位置以降のイベントをAPIから取り込む"""
+        # 最終イベントはハートビートで延長されるため、その開始時刻から取り直す
+        with closing(self._connect()) as conn:
+            row: tuple[str] | None = conn.execute(
+                "SELECT timestamp FROM synced WHERE bucket = ?", (self._bucket_id,)
+            ).fetchone()
+        since: datetime | None = datetime.fromisoformat(row[0]) if row else None
+        # 窓ごとに保存して同期位置を進めるため、途中で失敗しても次回はそこから再開する
+        for window in AFKEventWindows(self._bucket_id, since, None):
+            if window.raw:
+                self._save([self._record(e) for e in window.raw])
+
+    def _save(
+        self, records: list[tuple[str, int, str, float, str, float, float]]
+    ) -> None:
+        latest: str = max(records, key=lambda r: r[5])[2]
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?)", records
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO synced VALUES (?, ?)", (self._bucket_id, latest)
+            )
+
+    def _record(self, e: AWEvent) -> tuple[str, int, str, float, str, float, float]:
+        start: datetime = datetime.fromisoformat(e["timestamp"])
+        end: datetime = start + timedelta(seconds=e["duration"])
+        data: str = json.dumps(e["data"], ensure_ascii=False, sort_keys=True)
+        return (self._bucket_id, e["id"], e["timestamp"], e["duration"], data) + (
+            start.timestamp(),
+            end.timestamp(),
+        )
+
+    def _select(self, start: str | None, end: str | None) -> list[AWEvent]:
+        lower: float = datetime.fromisoformat(start).timestamp() if start else 0.0
+        upper: float = datetime.fromisoformat(end).timestamp() if end else float("inf")
+        datas: dict[str, dict[str, str]] = {}
+        with closing(self._connect()) as conn:
+            rows: list[tuple[int, str, float, str]] = conn.execute(
+                "SELECT id, timestamp, duration, data FROM events"
+                " WHERE bucket = ? AND end_epoch >= ? AND start_epoch <= ?"
+                " ORDER BY start_epoch DESC, id",
+                (self._bucket_id, lower, upper),
+            ).fetchall()
+        # data はほぼ {"status": ...} の2種類なので同一オブジェクトを共有する
+        events: list[AWEvent] = []
+        for event_id, ts, duration, data in rows:
+            if data not in datas:
+                datas[data] = json.loads(data)
+            events.append(
+                {
+                    "id": event_id,
+                    "timestamp": ts,
+                    "duration": duration,
+                    "data": datas[data],
+                }
+            )
+        return events
+
+    def _connect(self) -> sqlite3.Connection:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn: sqlite3.Connection = sqlite3.connect(self._path, timeout=30)
+        conn.executescript(self._SCHEMA)
+        return conn
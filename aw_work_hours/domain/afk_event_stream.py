@@ -0,0 +1,53 @@
+"""イベント配列レスポンスの逐次デコード"""
+
+import json
+from collections.abc import Iterable, Iterator
+
+from ..types import AWEvent
+from .json_reader import JSONReader
+
+
+class AFKEventStream:
+    """イベント配列レスポンスのチャンク単位の逐次デコード（not-afk だけを返す）
+
+    aw-server の形式（キーの順が id・timestamp・duration・data）の afk イベントは
+    正規表現で読み飛ばし、Python のオブジェクトにしない。残りの要素は "not-afk" を含むものだけを
+    デコードするため、メモリは not-afk イベントの分だけで済む。
+    """
+
+    _BATCH: int = 256
+    # aw-server（Python 版は区切りに空白あり・Rust 版はなし）が返す afk イベント
+    _AFK: str = (
+        r'\{"id": ?\d++, ?"timestamp": ?"[^"\\]*+", ?"duration": ?[-+.0-9eE]++, ?'
+        r'"data": ?\{"status": ?"afk"\}\}'
+    )
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks: Iterable[bytes] = chunks
+        self._data: dict[str, str] = {"status": "not-afk"}
+
+    def __iter__(self) -> Iterator[AWEvent]:
+        reader: JSONReader = JSONReader.from_chunks(self._chunks)
+        batch: list[str] = []
+        for text in reader.texts(self._AFK):
+            if '"not-afk"' in text:
+                batch.append(text)
+                if len(batch) >= self._BATCH:
+                    yield from self._decode(batch)
+                    batch = []
+        yield from self._decode(batch)
+        if reader.peek():
+            raise ValueError(
+                "JSON の解析に失敗しました: 配列の後に余分なデータがあります"
+            )
+
+    def _decode(self, batch: list[str]) -> Iterator[AWEvent]:
+        """not-afk を含む要素をまとめて1回でデコードする"""
+        for event in json.loads("[" + ",".join(batch) + "]"):
+            # "not-afk" が別の文字列にあっただけの要素は、デコード後の判定で捨てる
+            if event["data"].get("status") != "not-afk":
+                continue
+            if event["data"] == self._data:
+                # data はほぼ全件同じ内容なので1つのオブジェクトを共有する
+                event["data"] = self._data
+            yield event
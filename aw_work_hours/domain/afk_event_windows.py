@@ -0,0 +1,64 @@
+"""期間分割したAFKイベント"""
+
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from ..types import _TIMEZONE, AWEvent
+from .afk_bucket import AFKBucket
+from .afk_events import AFKEvents
+
+
+class AFKEventWindows:
+    """期間分割したAFKイベント（窓ごとに並列に取得し、古い窓から順に返す）
+
+    並列に取得する窓は、返していない窓を含めて最大 workers 個まで。
+    接続の再試行は APIClient に任せ、窓ごとには取り直さない（再試行が重なって待ち時間が増えるため）。
+
+    各イベントは開始時刻を含む窓にだけ属させるため、窓の境界をまたぐイベントも
+    重複しない（最初の窓だけは API と同じく期間開始より前に始まるイベントを含む）。
+    """
+
+    _DAYS: int = 30
+
+    def __init__(
+        self,
+        bucket_id: str,
+        start: datetime | None,
+        end: datetime | None,
+        workers: int = 4,
+    ) -> None:
+        self._bucket_id: str = bucket_id
+        self._start: datetime = start or AFKBucket.created(bucket_id)
+        self._end: datetime = end or datetime.now(_TIMEZONE)
+        self._workers: int = workers
+
+    def __iter__(self) -> Iterator[AFKEvents]:
+        bounds: list[datetime] = [self._start]
+        while bounds[-1] < self._end:
+            bounds.append(min(bounds[-1] + timedelta(days=self._DAYS), self._end))
+        windows: list[tuple[datetime, datetime]] = list(zip(bounds, bounds[1:]))
+        # 先読みはワーカー数の窓までにし、読み手が遅くても取得済みの窓を溜め込まない
+        with ThreadPoolExecutor(max_workers=self._workers) as pool:
+            pending: deque[Future[AFKEvents]] = deque()
+            for window in windows:
+                if len(pending) >= self._workers:
+                    yield pending.popleft().result()
+                pending.append(pool.submit(self._window, window))
+            while pending:
+                yield pending.popleft().result()
+
+    def _window(self, window: tuple[datetime, datetime]) -> AFKEvents:
+        start, end = window
+        events: list[AWEvent] = AFKEvents.fetch(
+            start.isoformat(), end.isoformat(), self._bucket_id
+        ).raw
+        if (start, end) != (self._start, self._end):
+            events = [e for e in events if self._owns(e, start, end)]
+        return AFKEvents(events)
+
+    def _owns(self, event: AWEvent, start: datetime, end: datetime) -> bool:
+        """境界をまたぐイベントは開始時刻を含む窓だけに残す"""
+        ts: datetime = datetime.fromisoformat(event["timestamp"])
+        return (start == self._start or ts >= start) and (end == self._end or ts < end)
@@ -1,25 +1,29 @@
 """ActivityWatchのAFKイベント"""
 
-import json
+import heapq
 import urllib.error
 import urllib.parse
-import urllib.request
 from datetime import datetime, timedelta
 
-from ..types import _API_BASE, _TIMEZONE, APIConnectionError, AWEvent
+from ..types import _API_BASE, _TIMEZONE, AFKInterval, APIConnectionError, AWEvent
 from .afk_bucket import AFKBucket
-from .work_rule import WorkRule
+from .afk_event_stream import AFKEventStream
+from .api_client import APIClient
+from .stage_clock import StageClock
 
 
 class AFKEvents:
-    """ActivityWatchのAFKイベント"""
+    """ActivityWatchのAFKイベント（APIから取得した場合は not-afk のみ）"""
 
     def __init__(self, events: list[AWEvent]) -> None:
         self._events: list[AWEvent] = events
+        self._intervals: list[AFKInterval] | None = None
 
     @classmethod
-    def fetch(cls, start: str | None, end: str | None) -> "AFKEvents":
-        url: str = f"{_API_BASE}/buckets/{AFKBucket.id()}/events"
+    def fetch(
+        cls, start: str | None, end: str | None, bucket_id: str | None = None
+    ) -> "AFKEvents":
+        url: str = f"{_API_BASE}/buckets/{bucket_id or AFKBucket.id()}/events"
         params: dict[str, str] = {"limit": "-1"}
         if start:
             params["start"] = start
@@ -27,8 +31,9 @@ class AFKEvents:
             params["end"] = end
         url += "?" + urllib.parse.urlencode(params)
         try:
-            with urllib.request.urlopen(url, timeout=30) as resp:
-                return cls(json.loads(resp.read().decode()))
+            with StageClock.measure("fetch"):
+                chunks = StageClock.timed(APIClient.chunks(url), "fetch.network")
+                return cls(list(AFKEventStream(chunks)))
         except urllib.error.URLError as e:
             raise APIConnectionError(
                 "エラー: ActivityWatch APIに接続できません\n"
@@ -36,41 +41,49 @@ class AFKEvents:
                 f"詳細: {e}"
             ) from e
 
+    @classmethod
+    def from_intervals(cls, intervals: list[AFKInterval]) -> "AFKEvents":
+        """正規化済みの区間から作る（スナップショット用・raw は空）"""
+        events: AFKEvents = cls([])
+        events._intervals = intervals
+        return events
+
+    @classmethod
+    def merged(cls, parts: list["AFKEvents"]) -> "AFKEvents":
+        """複数バケットのイベントを結合（PC間で重なる区間は1つにまとめ、二重に数えない）"""
+        merged: AFKEvents = cls([e for part in parts for e in part.raw])
+        union: list[AFKInterval] = []
+        for i in heapq.merge(*(p.intervals for p in parts), key=lambda i: i[:2]):
+            if not union or i.start >= union[-1].end:
+                union.append(i)
+            elif i.end > union[-1].end:
+                start: datetime = union[-1].start
+                seconds: float = (i.end - start).total_seconds()
+                union[-1] = AFKInterval(start, i.end, seconds, union[-1].data)
+        merged._intervals = union
+        return merged
+
     @property
     def raw(self) -> list[AWEvent]:
         return self._events
 
     @property
-    def work_blocks(self) -> list[tuple[datetime, datetime]]:
-        not_afk: list[AWEvent] = sorted(
-            [
-                e
-                for e in self._events
-                if e["data"]["status"] == "not-afk"
-                and e["duration"] >= WorkRule.MIN_EVENT_SECONDS
-            ],
-            key=lambda e: e["timestamp"],
-        )
-        return self._extract_blocks(not_afk) if not_afk else []
-
-    def _extract_blocks(self, events: list[AWEvent]) -> list[tuple[datetime, datetime]]:
-        blocks: list[tuple[datetime, datetime]] = []
-        block_start: datetime | None = None
-        block_end: datetime = datetime.min.replace(tzinfo=_TIMEZONE)
-        for event in events:
-            start: datetime = datetime.fromisoformat(event["timestamp"]).astimezone(
-                _TIMEZONE
+    def intervals(self) -> list[AFKInterval]:
+        """not-afkイベントを一度だけパースした区間（開始・終了時刻順）"""
+        if self._intervals is None:
+            self._intervals = sorted(
+                (
+                    self._interval(e)
+                    for e in self._events
+                    if e["data"]["status"] == "not-afk"
+                ),
+                key=lambda i: (i.start, i.end),
             )
-            end: datetime = start + timedelta(seconds=event["duration"])
-            if block_start is None:
-                block_start, block_end = start, end
-            else:
-                gap: float = (start - block_end).total_seconds()
-                if WorkRule.is_block_boundary(gap, start.hour):
-                    blocks.append((block_start, block_end))
-                    block_start, block_end = start, end
-                else:
-                    block_end = max(block_end, end)
-        if block_start is not None:
-            blocks.append((block_start, block_end))
-        return blocks
+        return self._intervals
+
+    def _interval(self, event: AWEvent) -> AFKInterval:
+        start: datetime = datetime.fromisoformat(event["timestamp"]).astimezone(
+            _TIMEZONE
+        )
+        end: datetime = start + timedelta(seconds=event["duration"])
+        return AFKInterval(start, end, event["duration"], event["data"])
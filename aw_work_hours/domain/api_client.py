@@ -0,0 +1,228 @@
+"""keep-alive HTTPクライアント"""
+
+import http.client
+import json
+import threading
+import time
+import urllib.error
+import urllib.parse
+from collections.abc import Iterator
+from typing import Any
+
+
+class APIClient:
+    """ActivityWatch・祝日APIへの keep-alive HTTP/1.1 クライアント
+
+    ホストごとに接続をプールして使い回し、TCP接続の確立を毎回行わない。
+    接続・送信の失敗はバックオフ付きで再試行し、最終的な失敗は urlopen と同じく
+    urllib.error.URLError（HTTPステータス異常は HTTPError）として送出する。
+    リダイレクト（301・302・303・307・308）も urlopen と同じく最大10回まで追う。
+    """
+
+    # URLに最初に含まれたパターンのタイムアウト秒数（該当なしは _DEFAULT_TIMEOUT）
+    _TIMEOUTS: list[tuple[str, float]] = [
+        ("limit=1", 5),
+        ("/events", 30),
+        ("/buckets", 10),
+    ]
+    _DEFAULT_TIMEOUT: float = 10
+    _ATTEMPTS: int = 3
+    _BACKOFF_SECONDS: float = 0.2
+    _CHUNK_BYTES: int = 64 * 1024
+    _IDLE_PER_HOST: int = 8
+    _REDIRECTS: frozenset[int] = frozenset({301, 302, 303, 307, 308})
+    _MAX_REDIRECTS: int = 10
+    # 待機中の接続を相手が閉じていたときの例外（RemoteDisconnected は ConnectionResetError）
+    _CLOSED: tuple[type[Exception], ...] = (ConnectionResetError, BrokenPipeError)
+    _idle: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+    _counters: dict[str, float] = {
+        "requests": 0,
+        "retries": 0,
+        "errors": 0,
+        "bytes": 0,
+        "seconds": 0.0,
+    }
+    _lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def json(cls, url: str, timeout: float | None = None) -> Any:
+        return json.loads(cls.read(url, timeout))
+
+    @classmethod
+    def read(cls, url: str, timeout: float | None = None) -> bytes:
+        return b"".join(cls.chunks(url, timeout))
+
+    @classmethod
+    def chunks(cls, url: str, timeout: float | None = None) -> Iterator[bytes]:
+        """レスポンス本文を64KBずつ返す（読み切った接続はプールに戻す）"""
+        started: float = time.perf_counter()
+        url, host, conn, resp = cls._followed(url, timeout or cls._timeout(url))
+        resp = cls._checked(url, conn, resp)
+        yield from cls._body(host, conn, resp, started)
+
+    @classmethod
+    def exchange(
+        cls, url: str, timeout: float | None = None
+    ) -> tuple[int, http.client.HTTPMessage, Iterator[bytes]]:
+        """ステータス・ヘッダー・本文チャンク（4xx/5xx もそのまま返す・プロキシ用）"""
+        started: float = time.perf_counter()
+        host: tuple[str, str] = cls._host(url)
+        conn, resp = cls._open(url, host, timeout or cls._timeout(url))
+        return resp.status, resp.msg, cls._body(host, conn, resp, started)
+
+    @classmethod
+    def _body(
+        cls,
+        host: tuple[str, str],
+        conn: http.client.HTTPConnection,
+        resp: http.client.HTTPResponse,
+        started: float,
+    ) -> Iterator[bytes]:
+        received: int = 0
+        try:
+            while chunk := resp.read(cls._CHUNK_BYTES):
+                received += len(chunk)
+                yield chunk
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            cls._count(errors=1)
+            raise urllib.error.URLError(e) from e
+        except GeneratorExit:
+            # 読み切らずに打ち切られた接続は再利用できない
+            conn.close()
+            raise
+        finally:
+            cls._count(bytes=received, seconds=time.perf_counter() - started)
+        cls._release(host, conn, resp)
+
+    @classmethod
+    def stats(cls) -> dict[str, float]:
+        """リクエスト数・再試行数・失敗数・受信バイト数・平均レイテンシ（ミリ秒）"""
+        with cls._lock:
+            counters: dict[str, float] = dict(cls._counters)
+        requests: float = counters.pop("requests")
+        seconds: float = counters.pop("seconds")
+        avg_ms: float = round(seconds / requests * 1000, 1) if requests else 0.0
+        return {"requests": requests, **counters, "avg_latency_ms": avg_ms}
+
+    @classmethod
+    def _open(
+        cls, url: str, host: tuple[str, str], timeout: float
+    ) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        cls._count(requests=1)
+        attempt: int = 0
+        while True:
+            conn: http.client.HTTPConnection = cls._connection(host, timeout)
+            reused: bool = conn.sock is not None
+            try:
+                return conn, cls._request(url, conn=conn, timeout=timeout)
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                if reused and isinstance(e, cls._CLOSED):
+                    # 相手が閉じた待機中の接続（サーバーの再起動など）は他の待機中の接続も
+                    # 同じく使えないため、まとめて捨て、回数に数えずに新しい接続で取り直す
+                    # （タイムアウトなどは応答しないサーバーなので、他の失敗と同じく数える）
+                    cls._flush(host)
+                    cls._count(retries=1)
+                    continue
+                attempt += 1
+                if attempt == cls._ATTEMPTS:
+                    cls._count(errors=1)
+                    raise urllib.error.URLError(e) from e
+                cls._count(retries=1)
+                time.sleep(cls._BACKOFF_SECONDS * 2 ** (attempt - 1))
+
+    @classmethod
+    def _followed(
+        cls, url: str, timeout: float
+    ) -> tuple[
+        str, tuple[str, str], http.client.HTTPConnection, http.client.HTTPResponse
+    ]:
+        """Location を追った先の応答（本文を読み捨てた接続はプールに戻す）"""
+        for _ in range(cls._MAX_REDIRECTS + 1):
+            host: tuple[str, str] = cls._host(url)
+            conn, resp = cls._open(url, host, timeout)
+            location: str | None = resp.getheader("Location")
+            if resp.status not in cls._REDIRECTS or not location:
+                return url, host, conn, resp
+            resp.read()
+            cls._release(host, conn, resp)
+            url = urllib.parse.urljoin(url, location)
+        cls._count(errors=1)
+        raise urllib.error.HTTPError(
+            url, resp.status, "too many redirects", resp.msg, None
+        )
+
+    @classmethod
+    def _checked(
+        cls, url: str, conn: http.client.HTTPConnection, resp: http.client.HTTPResponse
+    ) -> http.client.HTTPResponse:
+        # 追わない 3xx（304 など）も本文をJSONとして読ませず、urlopen と同じく HTTPError にする
+        if resp.status >= 300:
+            conn.close()
+            cls._count(errors=1)
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.msg, None)
+        return resp
+
+    @classmethod
+    def _request(
+        cls, url: str, conn: http.client.HTTPConnection, timeout: float
+    ) -> http.client.HTTPResponse:
+        parts: urllib.parse.SplitResult = urllib.parse.urlsplit(url)
+        target: str = parts.path + (f"?{parts.query}" if parts.query else "")
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        conn.request("GET", target or "/", headers={"Connection": "keep-alive"})
+        return conn.getresponse()
+
+    @classmethod
+    def _connection(
+        cls, host: tuple[str, str], timeout: float
+    ) -> http.client.HTTPConnection:
+        with cls._lock:
+            idle: list[http.client.HTTPConnection] = cls._idle.get(host, [])
+            if idle:
+                return idle.pop()
+        scheme, netloc = host
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=timeout)
+        return http.client.HTTPConnection(netloc, timeout=timeout)
+
+    @classmethod
+    def _release(
+        cls,
+        host: tuple[str, str],
+        conn: http.client.HTTPConnection,
+        resp: http.client.HTTPResponse,
+    ) -> None:
+        with cls._lock:
+            idle: list[http.client.HTTPConnection] = cls._idle.setdefault(host, [])
+            if not resp.will_close and len(idle) < cls._IDLE_PER_HOST:
+                idle.append(conn)
+                return
+        conn.close()
+
+    @classmethod
+    def _flush(cls, host: tuple[str, str]) -> None:
+        with cls._lock:
+            idle: list[http.client.HTTPConnection] = cls._idle.pop(host, [])
+        for conn in idle:
+            conn.close()
+
+    @classmethod
+    def _host(cls, url: str) -> tuple[str, str]:
+        parts: urllib.parse.SplitResult = urllib.parse.urlsplit(url)
+        return parts.scheme, parts.netloc
+
+    @classmethod
+    def _timeout(cls, url: str) -> float:
+        for pattern, seconds in cls._TIMEOUTS:
+            if pattern in url:
+                return seconds
+        return cls._DEFAULT_TIMEOUT
+
+    @classmethod
+    def _count(cls, **amounts: float) -> None:
+        with cls._lock:
+            for name, amount in amounts.items():
+                cls._counters[name] += amount
@@ -1,58 +1,88 @@
 """日ごとの勤務統計"""
 
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
 
-from ..types import _TIMEZONE, AWEvent
+from ..types import AFKInterval
 from .work_rule import WorkRule
 
 
 class DailyWork:
-    """日ごとの勤務統計"""
+    """日ごとの勤務統計（開始時刻順の区間を1回の走査で集計）
 
-    def __init__(self, events: list[AWEvent]) -> None:
-        self._not_afk: list[AWEvent] = [
-            e for e in events if e["data"]["status"] == "not-afk"
-        ]
+    - active: 勤務日ごとの not-afk 合計秒数（短いイベントも含む）
+    - gaps: 勤務日ごとの最大離席秒数（MIN_EVENT_SECONDS 以上のイベントのみ）
+    - blocks: 連続した勤務ブロック（MIN_EVENT_SECONDS 以上のイベントのみ）
+    """
+
+    def __init__(self, intervals: list[AFKInterval]) -> None:
+        self._active: dict[date, float] = {}
+        self._gaps: dict[date, float] = {}
+        self._ends: dict[date, datetime] = {}
+        self._blocks: list[tuple[datetime, datetime]] = []
+        for interval in intervals:
+            self.add(interval)
+
+    @classmethod
+    def merged(cls, parts: list["DailyWork"]) -> "DailyWork":
+        """勤務月ごとの集計を結合（月をまたぐブロックだけを接続し直す）"""
+        merged: DailyWork = cls([])
+        for part in parts:
+            merged._active.update(part._active)
+            merged._gaps.update(part._gaps)
+            merged._ends.update(part._ends)
+            for block_start, block_end in part._blocks:
+                merged._add_block(block_start, block_end)
+        return merged
+
+    def add(self, interval: AFKInterval) -> None:
+        """開始時刻順で次の区間を加える"""
+        wd: date = WorkRule.work_date(interval.start)
+        self._active[wd] = self._active.get(wd, 0) + interval.duration
+        if interval.duration >= WorkRule.MIN_EVENT_SECONDS:
+            self._add_counted(wd, interval)
+
+    def stretch(self, last: AFKInterval, stretched: AFKInterval) -> None:
+        """最後に加えた区間がハートビートで延長された分だけを反映する"""
+        wd: date = WorkRule.work_date(last.start)
+        self._active[wd] += stretched.duration - last.duration
+        if stretched.duration < WorkRule.MIN_EVENT_SECONDS:
+            return
+        if last.duration < WorkRule.MIN_EVENT_SECONDS:
+            self._add_counted(wd, stretched)
+            return
+        self._ends[wd] = max(self._ends[wd], stretched.end)
+        block_start, block_end = self._blocks[-1]
+        self._blocks[-1] = (block_start, max(block_end, stretched.end))
+
+    def _add_counted(self, wd: date, interval: AFKInterval) -> None:
+        """MIN_EVENT_SECONDS 以上の区間を gap・ブロックに反映"""
+        if wd in self._ends:
+            gap: float = (interval.start - self._ends[wd]).total_seconds()
+            self._gaps[wd] = max(self._gaps[wd], gap)
+            self._ends[wd] = max(self._ends[wd], interval.end)
+        else:
+            self._gaps[wd], self._ends[wd] = 0, interval.end
+        self._add_block(interval.start, interval.end)
+
+    def _add_block(self, start: datetime, end: datetime) -> None:
+        if not self._blocks:
+            self._blocks.append((start, end))
+            return
+        block_start, block_end = self._blocks[-1]
+        gap: float = (start - block_end).total_seconds()
+        if WorkRule.is_block_boundary(gap, start.hour):
+            self._blocks.append((start, end))
+        else:
+            self._blocks[-1] = (block_start, max(block_end, end))
 
     @property
     def active(self) -> dict[date, float]:
-        result: dict[date, float] = {}
-        for event in self._not_afk:
-            start: datetime = datetime.fromisoformat(event["timestamp"]).astimezone(
-                _TIMEZONE
-            )
-            wd: date = WorkRule.work_date(start)
-            result[wd] = result.get(wd, 0) + event["duration"]
-        return result
+        return self._active
 
     @property
     def gaps(self) -> dict[date, float]:
-        events_by_day: dict[date, list[tuple[datetime, datetime]]] = {}
-        for event in self._not_afk:
-            if event["duration"] < WorkRule.MIN_EVENT_SECONDS:
-                continue
-            start: datetime = datetime.fromisoformat(event["timestamp"]).astimezone(
-                _TIMEZONE
-            )
-            end: datetime = start + timedelta(seconds=event["duration"])
-            wd: date = WorkRule.work_date(start)
-            if wd not in events_by_day:
-                events_by_day[wd] = []
-            events_by_day[wd].append((start, end))
-        return self._calc_max_gaps(events_by_day)
-
-    def _calc_max_gaps(
-        self, events_by_day: dict[date, list[tuple[datetime, datetime]]]
-    ) -> dict[date, float]:
-        result: dict[date, float] = {}
-        for wd, events in events_by_day.items():
-            sorted_events: list[tuple[datetime, datetime]] = sorted(events)
-            max_gap: float = 0
-            max_end: datetime = sorted_events[0][1] if sorted_events else datetime.min
-            for i in range(1, len(sorted_events)):
-                gap: float = (sorted_events[i][0] - max_end).total_seconds()
-                if gap > 0:
-                    max_gap = max(max_gap, gap)
-                max_end = max(max_end, sorted_events[i][1])
-            result[wd] = max_gap
-        return result
+        return self._gaps
+
+    @property
+    def blocks(self) -> list[tuple[datetime, datetime]]:
+        return self._blocks
@@ -0,0 +1,111 @@
+"""ファイルからのAFKイベント"""
+
+import json
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from math import inf
+from pathlib import Path
+
+from ..types import AWEvent, CLIError
+from .afk_events import AFKEvents
+from .json_reader import JSONReader
+
+
+class EventFile:
+    """ファイルからのAFKイベント（ActivityWatch のエクスポート・イベント配列・NDJSON）
+
+    - エクスポート（{"buckets": {ID: {..., "events": [...]}}}）: 指定PC名を含む最初の AFK バケット
+      （大文字小文字は区別しない。該当がなければ CLIError）
+    - イベント配列（/api/0/buckets/ID/events の応答と同じ形式）
+    - NDJSON（拡張子 .ndjson・.jsonl、1行1イベント）
+    いずれもファイルを先頭から逐次読み、期間と重なる not-afk イベントだけを残す。
+    """
+
+    _NDJSON_SUFFIXES: tuple[str, ...] = (".ndjson", ".jsonl")
+    _AFK_PREFIX: str = "aw-watcher-afk_"
+
+    def __init__(self, path: Path, preference: str | None = None) -> None:
+        if preference and ("," in preference or preference == "all"):
+            raise CLIError("エラー: --input では複数PCの合算は指定できません")
+        if not path.is_file():
+            raise CLIError(f"エラー: 入力ファイルが見つかりません: {path}")
+        self._path: Path = path
+        self._preference: str | None = preference
+
+    @property
+    def bucket_id(self) -> str:
+        """キャッシュのキーに使う識別子（ファイルと指定PC名ごと）"""
+        return f"file:{self._path.resolve()}#{self._preference or ''}"
+
+    def events(self, start: str | None, end: str | None) -> AFKEvents:
+        """期間と重なる not-afk イベント（APIと同じく重なり判定。並びはファイルの順のまま）"""
+        lower: float = datetime.fromisoformat(start).timestamp() if start else -inf
+        upper: float = datetime.fromisoformat(end).timestamp() if end else inf
+        matched: list[AWEvent] = []
+        try:
+            for event in self._stream():
+                if event["data"].get("status") != "not-afk":
+                    continue
+                began: datetime = datetime.fromisoformat(event["timestamp"])
+                ended: datetime = began + timedelta(seconds=event["duration"])
+                if ended.timestamp() >= lower and began.timestamp() <= upper:
+                    matched.append(event)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise CLIError(f"エラー: 入力ファイルを読み込めません: {self._path}\n{e}")
+        return AFKEvents(matched)
+
+    def _stream(self) -> Iterator[AWEvent]:
+        with open(self._path, encoding="utf-8") as f:
+            if self._path.suffix in self._NDJSON_SUFFIXES:
+                # not-afk を含まない行はデコードせずに読み飛ばす
+                yield from (json.loads(line) for line in f if '"not-afk"' in line)
+                return
+            reader: JSONReader = JSONReader(f)
+            if reader.peek() != "[":
+                yield from self._export(reader)
+                return
+            yield from reader.values()
+
+    def _export(self, reader: JSONReader) -> Iterator[AWEvent]:
+        """エクスポートのバケットを順に読み、選んだバケットのイベントだけを返す"""
+        selected: bool = False
+        afk_ids: list[str] = []
+        for key in reader.members():
+            if key != "buckets":
+                reader.value()
+                continue
+            for bucket_id in reader.members():
+                if bucket_id.startswith(self._AFK_PREFIX):
+                    afk_ids.append(bucket_id)
+                chosen: bool = not selected and self._matches(bucket_id)
+                selected = selected or chosen
+                yield from self._bucket(reader, chosen)
+        if not selected:
+            raise CLIError(self._unmatched(afk_ids))
+
+    @staticmethod
+    def _bucket(reader: JSONReader, chosen: bool) -> Iterator[AWEvent]:
+        for field in reader.members():
+            if field != "events":
+                reader.value()
+                continue
+            for _ in reader.elements():
+                event: AWEvent = reader.value()
+                if chosen:
+                    yield event
+
+    def _matches(self, bucket_id: str) -> bool:
+        if not bucket_id.startswith(self._AFK_PREFIX):
+            return False
+        return self._preference is None or self._preference.lower() in bucket_id.lower()
+
+    def _unmatched(self, afk_ids: list[str]) -> str:
+        """AFK バケットを選べなかったときのメッセージ（APIのバケット選択と同じ形式）"""
+        if not afk_ids:
+            return f"エラー: 入力ファイルにAFKバケットが見つかりません: {self._path}"
+        lines: list[str] = [
+            f"エラー: '{self._preference}' にマッチするバケットが見つかりません",
+            "利用可能なバケット:",
+        ]
+        lines += [f"  {bid.replace(self._AFK_PREFIX, '')}" for bid in afk_ids]
+        return "\n".join(lines)
@@ -0,0 +1,110 @@
+"""not-afk 区間のスナップショットファイル"""
+
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from math import inf
+from pathlib import Path
+
+from ..types import _TIMEZONE, AFKInterval, CLIError
+from .afk_events import AFKEvents
+
+
+class EventSnapshot:
+    """not-afk 区間の固定長・列指向のスナップショット（mmap で読み、期間はコピーせずに切り出す）
+
+    ヘッダー（マジック・件数・最大の長さ・バケットID）の後に、開始時刻（epoch秒 float64）・
+    長さ（秒 float64）・状態（uint8、1 = not-afk）の列を件数分ずつ並べる（リトルエンディアン）。
+    開始時刻の列は昇順なので、期間の切り出しは二分探索だけで済む。
+    開くときに列の長さと状態（すべて not-afk）を検証する。
+    """
+
+    _MAGIC: bytes = b"AWSNAP1\n"
+    # マジック・件数・最大の長さ（秒）・バケットIDのバイト数
+    _HEADER: struct.Struct = struct.Struct("<8sQdI4x")
+    _NOT_AFK: int = 1
+
+    def __init__(self, path: Path) -> None:
+        try:
+            with open(path, "rb") as f:
+                self._map: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, count, max_duration, id_length = self._HEADER.unpack_from(self._map)
+        except (OSError, ValueError, struct.error) as e:
+            raise CLIError(f"エラー: スナップショットを読み込めません: {path}\n{e}")
+        if magic != self._MAGIC:
+            raise CLIError(f"エラー: スナップショットの形式ではありません: {path}")
+        offset: int = self._HEADER.size + self._padded(id_length)
+        self._validate(path, offset, count)
+        view: memoryview = memoryview(self._map)
+        self._bucket_id: str = bytes(view[self._HEADER.size :][:id_length]).decode()
+        self._starts: memoryview = self._column(view, offset, count, "d")
+        self._durations: memoryview = self._column(view, offset + 8 * count, count, "d")
+        self._max_duration: float = max_duration
+        self._data: dict[str, str] = {"status": "not-afk"}
+
+    @property
+    def bucket_id(self) -> str:
+        return self._bucket_id
+
+    def events(self, start: str | None, end: str | None) -> AFKEvents:
+        """期間と重なる区間（APIと同じく重なり判定・JSON や辞書を介さずに区間を作る）"""
+        lower: float = datetime.fromisoformat(start).timestamp() if start else -inf
+        upper: float = datetime.fromisoformat(end).timestamp() if end else inf
+        # 開始時刻が lower - 最大の長さ より前の区間は、期間に届かない
+        first: int = bisect_left(self._starts, lower - self._max_duration)
+        last: int = bisect_right(self._starts, upper)
+        intervals: list[AFKInterval] = []
+        for s, d in zip(self._starts[first:last], self._durations[first:last]):
+            if s + d >= lower:
+                begin: datetime = datetime.fromtimestamp(s, _TIMEZONE)
+                intervals.append(
+                    AFKInterval(begin, begin + timedelta(seconds=d), d, self._data)
+                )
+        return AFKEvents.from_intervals(intervals)
+
+    @classmethod
+    def write(cls, path: Path, bucket_id: str, intervals: list[AFKInterval]) -> None:
+        """開始時刻順の区間を書き出す（途中で失敗しても既存のファイルを壊さない）"""
+        starts: array = array("d", (i.start.timestamp() for i in intervals))
+        durations: array = array("d", (i.duration for i in intervals))
+        encoded: bytes = bucket_id.encode()
+        header: bytes = cls._HEADER.pack(
+            cls._MAGIC, len(intervals), max(durations, default=0.0), len(encoded)
+        )
+        if sys.byteorder != "little":
+            starts.byteswap()
+            durations.byteswap()
+        tmp: Path = path.with_name(f"{path.name}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(header + encoded.ljust(cls._padded(len(encoded)), b"\0"))
+            f.write(starts.tobytes() + durations.tobytes())
+            f.write(bytes([cls._NOT_AFK]) * len(intervals))
+        tmp.replace(path)
+
+    def _validate(self, path: Path, offset: int, count: int) -> None:
+        """途中で切れたファイルや、not-afk 以外の状態を含むファイルは CLIError"""
+        if len(self._map) < offset + 17 * count:
+            raise CLIError(f"エラー: スナップショットが途中で切れています: {path}")
+        # 状態の列は書き出し側が not-afk だけを書くため、読み出しでは列を使わずに検証だけする
+        statuses: bytes = self._map[offset + 16 * count : offset + 17 * count]
+        if statuses.count(self._NOT_AFK) != count:
+            raise CLIError(f"エラー: スナップショットの状態の列が不正です: {path}")
+
+    @staticmethod
+    def _column(view: memoryview, offset: int, count: int, fmt: str) -> memoryview:
+        column: memoryview = view[offset : offset + 8 * count]
+        if sys.byteorder != "little":
+            # ビッグエンディアン環境だけはバイト順を入れ替えたコピーを使う
+            values: array = array(fmt)
+            values.frombytes(column)
+            values.byteswap()
+            return memoryview(values)
+        return column.cast(fmt)
+
+    @staticmethod
+    def _padded(length: int) -> int:
+        """列が8バイト境界から始まるよう、バケットIDの領域を8の倍数にする"""
+        return (length + 7) // 8 * 8
@@ -1,56 +1,93 @@
-"""日本の祝日カレンダー（キャッシュ付き）"""
+"""日本の祝日カレンダー"""
 
-import json
+import sys
 import urllib.error
-import urllib.request
 from datetime import date
-from pathlib import Path
 
-import truststore
-
-truststore.inject_into_ssl()
-
-from .. import PROJECT_DIR
+from ..types import APIConnectionError
+from .api_client import APIClient
+from .holiday_rules import HolidayRules
+from .stage_clock import StageClock
 
 
 class HolidayCalendar:
-    """日本の祝日カレンダー（キャッシュ付き）"""
+    """日本の祝日カレンダー（規則から算出した年ごとのビット集合をプロセス全体で共有）
 
-    _API_URL: str = "https://holidays-jp.github.io/api/v1/{year}/date.json"
+    規則の範囲（2000〜2099年）の判定はネットワーク・ディスクに触れない。
+    holidays-jp API は cross_check の照合と、範囲外の年の取得にだけ使う。
+    """
 
-    def __init__(self) -> None:
-        self._cache_dir = PROJECT_DIR / "holiday_cache"
-        self._holidays: dict[int, set[date]] = {}
+    _API_URL: str = "https://holidays-jp.github.io/api/v1/{year}/date.json"
+    # 年 → 元日の序数・元日からの日数をビット位置にした祝日の集合
+    _years: dict[int, tuple[int, int]] = {}
+    _tls_ready: bool = False
 
     def is_holiday(self, d: date) -> bool:
         return d.weekday() >= 5 or self._is_national(d)
 
     def _is_national(self, d: date) -> bool:
-        if d.year not in self._holidays:
-            self._load_year(d.year)
-        return d in self._holidays.get(d.year, set())
-
-    def _load_year(self, year: int) -> None:
-        cache_file = self._cache_dir / f"{year}.json"
-        if cache_file.exists():
-            self._holidays[year] = self._parse_cache(cache_file)
-        else:
-            self._holidays[year] = self._fetch_and_cache(year, cache_file)
-
-    def _parse_cache(self, cache_file: Path) -> set[date]:
-        with open(cache_file, encoding="utf-8") as f:
-            return {date.fromisoformat(d) for d in json.load(f).keys()}
-
-    def _fetch_and_cache(self, year: int, cache_file: Path) -> set[date]:
-        url: str = self._API_URL.format(year=year)
+        first, bits = self._year(d.year)
+        return bits >> (d.toordinal() - first) & 1 == 1
+
+    @classmethod
+    def _year(cls, year: int) -> tuple[int, int]:
+        cached: tuple[int, int] | None = cls._years.get(year)
+        if cached is None:
+            with StageClock.measure("holidays"):
+                first: int = date(year, 1, 1).toordinal()
+                bits: int = 0
+                names: dict[date, str] | None = cls._names(year)
+                for d in names or {}:
+                    bits |= 1 << (d.toordinal() - first)
+            if names is None:
+                # 取得できなかった年は登録せず、次の判定で問い合わせ直す
+                return first, bits
+            # 同時に計算しても結果は同じなので、先に登録された方を使う
+            cached = cls._years.setdefault(year, (first, bits))
+        return cached
+
+    @classmethod
+    def _names(cls, year: int) -> dict[date, str] | None:
+        """規則の範囲外の年は API から取得する（接続できなければ警告して None）"""
+        if HolidayRules.FIRST_YEAR <= year <= HolidayRules.LAST_YEAR:
+            return HolidayRules.names(year)
         try:
-            with urllib.request.urlopen(url, timeout=10) as resp:
-                raw: bytes = resp.read()
-                holidays: dict[str, str] = json.loads(raw.decode("utf-8"))
-            self._cache_dir.mkdir(exist_ok=True)
-            with open(cache_file, "w", encoding="utf-8") as f:
-                f.write(raw.decode("utf-8") + "\n")
-            return {date.fromisoformat(d) for d in holidays.keys()}
-        except urllib.error.URLError:
-            # 祝日API接続失敗は致命的でないため空を返す（表示上の差異のみ）
-            return set()
+            return cls._fetch(year)
+        except APIConnectionError as e:
+            print(
+                f"警告: {year}年の祝日は規則の範囲外で、祝日APIからも取得できません。"
+                f"土日だけを休日とします\n{e}",
+                file=sys.stderr,
+            )
+            return None
+
+    def cross_check(self, year: int) -> list[str]:
+        """holidays-jp API との差分（日付・名称が一致すれば空）"""
+        remote: dict[date, str] = self._fetch(year)
+        local: dict[date, str] = HolidayRules.names(year)
+        return [
+            f"{d.isoformat()} 規則: {local.get(d, '-')} / API: {remote.get(d, '-')}"
+            for d in sorted(local.keys() | remote.keys())
+            if local.get(d) != remote.get(d)
+        ]
+
+    @classmethod
+    def _fetch(cls, year: int) -> dict[date, str]:
+        cls._prepare_tls()
+        try:
+            holidays: dict[str, str] = APIClient.json(cls._API_URL.format(year=year))
+        except urllib.error.URLError as e:
+            raise APIConnectionError(
+                f"エラー: 祝日APIに接続できません\n詳細: {e}"
+            ) from e
+        return {date.fromisoformat(d): name for d, name in holidays.items()}
+
+    @classmethod
+    def _prepare_tls(cls) -> None:
+        """OSの証明書ストアを使う設定（祝日APIに接続するときだけ・初回のみ）"""
+        if cls._tls_ready:
+            return
+        import truststore
+
+        truststore.inject_into_ssl()
+        cls._tls_ready = True
@@ -0,0 +1,99 @@
+"""日本の国民の祝日の規則"""
+
+from datetime import date, timedelta
+
+
+class HolidayRules:
+    """日本の国民の祝日の規則（祝日法から算出・2000〜2099年）
+
+    固定日・ハッピーマンデー・春分/秋分（天文計算の近似式）に、
+    2019〜2021年の特例（即位関連・東京五輪による移動）を反映し、
+    振替休日と国民の休日（祝日に挟まれた平日）を加える。
+    """
+
+    FIRST_YEAR: int = 2000
+    LAST_YEAR: int = 2099
+    # 月・日・名称・適用開始年・適用終了年
+    _FIXED: list[tuple[int, int, str, int, int]] = [
+        (1, 1, "元日", 2000, 2099),
+        (2, 11, "建国記念の日", 2000, 2099),
+        (2, 23, "天皇誕生日", 2020, 2099),
+        (4, 29, "みどりの日", 2000, 2006),
+        (4, 29, "昭和の日", 2007, 2099),
+        (5, 3, "憲法記念日", 2000, 2099),
+        (5, 4, "みどりの日", 2007, 2099),
+        (5, 5, "こどもの日", 2000, 2099),
+        (7, 20, "海の日", 2000, 2002),
+        (8, 11, "山の日", 2016, 2099),
+        (9, 15, "敬老の日", 2000, 2002),
+        (11, 3, "文化の日", 2000, 2099),
+        (11, 23, "勤労感謝の日", 2000, 2099),
+        (12, 23, "天皇誕生日", 2000, 2018),
+    ]
+    # 月・第何月曜日・名称・適用開始年・適用終了年
+    _MONDAYS: list[tuple[int, int, str, int, int]] = [
+        (1, 2, "成人の日", 2000, 2099),
+        (7, 3, "海の日", 2003, 2099),
+        (9, 3, "敬老の日", 2003, 2099),
+        (10, 2, "体育の日", 2000, 2019),
+        (10, 2, "スポーツの日", 2020, 2099),
+    ]
+    # 特例法による移動・追加（名称 → 月日）
+    _SPECIAL: dict[int, dict[str, tuple[int, int]]] = {
+        2019: {"天皇の即位の日": (5, 1), "即位礼正殿の儀の行われる日": (10, 22)},
+        2020: {"海の日": (7, 23), "スポーツの日": (7, 24), "山の日": (8, 10)},
+        2021: {"海の日": (7, 22), "スポーツの日": (7, 23), "山の日": (8, 8)},
+    }
+
+    @classmethod
+    def names(cls, year: int) -> dict[date, str]:
+        """祝日・振替休日・国民の休日の日付 → 名称（範囲外の年は空）"""
+        if not cls.FIRST_YEAR <= year <= cls.LAST_YEAR:
+            return {}
+        statutory: dict[date, str] = cls._statutory(year)
+        substitutes: dict[date, str] = cls._substitutes(statutory, year)
+        bridges: dict[date, str] = {
+            d + timedelta(days=1): "国民の休日"
+            for d in statutory
+            if d + timedelta(days=2) in statutory
+            and d + timedelta(days=1) not in statutory
+            and d + timedelta(days=1) not in substitutes
+            and (d + timedelta(days=1)).weekday() != 6
+        }
+        return dict(sorted({**statutory, **substitutes, **bridges}.items()))
+
+    @classmethod
+    def _statutory(cls, year: int) -> dict[date, str]:
+        """「国民の祝日」そのもの（振替休日・国民の休日を除く）"""
+        named: dict[date, str] = {
+            date(year, m, d): name
+            for m, d, name, first, last in cls._FIXED
+            if first <= year <= last
+        }
+        for m, nth, name, first, last in cls._MONDAYS:
+            if first <= year <= last:
+                first_day: date = date(year, m, 1)
+                offset: int = (7 - first_day.weekday()) % 7 + (nth - 1) * 7
+                named[first_day + timedelta(days=offset)] = name
+        # 1980年を基準にした春分・秋分の近似式（2099年まで有効）
+        drift: float = 0.242194 * (year - 1980) - (year - 1980) // 4
+        named[date(year, 3, int(20.8431 + drift))] = "春分の日"
+        named[date(year, 9, int(23.2488 + drift))] = "秋分の日"
+        for name, (m, d) in cls._SPECIAL.get(year, {}).items():
+            named = {k: v for k, v in named.items() if v != name}
+            named[date(year, m, d)] = name
+        return named
+
+    @classmethod
+    def _substitutes(cls, statutory: dict[date, str], year: int) -> dict[date, str]:
+        """日曜日の祝日の振替休日（2007年からは直後の祝日でない日、それまでは翌日のみ）"""
+        result: dict[date, str] = {}
+        for d, name in sorted(statutory.items()):
+            if d.weekday() != 6:
+                continue
+            substitute: date = d + timedelta(days=1)
+            while year >= 2007 and substitute in statutory:
+                substitute += timedelta(days=1)
+            if substitute not in statutory:
+                result[substitute] = f"{name} 振替休日"
+        return result
@@ -0,0 +1,158 @@
+"""JSON の逐次読み取り"""
+
+import codecs
+import io
+import json
+import re
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, TextIO
+
+
+class JSONReader:
+    """JSON の逐次読み取り（オブジェクト・配列の中を1要素ずつ進め、値だけを raw_decode）
+
+    読み終えた部分はバッファから捨てるため、メモリは最大の要素1つ分で済む。
+    """
+
+    _CHUNK_CHARS: int = 64 * 1024
+    _NON_WHITESPACE: re.Pattern[str] = re.compile(r"[^ \t\n\r]")
+    _SEPARATOR: re.Pattern[str] = re.compile(r"[ \t\n\r]*,[ \t\n\r]*")
+    _STRING: str = r'"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+    _INNER: str = rf'\{{[^{{}}"]*+(?:{_STRING}[^{{}}"]*+)*+\}}'
+    # 入れ子が2段まで（イベントと data）のオブジェクト全体。文字列中の括弧は数えない
+    _OBJECT: str = rf'\{{[^{{}}"]*+(?:(?:{_STRING}|{_INNER})[^{{}}"]*+)*+\}}'
+
+    def __init__(self, stream: TextIO) -> None:
+        self._read: Callable[[int], str] = stream.read
+        self._decoder: json.JSONDecoder = json.JSONDecoder()
+        self._buffer: str = ""
+        self._pos: int = 0
+        self._eof: bool = False
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[bytes]) -> "JSONReader":
+        """UTF-8 のバイト列のチャンクから読む（文字がチャンク境界で分かれていてもよい）"""
+        decoder: codecs.IncrementalDecoder = codecs.getincrementaldecoder("utf-8")()
+        remaining: Iterator[bytes] = iter(chunks)
+
+        def read(_: int) -> str:
+            for chunk in remaining:
+                if text := decoder.decode(chunk):
+                    return text
+            return decoder.decode(b"", final=True)
+
+        reader: JSONReader = cls(io.StringIO())
+        reader._read = read
+        return reader
+
+    def peek(self) -> str:
+        """次の空白以外の1文字（終端は ""）"""
+        char: str = self._buffer[self._pos : self._pos + 1]
+        if char and char not in " \t\n\r":
+            # 区切りの直後など、空白を飛ばす必要がない場合は正規表現を使わない
+            return char
+        while True:
+            found: re.Match[str] | None = self._NON_WHITESPACE.search(
+                self._buffer, self._pos
+            )
+            self._pos = found.start() if found else len(self._buffer)
+            if found or self._eof:
+                return self._buffer[self._pos : self._pos + 1]
+            self._fill()
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            found: str = self._buffer[self._pos : self._pos + 40]
+            raise ValueError(f"JSON の解析に失敗しました: {char!r} の位置に {found!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """次の値を1つデコードする（チャンク境界で途切れていれば読み足す）"""
+        return self._decoded()[0]
+
+    def _decoded(self) -> tuple[Any, int]:
+        """次の値と、バッファ上のその開始位置"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # 末尾の数値などは続きが届いていない可能性があるため、区切りまで読む
+                if end < len(self._buffer) or self._eof:
+                    start: int = self._pos
+                    self._pos = end
+                    return value, start
+            except json.JSONDecodeError as e:
+                if self._eof:
+                    raise ValueError(f"JSON の解析に失敗しました: {e}") from e
+            self._fill()
+
+    def members(self) -> Iterator[str]:
+        """オブジェクトのキーを順に返す（値は呼び出し側が value() などで読む）"""
+        self.expect("{")
+        while self.peek() != "}":
+            key: str = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.expect(",")
+        self.expect("}")
+
+    def elements(self) -> Iterator[None]:
+        """配列の要素ごとに制御を返す（要素は呼び出し側が読む）"""
+        self.expect("[")
+        while self.peek() != "]":
+            yield
+            if self.peek() == ",":
+                self.expect(",")
+        self.expect("]")
+
+    def values(self) -> Iterator[Any]:
+        """配列の要素を順にデコードして返す"""
+        for _ in self._items():
+            yield self.value()
+
+    def texts(self, skip: str) -> Iterator[str]:
+        """配列の要素のうち、正規表現 skip に一致しないものを JSON のテキストのまま返す
+
+        skip に一致する要素の連続は区切りごと正規表現1回で読み飛ばし、デコードしない。
+        残りの要素も2段までのオブジェクトなら同じ1回で切り出し、それ以外の値や
+        チャンク境界で途切れた要素だけ raw_decode で終わりを求める。
+        """
+        pattern: re.Pattern[str] = re.compile(
+            rf"(?:{skip}[ \t\n\r]*,[ \t\n\r]*)*+({self._OBJECT})?"
+        )
+        for _ in self._items():
+            self.peek()
+            found: re.Match[str] = pattern.match(self._buffer, self._pos)
+            self._pos = found.end()
+            if found.group(1) is not None:
+                yield found.group(1)
+            else:
+                start: int = self._decoded()[1]
+                yield self._buffer[start : self._pos]
+
+    def _items(self) -> Iterator[None]:
+        """配列の要素ごとに制御を返す（要素間の区切りは正規表現1回で読み飛ばす）"""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield
+            separator: re.Match[str] | None = self._SEPARATOR.match(
+                self._buffer, self._pos
+            )
+            if separator and separator.end() < len(self._buffer):
+                self._pos = separator.end()
+                continue
+            # チャンク境界にかかった区切りや配列の終わりは1文字ずつ確かめる
+            if self.peek() == "]":
+                self._pos += 1
+                return
+            self.expect(",")
+
+    def _fill(self) -> None:
+        chunk: str = self._read(self._CHUNK_CHARS)
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        self._eof = not chunk
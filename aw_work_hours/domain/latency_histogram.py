@@ -0,0 +1,49 @@
+"""レイテンシのヒストグラム"""
+
+import bisect
+
+
+class LatencyHistogram:
+    """レイテンシのヒストグラム（秒単位・Prometheus と同じ累積バケットで出力）"""
+
+    _BOUNDS: tuple[float, ...] = (
+        0.001,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1,
+        2.5,
+        5,
+        10,
+    )
+
+    def __init__(self) -> None:
+        self._counts: list[int] = [0] * (len(self._BOUNDS) + 1)
+        self._total: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self._counts[bisect.bisect_left(self._BOUNDS, seconds)] += 1
+        self._total += seconds
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    @property
+    def total(self) -> float:
+        return self._total
+
+    def exposition(self, name: str, labels: str) -> list[str]:
+        """Prometheus テキスト形式の _bucket・_sum・_count 行"""
+        lines: list[str] = []
+        cumulative: int = 0
+        for bound, count in zip((*self._BOUNDS, "+Inf"), self._counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self._total:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {cumulative}")
+        return lines
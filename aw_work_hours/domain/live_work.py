@@ -0,0 +1,76 @@
+"""実行中の勤務集計"""
+
+from datetime import date, datetime
+
+from ..types import AFKInterval
+from .afk_events import AFKEvents
+from .daily_work import DailyWork
+from .work_day import WorkDay
+from .work_rule import WorkRule
+
+
+class LiveWork:
+    """実行中の勤務集計（最後に見たイベント以降だけをAPIから取得して差分更新）
+
+    ActivityWatch はハートビートで最新のイベントだけを延長するため、
+    最後に加えた区間の延長分と、それより後に始まった区間だけを DailyWork に反映する。
+    1回の更新の負荷は前回からの新着分だけに比例し、起動からの経過時間に依存しない。
+    """
+
+    def __init__(
+        self, bucket_id: str, daily_work: DailyWork, events: AFKEvents
+    ) -> None:
+        self._bucket_id: str = bucket_id
+        self._daily_work: DailyWork = daily_work
+        self._last: AFKInterval | None = (
+            events.intervals[-1] if events.intervals else None
+        )
+        self._applied: list[AFKInterval] = []
+
+    @property
+    def applied(self) -> list[AFKInterval]:
+        """直前の poll で反映した区間（延長された区間は延長後）"""
+        return self._applied
+
+    def poll(self, since: datetime) -> dict[date, WorkDay]:
+        """新着イベントを反映し、変わった勤務日の集計を返す（since は初回の取得開始時刻）"""
+        start: datetime = self._last.start if self._last else since
+        fetched: AFKEvents = AFKEvents.fetch(start.isoformat(), None, self._bucket_id)
+        changed: set[date] = set()
+        self._applied = []
+        for interval in fetched.intervals:
+            if self._apply(interval):
+                changed.add(WorkRule.work_date(interval.start))
+        return self._work_days(changed)
+
+    def _apply(self, interval: AFKInterval) -> bool:
+        """反映したか（取得済みで変化のない区間・最新より前に始まる区間は無視）"""
+        last: AFKInterval | None = self._last
+        if last and interval.start == last.start:
+            if interval.end <= last.end:
+                return False
+            self._daily_work.stretch(last, interval)
+        elif last and interval.start < last.start:
+            return False
+        else:
+            self._daily_work.add(interval)
+        self._last = interval
+        self._applied.append(interval)
+        return True
+
+    def _work_days(self, dates: set[date]) -> dict[date, WorkDay]:
+        """末尾のブロックだけをたどって、指定した勤務日の集計を作る"""
+        spans: dict[date, tuple[datetime, datetime]] = {}
+        for block_start, block_end in reversed(self._daily_work.blocks):
+            wd: date = WorkRule.work_date(block_start)
+            if not dates or wd < min(dates):
+                break
+            s, e = spans.get(wd, (block_start, block_end))
+            spans[wd] = (min(s, block_start), max(e, block_end))
+        return {
+            d: WorkDay(
+                s, e, self._daily_work.active.get(d, 0), self._daily_work.gaps.get(d, 0)
+            )
+            for d, (s, e) in spans.items()
+            if d in dates
+        }
@@ -6,22 +6,39 @@ from ..types import _TIMEZONE, CLIError
 
 
 class MonthPeriod:
-    """月の期間"""
+    """月の期間（1か月・全期間・A..B の月範囲）"""
 
-    def __init__(self, start: datetime | None, end: datetime | None) -> None:
+    def __init__(
+        self, start: datetime | None, end: datetime | None, ranged: bool = False
+    ) -> None:
         self._start: datetime | None = start
         self._end: datetime | None = end
+        self._ranged: bool = ranged
 
     @classmethod
     def parse(cls, month_str: str) -> "MonthPeriod":
         if month_str == "all":
             return cls(None, None)
+        if ".." in month_str:
+            return cls._parse_range(month_str)
         year, month = cls._parse_year_month(month_str)
         start: datetime = datetime(year, month, 1, tzinfo=_TIMEZONE)
         end_year, end_month = (year + 1, 1) if month == 12 else (year, month + 1)
         end: datetime = datetime(end_year, end_month, 1, tzinfo=_TIMEZONE)
         return cls(start, end)
 
+    @classmethod
+    def _parse_range(cls, month_str: str) -> "MonthPeriod":
+        """A..B: A月の初日から B月の末日まで（A・B は YYYY-MM・this・last）"""
+        first, _, last = month_str.partition("..")
+        if "all" in (first, last):
+            raise CLIError(f"エラー: 月範囲に all は指定できません: {month_str}")
+        start: datetime | None = cls.parse(first)._start
+        end: datetime | None = cls.parse(last)._end
+        if start is None or end is None or end <= start:
+            raise CLIError(f"エラー: 範囲の開始月が終了月より後です: {month_str}")
+        return cls(start, end, ranged=True)
+
     @classmethod
     def _parse_year_month(cls, month_str: str) -> tuple[int, int]:
         now: datetime = datetime.now(_TIMEZONE)
@@ -42,6 +59,26 @@ class MonthPeriod:
             self._end.isoformat() if self._end else None,
         )
 
+    @property
+    def ranged(self) -> bool:
+        """A..B の月範囲か（テキスト出力に週・月の小計を挟む）"""
+        return self._ranged
+
+    @property
+    def finished(self) -> bool:
+        """期間が終了済みか（以後イベントが増えない）"""
+        return self._end is not None and self._end <= datetime.now(_TIMEZONE)
+
+    def neighbors(self) -> list["MonthPeriod"]:
+        """1か月の期間の前月と翌月（まだ始まっていない月・全期間・月範囲は除く）"""
+        if self._ranged or self._start is None:
+            return []
+        previous: date = self._start.date() - timedelta(days=1)
+        months: list[MonthPeriod] = [self.parse(f"{previous:%Y-%m}")]
+        if self._end is not None and self._end <= datetime.now(_TIMEZONE):
+            months.append(self.parse(f"{self._end:%Y-%m}"))
+        return months
+
     def date_range(self) -> list[date]:
         if not (self._start and self._end):
             return []
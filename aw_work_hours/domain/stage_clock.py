@@ -0,0 +1,68 @@
+"""処理段階ごとの所要時間"""
+
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+
+from .latency_histogram import LatencyHistogram
+
+
+class StageClock:
+    """処理段階ごとの所要時間（プロセス全体で集計し、--profile と /metrics で参照）
+
+    段階は入れ子にできる（例: history の中の fetch、その中の fetch.network）。
+    並行取得の段階はスレッドごとの時間の合計になるため、実時間を超えることがある。
+    """
+
+    _histograms: dict[str, LatencyHistogram] = {}
+    _lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    @contextmanager
+    def measure(cls, stage: str) -> Iterator[None]:
+        started: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            cls.observe(stage, time.perf_counter() - started)
+
+    @classmethod
+    def timed(cls, chunks: Iterable[bytes], stage: str) -> Iterator[bytes]:
+        """チャンクを受け取るまでの待ち時間だけを計測（受け取った後の処理は含めない）"""
+        iterator: Iterator[bytes] = iter(chunks)
+        waited: float = 0.0
+        try:
+            while True:
+                started: float = time.perf_counter()
+                chunk: bytes | None = next(iterator, None)
+                waited += time.perf_counter() - started
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            cls.observe(stage, waited)
+
+    @classmethod
+    def observe(cls, stage: str, seconds: float) -> None:
+        with cls._lock:
+            cls._histograms.setdefault(stage, LatencyHistogram()).observe(seconds)
+
+    @classmethod
+    def totals(cls) -> dict[str, tuple[int, float]]:
+        """段階名 → 呼び出し回数・合計秒数（段階名順）"""
+        with cls._lock:
+            return {
+                stage: (h.count, h.total)
+                for stage, h in sorted(cls._histograms.items())
+            }
+
+    @classmethod
+    def exposition(cls, name: str) -> list[str]:
+        """段階ごとのヒストグラム（Prometheus テキスト形式）"""
+        with cls._lock:
+            return [
+                line
+                for stage, h in sorted(cls._histograms.items())
+                for line in h.exposition(name, f'stage="{stage}"')
+            ]
@@ -0,0 +1,89 @@
+"""チームの勤務集計"""
+
+from concurrent.futures import Future
+from datetime import date
+from pathlib import Path
+
+from ..types import CLIError
+from .afk_events import AFKEvents
+from .daily_work import DailyWork
+from .event_file import EventFile
+from .month_period import MonthPeriod
+from .work_calendar import WorkCalendar
+from .work_day import WorkDay
+from .work_rule import WorkRule
+
+
+class TeamWork:
+    """エクスポートのディレクトリを1ファイル1人として集計する（人ごとにプロセス並列）
+
+    人の名前はファイル名（拡張子を除く、重複は CLIError）。大きいファイルから投入し、
+    待ち時間が人数ではなくコア数と最大のファイルで決まるようにする。
+    """
+
+    SUFFIXES: tuple[str, ...] = (".json", ".ndjson", ".jsonl")
+
+    def __init__(
+        self, directory: Path, period: MonthPeriod, jobs: int, bucket: str | None
+    ) -> None:
+        self._paths: list[Path] = sorted(
+            p for p in directory.iterdir() if p.suffix in self.SUFFIXES
+        )
+        if not self._paths:
+            raise CLIError(f"エラー: エクスポートファイルがありません: {directory}")
+        stems: list[str] = [p.stem for p in self._paths]
+        duplicated: list[str] = sorted({s for s in stems if stems.count(s) > 1})
+        if duplicated:
+            raise CLIError(
+                "エラー: 同じ名前のエクスポートファイルが複数あります: "
+                + ", ".join(duplicated)
+            )
+        self._period: MonthPeriod = period
+        self._jobs: int = min(jobs, len(self._paths))
+        self._bucket: str | None = bucket
+        self._failures: dict[str, str] = {}
+
+    @property
+    def failures(self) -> dict[str, str]:
+        """読み込めなかった人 → エラーメッセージ"""
+        return self._failures
+
+    def aggregate(self) -> dict[str, dict[date, WorkDay]]:
+        """人 → 勤務日ごとの集計（名前順）"""
+        args: list[tuple] = [
+            (str(p), self._bucket, WorkRule.MIN_EVENT_SECONDS, *self._period.iso)
+            for p in sorted(self._paths, key=lambda p: p.stat().st_size, reverse=True)
+        ]
+        if self._jobs <= 1:
+            results: dict[str, dict[date, WorkDay] | str] = {
+                Path(a[0]).stem: self._guarded(*a) for a in args
+            }
+        else:
+            # multiprocessing の読み込みは重いため、並列集計するときだけ読み込む
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=self._jobs) as pool:
+                futures: dict[str, Future] = {
+                    Path(a[0]).stem: pool.submit(TeamWork._guarded, *a) for a in args
+                }
+                results = {name: f.result() for name, f in futures.items()}
+        self._failures = {n: r for n, r in results.items() if isinstance(r, str)}
+        return {n: r for n, r in sorted(results.items()) if not isinstance(r, str)}
+
+    @staticmethod
+    def _guarded(
+        path: str,
+        bucket: str | None,
+        min_event_seconds: int,
+        start: str | None,
+        end: str | None,
+    ) -> dict[date, WorkDay] | str:
+        """ワーカー: 1人分の集計（読めないファイルは他の人を止めずにメッセージを返す）"""
+        # spawn 方式のワーカーにはクラス変数が引き継がれないため明示的に設定する
+        WorkRule.MIN_EVENT_SECONDS = min_event_seconds
+        try:
+            events: AFKEvents = EventFile(Path(path), bucket).events(start, end)
+        except CLIError as e:
+            return str(e)
+        daily_work: DailyWork = DailyWork(events.intervals)
+        return WorkCalendar.from_blocks(daily_work.blocks).work_days(daily_work)
@@ -1,16 +1,31 @@
 """勤務カレンダー"""
 
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
+from typing import TypeVar
 
+from .afk_bucket import AFKBucket
+from .afk_event_history import AFKEventHistory
 from .afk_events import AFKEvents
 from .daily_work import DailyWork
+from .event_file import EventFile
+from .event_snapshot import EventSnapshot
 from .month_period import MonthPeriod
+from .stage_clock import StageClock
+from .work_day import WorkDay
+from .work_months import WorkMonths
 from .work_rule import WorkRule
 
+_T = TypeVar("_T")
+
 
 class WorkCalendar:
     """勤務カレンダー"""
 
+    # --from-snapshot・--input 指定時はイベント履歴・APIの代わりにファイルから読む
+    _source: EventSnapshot | EventFile | None = None
+
     def __init__(self, daily: dict[date, tuple[datetime, datetime]]) -> None:
         self._daily: dict[date, tuple[datetime, datetime]] = daily
 
@@ -31,11 +46,62 @@ class WorkCalendar:
         cls, period: MonthPeriod
     ) -> tuple["WorkCalendar", DailyWork, AFKEvents]:
         """ドメイン計算の入口: 期間→カレンダー・勤務統計・イベント"""
-        events: AFKEvents = AFKEvents.fetch(*period.iso)
-        daily_work: DailyWork = DailyWork(events.raw)
-        calendar: "WorkCalendar" = cls.from_blocks(events.work_blocks)
+        events: AFKEvents = cls._events(period)
+        with StageClock.measure("blocks"):
+            daily_work: DailyWork = DailyWork(events.intervals)
+            calendar: "WorkCalendar" = cls.from_blocks(daily_work.blocks)
         return calendar, daily_work, events
 
+    @classmethod
+    def from_period_parallel(
+        cls, period: MonthPeriod, jobs: int
+    ) -> tuple["WorkCalendar", DailyWork, int]:
+        """勤務月ごとに並列集計する入口: 期間→カレンダー・勤務統計・イベント数"""
+        if cls._source:
+            # ファイルは1回の走査で読むため、勤務月に分割せずに集計する
+            calendar, daily_work, events = cls.from_period(period)
+            return calendar, daily_work, len(events.intervals)
+        histories: list[AFKEventHistory] = cls._histories()
+        with StageClock.measure("history"):
+            cls._each(histories, lambda h: h.sync())
+        with StageClock.measure("work_months"):
+            daily_work, count = WorkMonths(histories, *period.iso, jobs).aggregate()
+        return cls.from_blocks(daily_work.blocks), daily_work, count
+
+    @classmethod
+    def use_source(cls, source: EventSnapshot | EventFile | None) -> None:
+        cls._source = source
+
+    @classmethod
+    def source(cls) -> EventSnapshot | EventFile | None:
+        return cls._source
+
+    @classmethod
+    def _events(cls, period: MonthPeriod) -> AFKEvents:
+        if cls._source:
+            with StageClock.measure("source"):
+                return cls._source.events(*period.iso)
+        histories: list[AFKEventHistory] = cls._histories()
+        with StageClock.measure("history"):
+            parts: list[AFKEvents] = cls._each(
+                histories, lambda h: h.events(*period.iso)
+            )
+        return parts[0] if len(parts) == 1 else AFKEvents.merged(parts)
+
+    @classmethod
+    def _histories(cls) -> list[AFKEventHistory]:
+        return [AFKEventHistory(bucket_id) for bucket_id in AFKBucket.ids()]
+
+    @classmethod
+    def _each(
+        cls, histories: list[AFKEventHistory], fn: Callable[[AFKEventHistory], _T]
+    ) -> list[_T]:
+        """複数PCのバケットは並行して同期・取得する"""
+        if len(histories) == 1:
+            return [fn(histories[0])]
+        with ThreadPoolExecutor(max_workers=len(histories)) as pool:
+            return list(pool.map(fn, histories))
+
     @property
     def days(self) -> int:
         return len(self._daily)
@@ -43,3 +109,10 @@ class WorkCalendar:
     @property
     def daily(self) -> dict[date, tuple[datetime, datetime]]:
         return self._daily
+
+    def work_days(self, daily_work: DailyWork) -> dict[date, WorkDay]:
+        """勤務日ごとの集計（テキスト・CSV・HTMLで共有する日別ルックアップ）"""
+        return {
+            d: WorkDay(s, e, daily_work.active.get(d, 0), daily_work.gaps.get(d, 0))
+            for d, (s, e) in self._daily.items()
+        }
@@ -0,0 +1,33 @@
+"""1勤務日の集計"""
+
+from datetime import datetime
+
+from .work_rule import WorkRule
+
+
+class WorkDay:
+    """1勤務日の集計（時間単位の値は生成時に一度だけ計算）"""
+
+    def __init__(
+        self, start: datetime, end: datetime, active: float, max_gap: float
+    ) -> None:
+        self.start: datetime = start
+        self.end: datetime = end
+        self._span: float = WorkRule.span_hours(start, end)
+        self._afk: float = self._span - active / 3600
+        self._max_gap: float = max_gap / 3600
+
+    @property
+    def span(self) -> float:
+        """開始〜終了の時間幅（時間単位）"""
+        return self._span
+
+    @property
+    def afk(self) -> float:
+        """時間幅のうち not-afk でなかった時間（時間単位）"""
+        return self._afk
+
+    @property
+    def max_gap(self) -> float:
+        """最大の連続離席時間（時間単位）"""
+        return self._max_gap
@@ -0,0 +1,137 @@
+"""勤務月ごとの並列集計"""
+
+from datetime import datetime
+from math import inf
+from pathlib import Path
+
+from ..types import _TIMEZONE, AFKInterval
+from .afk_event_history import AFKEventHistory
+from .afk_events import AFKEvents
+from .daily_work import DailyWork
+from .work_rule import WorkRule
+
+
+class WorkMonths:
+    """期間を勤務月（毎月1日5:00区切り）に分けた並列集計
+
+    勤務日は5:00区切りなので、勤務月の境界で分ければ日別の active・gap は
+    各月の中で完結する。月をまたぐ勤務ブロックは DailyWork.merged で
+    接続し直すため、結果は一括集計と一致する。
+    複数PCのバケットは月ごとに結合した区間を返し、境界の5:00をまたいで重なる区間を
+    親プロセスでもう一度結合してから集計する（一括集計の和集合と一致させるため）。
+    """
+
+    def __init__(
+        self,
+        histories: list[AFKEventHistory],
+        start: str | None,
+        end: str | None,
+        jobs: int,
+    ) -> None:
+        self._histories: list[AFKEventHistory] = histories
+        self._start: str | None = start
+        self._end: str | None = end
+        self._jobs: int = jobs
+
+    def aggregate(self) -> tuple[DailyWork, int]:
+        """保存済みイベントを月ごとに集計して結合（勤務統計・イベント数）"""
+        bounds: list[str | None] = self._bounds()
+        args: list[tuple] = [
+            (
+                str(self._histories[0].path),
+                tuple(h.bucket_id for h in self._histories),
+                WorkRule.MIN_EVENT_SECONDS,
+                self._start if i == 0 else lower,
+                self._end if i == len(bounds) - 2 else upper,
+                lower,
+                upper,
+            )
+            for i, (lower, upper) in enumerate(zip(bounds, bounds[1:]))
+        ]
+        if self._jobs <= 1 or len(args) == 1:
+            parts: list[tuple[DailyWork | list[AFKInterval], int]] = [
+                self._month(*a) for a in args
+            ]
+        else:
+            # multiprocessing の読み込みは重いため、並列集計するときだけ読み込む
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=self._jobs) as pool:
+                parts = list(pool.map(WorkMonths._month, *zip(*args)))
+        return self._merged([p for p, _ in parts]), sum(n for _, n in parts)
+
+    @staticmethod
+    def _merged(parts: list[DailyWork | list[AFKInterval]]) -> DailyWork:
+        """月ごとの結果を結合（複数PCは月をまたいで重なる区間も和集合にしてから集計）"""
+        if all(isinstance(p, DailyWork) for p in parts):
+            return DailyWork.merged(parts)
+        months: list[AFKEvents] = [AFKEvents.from_intervals(p) for p in parts]
+        return DailyWork(AFKEvents.merged(months).intervals)
+
+    def _bounds(self) -> list[str | None]:
+        """各月の担当範囲の境界（先頭・末尾の None は期間の端まで）"""
+        spans: list[tuple[datetime, datetime]] = [
+            s for h in self._histories if (s := h.span()) is not None
+        ]
+        if not spans:
+            return [None, None]
+        span: tuple[datetime, datetime] = (
+            min(s[0] for s in spans),
+            max(s[1] for s in spans),
+        )
+        first: datetime = (
+            datetime.fromisoformat(self._start).astimezone(_TIMEZONE)
+            if self._start
+            else span[0]
+        )
+        last: datetime = (
+            datetime.fromisoformat(self._end).astimezone(_TIMEZONE)
+            if self._end
+            else span[1]
+        )
+        bounds: list[str | None] = [None]
+        year, month = first.year, first.month
+        boundary: datetime = datetime(year, month, 1, 5, tzinfo=_TIMEZONE)
+        while boundary <= last:
+            if boundary > first:
+                bounds.append(boundary.isoformat())
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+            boundary = datetime(year, month, 1, 5, tzinfo=_TIMEZONE)
+        return bounds + [None]
+
+    @staticmethod
+    def _month(
+        path: str,
+        bucket_ids: tuple[str, ...],
+        min_event_seconds: int,
+        start: str | None,
+        end: str | None,
+        lower: str | None,
+        upper: str | None,
+    ) -> tuple[DailyWork | list[AFKInterval], int]:
+        """ワーカー: 開始時刻が [lower, upper) のイベントだけを集計（複数PCは結合した区間）"""
+        # spawn 方式のワーカーにはクラス変数が引き継がれないため明示的に設定する
+        WorkRule.MIN_EVENT_SECONDS = min_event_seconds
+        parts: list[AFKEvents] = [
+            WorkMonths._owned(
+                AFKEventHistory(b, Path(path)).stored(start, end), lower, upper
+            )
+            for b in bucket_ids
+        ]
+        if len(parts) == 1:
+            return DailyWork(parts[0].intervals), len(parts[0].raw)
+        owned: AFKEvents = AFKEvents.merged(parts)
+        return owned.intervals, len(owned.raw)
+
+    @staticmethod
+    def _owned(events: AFKEvents, lower: str | None, upper: str | None) -> AFKEvents:
+        """前後の月と重複しないよう、開始時刻でイベントの担当月を決める"""
+        low: float = datetime.fromisoformat(lower).timestamp() if lower else -inf
+        high: float = datetime.fromisoformat(upper).timestamp() if upper else inf
+        return AFKEvents(
+            [
+                e
+                for e in events.raw
+                if low <= datetime.fromisoformat(e["timestamp"]).timestamp() < high
+            ]
+        )
@@ -0,0 +1,117 @@
+"""勤務日ごとの集計の永続キャッシュ"""
+
+import sqlite3
+from contextlib import closing
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+
+from ..types import _TIMEZONE
+from .month_period import MonthPeriod
+from .stage_clock import StageClock
+from .work_calendar import WorkCalendar
+from .work_day import WorkDay
+from .work_rule import WorkRule
+
+# 勤務日の開始・終了・active秒・最大gap秒
+_DayRow = tuple[datetime, datetime, float, float]
+
+
+class WorkRollup:
+    """勤務日ごとの集計の永続キャッシュ（SQLite・バケットと判定ルールごと）
+
+    確定した勤務日（開始・終了・active秒・最大gap秒、勤務なしの日は NULL）を1日1行で保存し、
+    月範囲の集計では保存済みの日を読むだけにして、残りの日だけをイベントから集計し直す。
+    最後の勤務ブロックはハートビートで延長されうるため、その勤務日以降は保存しない。
+    """
+
+    _PATH: Path = Path.home() / ".config" / "aw-work-hours" / "rollup.sqlite3"
+    _SCHEMA: str = """
+        CREATE TABLE IF NOT EXISTS days (
+            bucket TEXT NOT NULL,
+            rule TEXT NOT NULL,
+            work_date TEXT NOT NULL,
+            start TEXT,
+            end TEXT,
+            active REAL NOT NULL,
+            max_gap REAL NOT NULL,
+            PRIMARY KEY (bucket, rule, work_date)
+        );
+    """
+    # 集計し直す範囲の前日から取得し、前日から続く勤務ブロックを正しくつなぐ
+    _LOOKBACK: timedelta = timedelta(days=1)
+
+    def __init__(self, bucket_id: str, path: Path | None = None) -> None:
+        self._bucket_id: str = bucket_id
+        self._path: Path = path or self._PATH
+
+    def days(self, period: MonthPeriod) -> tuple[dict[date, WorkDay], int]:
+        """期間内の勤務日の集計と、イベントから集計し直した日数"""
+        dates: list[date] = period.date_range()
+        if not dates:
+            return {}, 0
+        with StageClock.measure("rollup.select"):
+            rows: dict[date, _DayRow | None] = self._load(dates[0], dates[-1])
+        missing: list[date] = [d for d in dates if d not in rows]
+        if missing:
+            computed, settled = self._compute(missing[0], missing[-1])
+            rows.update({d: computed.get(d) for d in missing})
+            self._save({d: computed.get(d) for d in missing if d < settled})
+        days: dict[date, WorkDay] = {d: WorkDay(*r) for d, r in rows.items() if r}
+        return days, len(missing)
+
+    def _compute(self, first: date, last: date) -> tuple[dict[date, _DayRow], date]:
+        """first〜last の勤務日の集計と、保存してよい日の上限（その日は含まない）"""
+        period: MonthPeriod = MonthPeriod(
+            datetime.combine(first - self._LOOKBACK, time.min, _TIMEZONE),
+            datetime.combine(last + timedelta(days=1), time.min, _TIMEZONE),
+        )
+        calendar, daily_work, _ = WorkCalendar.from_period(period)
+        settled: date = WorkRule.work_date(datetime.now(_TIMEZONE))
+        if daily_work.blocks:
+            settled = min(settled, WorkRule.work_date(daily_work.blocks[-1][0]))
+        rows: dict[date, _DayRow] = {
+            d: (s, e, daily_work.active.get(d, 0), daily_work.gaps.get(d, 0))
+            for d, (s, e) in calendar.daily.items()
+            if first <= d <= last
+        }
+        return rows, settled
+
+    def _load(self, first: date, last: date) -> dict[date, _DayRow | None]:
+        with closing(self._connect()) as conn:
+            records: list[tuple[str, str | None, str | None, float, float]] = (
+                conn.execute(
+                    "SELECT work_date, start, end, active, max_gap FROM days"
+                    " WHERE bucket = ? AND rule = ? AND work_date BETWEEN ? AND ?",
+                    (self._bucket_id, WorkRule.signature(), str(first), str(last)),
+                ).fetchall()
+            )
+        return {
+            date.fromisoformat(d): (
+                (datetime.fromisoformat(s), datetime.fromisoformat(e), active, gap)
+                if s and e
+                else None
+            )
+            for d, s, e, active, gap in records
+        }
+
+    def _save(self, rows: dict[date, _DayRow | None]) -> None:
+        rule: str = WorkRule.signature()
+        records: list[tuple[str, str, str, str | None, str | None, float, float]] = [
+            (self._bucket_id, rule, d.isoformat())
+            + (
+                (r[0].isoformat(), r[1].isoformat(), r[2], r[3])
+                if r
+                else (None, None, 0, 0)
+            )
+            for d, r in rows.items()
+        ]
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO days VALUES (?, ?, ?, ?, ?, ?, ?)", records
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn: sqlite3.Connection = sqlite3.connect(self._path, timeout=30)
+        conn.executescript(self._SCHEMA)
+        return conn
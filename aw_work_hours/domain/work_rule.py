@@ -20,6 +20,14 @@ class WorkRule:
         """勤務日: 0:00-4:59は前日扱い"""
         return (dt - timedelta(days=1)).date() if 0 <= dt.hour < 5 else dt.date()
 
+    @staticmethod
+    def signature() -> str:
+        """集計結果を左右する判定パラメーター（日別集計キャッシュのキー）"""
+        return (
+            f"min_event={WorkRule.MIN_EVENT_SECONDS};gap={WorkRule._GAP_SECONDS};"
+            f"boundary={WorkRule._DAY_BOUNDARY_HOUR}"
+        )
+
     @staticmethod
     def is_block_boundary(gap_seconds: float, start_hour: int) -> bool:
         """3時間超の離席 かつ 5:00以降に再開 → 新ブロック"""
@@ -0,0 +1,30 @@
+"""チームのCSV出力"""
+
+from datetime import date
+
+from ..domain.month_period import MonthPeriod
+from ..domain.work_day import WorkDay
+from .work_csv import WorkCSV
+
+
+class TeamCSV:
+    """チームのCSV出力（WorkCSV の各行の先頭に人の列を加えて連結）"""
+
+    def __init__(
+        self, team: dict[str, dict[date, WorkDay]], period: MonthPeriod
+    ) -> None:
+        self._team: dict[str, dict[date, WorkDay]] = team
+        self._period: MonthPeriod = period
+
+    def content(self) -> str:
+        lines: list[str] = [f"person,{WorkCSV.HEADER}"]
+        for person, days in self._team.items():
+            name: str = self._quoted(person)
+            lines += [f"{name},{row}" for row in WorkCSV(days, self._period).rows()]
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _quoted(value: str) -> str:
+        if any(c in value for c in ',"\n'):
+            return '"' + value.replace('"', '""') + '"'
+        return value
@@ -0,0 +1,42 @@
+"""週・月の小計"""
+
+from datetime import date
+
+from ..domain.work_day import WorkDay
+
+
+class WorkSubtotals:
+    """月範囲（A..B）のテキスト出力に挟む週・月の小計と合計
+
+    週は月曜〜日曜で、月をまたぐ週も分けずに日曜（または範囲の最終日）の行の後に出す。
+    """
+
+    def __init__(self, days: dict[date, WorkDay]) -> None:
+        self._days: dict[date, WorkDay] = days
+
+    def insert(self, dates: list[date], lines: list[str]) -> list[str]:
+        """日ごとの行の間に小計の行を挟み、末尾に合計を加える"""
+        result: list[str] = []
+        week: list[date] = []
+        month: list[date] = []
+        for i, (d, line) in enumerate(zip(dates, lines)):
+            result.append(line)
+            week.append(d)
+            month.append(d)
+            last: bool = i == len(dates) - 1
+            if last or d.weekday() == 6:
+                result.append(self.line("  週計", week))
+                week = []
+            if last or dates[i + 1].month != d.month:
+                result.append(self.line(f"{d:%Y-%m} 月計", month))
+                month = []
+        result.append(self.line("合計", dates))
+        return result
+
+    def line(self, label: str, dates: list[date]) -> str:
+        """dates のうち勤務した日の日数・時間幅・離席の合計"""
+        worked: list[WorkDay] = [self._days[d] for d in dates if d in self._days]
+        span: float = sum(w.span for w in worked)
+        afk: float = sum(w.afk for w in worked)
+        line: str = f"{label}   {len(worked)}日   ({span:.1f}h)"
+        return line if afk < 0.05 else f"{line}   -{afk:.1f}h"
@@ -1,6 +1,7 @@
 """定数・例外・型定義"""
 
-from typing import TypedDict
+from datetime import datetime
+from typing import NamedTuple, TypedDict
 from zoneinfo import ZoneInfo
 
 _API_BASE: str = "http://127.0.0.1:5600/api/0"
@@ -19,11 +20,21 @@ class APIConnectionError(Exception):
 class AWEvent(TypedDict):
     """ActivityWatch APIから取得するイベント"""
 
+    id: int
     timestamp: str
     duration: float
     data: dict[str, str]
 
 
+class AFKInterval(NamedTuple):
+    """not-afkイベントの正規化済み区間（タイムゾーン変換済み）"""
+
+    start: datetime
+    end: datetime
+    duration: float
+    data: dict[str, str]
+
+
 class HTMLEvent(TypedDict):
     """HTML UI用のイベントデータ"""
 
@@ -0,0 +1,63 @@
+"""/api プロキシのレスポンスキャッシュ"""
+
+import hashlib
+import threading
+import urllib.parse
+from collections import OrderedDict
+from datetime import datetime
+
+from ..types import _TIMEZONE
+
+
+class APIProxyCache:
+    """/api プロキシのレスポンスキャッシュ（終了済みの期間だけ・合計バイト数上限付きLRU）
+
+    end が過去のクエリは以後イベントが増えないため、パス（クエリ込み）単位で保存する。
+    圧縮した本文は送信時にエントリの encoded に入れて再利用する（上限は圧縮前の本文で数える）。
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024) -> None:
+        self._max_bytes: int = max_bytes
+        self._bytes: int = 0
+        self._entries: OrderedDict[str, tuple[str, bytes, str, dict[str, bytes]]] = (
+            OrderedDict()
+        )
+        self._lock: threading.Lock = threading.Lock()
+
+    def cacheable(self, path: str) -> bool:
+        """クエリの end が現在より前か（MonthPeriod.finished と同じ基準）"""
+        query: dict[str, list[str]] = urllib.parse.parse_qs(
+            urllib.parse.urlsplit(path).query
+        )
+        try:
+            # クエリ中の "+09:00" の + は parse_qs で空白になるため戻す
+            end: datetime = datetime.fromisoformat(query["end"][0].replace(" ", "+"))
+        except (KeyError, ValueError):
+            return False
+        if end.tzinfo is None:
+            end = end.replace(tzinfo=_TIMEZONE)
+        return end <= datetime.now(_TIMEZONE)
+
+    def entry(self, path: str) -> tuple[str, bytes, str, dict[str, bytes]] | None:
+        """Content-Type・本文・強いETag・圧縮済みの本文（送信時に追加する）"""
+        with self._lock:
+            cached: tuple[str, bytes, str, dict[str, bytes]] | None = self._entries.get(
+                path
+            )
+            if cached:
+                self._entries.move_to_end(path)
+            return cached
+
+    def store(self, path: str, content_type: str, body: bytes) -> str:
+        """保存して強いETagを返す（上限の1/4を超える本文は保存しない）"""
+        etag: str = f'"{hashlib.sha256(body).hexdigest()}"'
+        if len(body) > self._max_bytes // 4:
+            return etag
+        with self._lock:
+            if path in self._entries:
+                self._bytes -= len(self._entries.pop(path)[1])
+            self._entries[path] = (content_type, body, etag, {})
+            self._bytes += len(body)
+            while self._bytes > self._max_bytes:
+                self._bytes -= len(self._entries.popitem(last=False)[1][1])
+        return etag
@@ -0,0 +1,65 @@
+"""HTTPレスポンスの圧縮形式"""
+
+import gzip
+import zlib
+from collections.abc import Iterable, Iterator
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # brotli は任意依存（無ければ gzip のみ）
+    brotli = None
+
+
+class ContentEncoding:
+    """HTTPレスポンスの圧縮形式（Accept-Encoding とのネゴシエーション）"""
+
+    MIN_BYTES: int = 1024
+
+    @staticmethod
+    def available() -> list[str]:
+        """サーバー側で使える圧縮形式（優先順）"""
+        return (["br"] if brotli else []) + ["gzip"]
+
+    @staticmethod
+    def negotiate(accept: str | None, size: int) -> str | None:
+        """クライアントが受け付ける最優先の圧縮形式（圧縮しない場合はNone）"""
+        if not accept or size < ContentEncoding.MIN_BYTES:
+            return None
+        weights: dict[str, float] = {}
+        for token in accept.split(","):
+            name, _, params = token.strip().partition(";")
+            q: str = params.strip()[2:] if params.strip().startswith("q=") else "1"
+            try:
+                weights[name.strip().lower()] = float(q)
+            except ValueError:
+                continue
+        for encoding in ContentEncoding.available():
+            if weights.get(encoding, weights.get("*", 0)) > 0:
+                return encoding
+        return None
+
+    @staticmethod
+    def compress(body: bytes, encoding: str) -> bytes:
+        """圧縮済みの本文（再利用する結果は呼び出し側がキャッシュのエントリと一緒に持つ）"""
+        if encoding == "br" and brotli:
+            return brotli.compress(body)
+        return gzip.compress(body, compresslevel=6, mtime=0)
+
+    @staticmethod
+    def stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+        """本文を溜めずにチャンクごとに圧縮する（長さが分からないプロキシ応答用）"""
+        if encoding == "br" and brotli:
+            compressor = brotli.Compressor()
+            for chunk in chunks:
+                yield compressor.process(chunk)
+            yield compressor.finish()
+            return
+        gz = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            yield gz.compress(chunk)
+        yield gz.flush()
+
+    @staticmethod
+    def etag(etag: str, encoding: str | None) -> str:
+        """圧縮形式ごとに区別した強いETag"""
+        return f'{etag[:-1]}-{encoding}"' if encoding else etag
@@ -0,0 +1,60 @@
+"""/metrics の計測値"""
+
+import threading
+
+from ..domain.api_client import APIClient
+from ..domain.latency_histogram import LatencyHistogram
+from ..domain.stage_clock import StageClock
+
+
+class HTTPMetrics:
+    """/metrics の計測値（Prometheus テキスト形式）
+
+    ルート・ステータスごとのリクエスト数とルートごとのレイテンシに、
+    処理段階（StageClock）・HTTPクライアント（APIClient）・ワーカーの状態を加えて出力する。
+    """
+
+    _PREFIX: str = "aw_work_hours"
+
+    def __init__(self) -> None:
+        self._requests: dict[tuple[str, int], int] = {}
+        self._latency: dict[str, LatencyHistogram] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def record(self, route: str, status: int, seconds: float) -> None:
+        with self._lock:
+            key: tuple[str, int] = (route, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            self._latency.setdefault(route, LatencyHistogram()).observe(seconds)
+
+    def exposition(self, load: dict[str, int]) -> str:
+        p: str = self._PREFIX
+        lines: list[str] = [
+            f"# TYPE {p}_http_requests_total counter",
+            *self._request_lines(),
+            f"# TYPE {p}_http_request_seconds histogram",
+            *self._latency_lines(),
+            f"# TYPE {p}_stage_seconds histogram",
+            *StageClock.exposition(f"{p}_stage_seconds"),
+            f"# TYPE {p}_client gauge",
+            *(f'{p}_client{{stat="{k}"}} {v}' for k, v in APIClient.stats().items()),
+            f"# TYPE {p}_server gauge",
+            *(f'{p}_server{{stat="{k}"}} {v}' for k, v in load.items()),
+        ]
+        return "\n".join(lines) + "\n"
+
+    def _request_lines(self) -> list[str]:
+        with self._lock:
+            return [
+                f'{self._PREFIX}_http_requests_total{{route="{r}",status="{s}"}} {n}'
+                for (r, s), n in sorted(self._requests.items())
+            ]
+
+    def _latency_lines(self) -> list[str]:
+        name: str = f"{self._PREFIX}_http_request_seconds"
+        with self._lock:
+            return [
+                line
+                for route, h in sorted(self._latency.items())
+                for line in h.exposition(name, f'route="{route}"')
+            ]
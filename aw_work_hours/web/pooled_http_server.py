@@ -0,0 +1,93 @@
+"""ワーカー数上限付きHTTPサーバー"""
+
+import http.server
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PooledHTTPServer(http.server.HTTPServer):
+    """ワーカー数上限付きHTTPサーバー（待ち行列の深さを報告）
+
+    受け付けたリクエストをスレッドプールで処理するため、重い /data/ の集計中も
+    静的ファイル・/settings・/api/ が待たされない。
+    処理中と待ち行列の合計が workers + backlog に達したら、積まずに 503 を返す。
+    """
+
+    _REJECTED: bytes = (
+        b"HTTP/1.1 503 Service Unavailable\r\n"
+        b"Retry-After: 1\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+    )
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        handler: type[http.server.BaseHTTPRequestHandler],
+        workers: int,
+        backlog: int = 64,
+    ) -> None:
+        super().__init__(address, handler)
+        self._workers: int = workers
+        self._slots: threading.BoundedSemaphore = threading.BoundedSemaphore(
+            workers + backlog
+        )
+        # ワーカーを長く占有する要求（/live）の同時数。1つは /data などのために残す
+        self.stream_slots: threading.BoundedSemaphore = threading.BoundedSemaphore(
+            max(0, workers - 1)
+        )
+        self._pool: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="aw-work-hours-http"
+        )
+        self._lock: threading.Lock = threading.Lock()
+        self._queued: int = 0
+        self._active: int = 0
+        self._rejected: int = 0
+
+    def process_request(
+        self, request: socket.socket, client_address: tuple[str, int]
+    ) -> None:
+        if not self._slots.acquire(blocking=False):
+            self._reject(request)
+            return
+        with self._lock:
+            self._queued += 1
+        self._pool.submit(self._handle, request, client_address)
+
+    def _reject(self, request: socket.socket) -> None:
+        """待ち行列が満杯の接続には、ワーカーを使わずに 503 だけを返して閉じる"""
+        with self._lock:
+            self._rejected += 1
+        try:
+            request.sendall(self._REJECTED)
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def _handle(self, request: socket.socket, client_address: tuple[str, int]) -> None:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            with self._lock:
+                self._active -= 1
+            self._slots.release()
+
+    @property
+    def load(self) -> dict[str, int]:
+        """ワーカー上限・処理中・待ち行列・満杯で断った接続の件数"""
+        with self._lock:
+            return {
+                "workers": self._workers,
+                "active": self._active,
+                "queued": self._queued,
+                "rejected": self._rejected,
+            }
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
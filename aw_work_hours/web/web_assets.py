@@ -0,0 +1,36 @@
+"""web/ 配下の静的ファイル"""
+
+import mimetypes
+import urllib.parse
+from pathlib import Path
+
+from .content_encoding import ContentEncoding
+
+
+class WebAssets:
+    """web/ 配下の静的ファイル（起動時に一度だけ読み込み・圧縮）"""
+
+    def __init__(self, web_abspath: Path) -> None:
+        self._assets: dict[str, tuple[str, dict[str, bytes]]] = {}
+        for abspath in sorted(p for p in web_abspath.rglob("*") if p.is_file()):
+            relpath: str = abspath.relative_to(web_abspath).as_posix()
+            self._assets[f"/{relpath}"] = self._load(abspath)
+
+    def _load(self, abspath: Path) -> tuple[str, dict[str, bytes]]:
+        body: bytes = abspath.read_bytes()
+        content_type: str = (
+            mimetypes.guess_type(abspath.name)[0] or "application/octet-stream"
+        )
+        if content_type.startswith("text/") or content_type.endswith("javascript"):
+            content_type += "; charset=utf-8"
+        encoded: dict[str, bytes] = {"identity": body}
+        for encoding in ContentEncoding.available():
+            encoded[encoding] = ContentEncoding.compress(body, encoding)
+        return content_type, encoded
+
+    def find(self, url_path: str) -> tuple[str, dict[str, bytes]] | None:
+        """URLパスに対応する (Content-Type, 圧縮形式ごとの本文)"""
+        path: str = urllib.parse.unquote(urllib.parse.urlsplit(url_path).path)
+        if path.endswith("/"):
+            path += "index.html"
+        return self._assets.get(path)
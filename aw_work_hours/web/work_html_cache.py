@@ -0,0 +1,89 @@
+"""/data レスポンスのキャッシュ"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from ..domain.afk_bucket import AFKBucket
+from ..domain.month_period import MonthPeriod
+from ..domain.stage_clock import StageClock
+from ..domain.work_rule import WorkRule
+from .work_html_response import WorkHTMLResponse
+
+
+class WorkHTMLCache:
+    """/data レスポンスのLRUキャッシュ（月・バケット・最小イベント秒数ごと）
+
+    終了済みの月はキャッシュをそのまま返し、今月（と全期間）は保存から fresh_seconds 秒を
+    過ぎていれば計算し直す（デフォルトの0なら毎回。先読みが定期更新するときだけ延ばす）。
+    ETag は本文のハッシュなので、再計算しても内容が同じなら 304 を返せる。
+    設定を変えても前の設定のエントリは別のキーのまま残し（LRUで追い出す）、戻したときに再利用する。
+    圧縮した本文は送信時に作り、エントリの encoded（圧縮形式 → 本文）に入れて再利用する。
+    """
+
+    def __init__(self, capacity: int = 64, fresh_seconds: float = 0) -> None:
+        self._capacity: int = capacity
+        self.fresh_seconds: float = fresh_seconds
+        # 本文・ETag・保存した時刻（time.monotonic）・圧縮済みの本文
+        self._entries: OrderedDict[
+            tuple[str, str, int], tuple[bytes, str, float, dict[str, bytes]]
+        ] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, period: MonthPeriod) -> bool:
+        """現在の設定でのエントリがあるか（新しさは問わない）"""
+        key: tuple[str, str, int] = self._key(period)
+        with self._lock:
+            return key in self._entries
+
+    def entry(self, period: MonthPeriod) -> tuple[bytes, str, dict[str, bytes]]:
+        """レスポンス本文・強いETag・圧縮済みの本文（送信時に追加する）"""
+        key: tuple[str, str, int] = self._key(period)
+        with self._lock:
+            cached: tuple[bytes, str, float, dict[str, bytes]] | None = (
+                self._entries.get(key)
+            )
+            if cached and (
+                period.finished or time.monotonic() - cached[2] < self.fresh_seconds
+            ):
+                self._entries.move_to_end(key)
+                return cached[0], cached[1], cached[3]
+        return self.refresh(period)
+
+    def refresh(self, period: MonthPeriod) -> tuple[bytes, str, dict[str, bytes]]:
+        """キャッシュの有無に関わらず計算し直して保存する"""
+        key: tuple[str, str, int] = self._key(period)
+        response: dict = WorkHTMLResponse(period).json()
+        with StageClock.measure("html_serialize"):
+            body: bytes = json.dumps(response, ensure_ascii=False).encode("utf-8")
+        entry: tuple[bytes, str, dict[str, bytes]] = (
+            body,
+            f'"{hashlib.sha256(body).hexdigest()}"',
+            {},
+        )
+        self._store(key, entry)
+        return entry
+
+    @staticmethod
+    def _key(period: MonthPeriod) -> tuple[str, str, int]:
+        return (
+            "/".join(t or "" for t in period.iso),
+            AFKBucket.id(),
+            WorkRule.MIN_EVENT_SECONDS,
+        )
+
+    def _store(
+        self, key: tuple[str, str, int], entry: tuple[bytes, str, dict[str, bytes]]
+    ) -> None:
+        body, etag, encoded = entry
+        with self._lock:
+            self._entries[key] = (body, etag, time.monotonic(), encoded)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._capacity:
+                self._entries.popitem(last=False)
@@ -0,0 +1,86 @@
+"""/live のServer-Sent Events"""
+
+import json
+from datetime import date, datetime, timedelta
+
+from ..types import _TIMEZONE, AFKInterval
+from ..domain.afk_bucket import AFKBucket
+from ..domain.afk_events import AFKEvents
+from ..domain.holiday_calendar import HolidayCalendar
+from ..domain.live_work import LiveWork
+from ..domain.month_period import MonthPeriod
+from ..domain.work_calendar import WorkCalendar
+from ..domain.work_day import WorkDay
+from ..domain.work_rule import WorkRule
+from .work_html_row import WorkHTMLRow
+
+
+class WorkHTMLLive:
+    """/live のServer-Sent Events（開いている月の新着区間と日別集計の差分）
+
+    最初のメッセージは今日の行を区間ごと送り直し、/data 取得後に届いた分の取りこぼしを埋める。
+    以後は LiveWork が反映した区間（新規・延長）と、変わった勤務日の行の集計だけを送る。
+    """
+
+    def __init__(self, period: MonthPeriod) -> None:
+        calendar, daily_work, events = WorkCalendar.from_period(period)
+        self._holidays: HolidayCalendar = HolidayCalendar()
+        self._live: LiveWork = LiveWork(AFKBucket.id(), daily_work, events)
+        self._since: datetime = datetime.now(_TIMEZONE)
+        self._first: bytes = self._snapshot(calendar.work_days(daily_work), events)
+
+    @property
+    def snapshot(self) -> bytes:
+        """接続直後に送る今日の行（区間込み）"""
+        return self._first
+
+    def poll(self) -> bytes | None:
+        """新着イベントを反映したメッセージ（変化なしは None）"""
+        changed: dict[date, WorkDay] = self._live.poll(self._since)
+        applied: list[AFKInterval] = [
+            i for i in self._live.applied if i.duration >= WorkRule.MIN_EVENT_SECONDS
+        ]
+        if not changed and not applied:
+            return None
+        rows: list[dict] = []
+        for d in sorted(changed):
+            row: dict = WorkHTMLRow(d, changed, self._holidays).to_dict()
+            del row["events"]
+            rows.append(row)
+        events: list[dict] = []
+        for interval in applied:
+            for current, row_events in self._split(interval):
+                events += [{"date": current.isoformat(), **e} for e in row_events]
+        return self._message(rows, events)
+
+    def _snapshot(self, days: dict[date, WorkDay], events: AFKEvents) -> bytes:
+        now: datetime = datetime.now(_TIMEZONE)
+        dates: list[date] = sorted({WorkRule.work_date(now), now.date()})
+        rows: dict[date, WorkHTMLRow] = {
+            d: WorkHTMLRow(d, days, self._holidays) for d in dates
+        }
+        for interval in reversed(events.intervals):
+            if interval.end.date() < dates[0]:
+                break
+            if interval.duration >= WorkRule.MIN_EVENT_SECONDS:
+                for d in rows:
+                    rows[d].add_event(interval)
+        for row in rows.values():
+            row.events.sort(key=lambda e: (e["startH"], e["startM"], e["startS"]))
+        return self._message([r.to_dict() for r in rows.values()], [])
+
+    def _split(self, interval: AFKInterval) -> list[tuple[date, list]]:
+        """区間を重なる暦日ごとの HTML イベントに分ける"""
+        result: list[tuple[date, list]] = []
+        current: date = interval.start.date()
+        while current <= interval.end.date():
+            row: WorkHTMLRow = WorkHTMLRow(current, {}, self._holidays)
+            row.add_event(interval)
+            result.append((current, row.events))
+            current += timedelta(days=1)
+        return result
+
+    @staticmethod
+    def _message(rows: list[dict], events: list[dict]) -> bytes:
+        data: str = json.dumps({"rows": rows, "events": events}, ensure_ascii=False)
+        return f"event: update\ndata: {data}\n\n".encode("utf-8")
@@ -0,0 +1,108 @@
+"""/data の先読み"""
+
+import queue
+import sys
+import threading
+import time
+
+from ..types import APIConnectionError, CLIError
+from ..domain.month_period import MonthPeriod
+from .work_html_cache import WorkHTMLCache
+
+
+class WorkHTMLPrefetch:
+    """/data の先読み（表示した月の前後の月と、今月の定期更新を1本のスレッドで計算）
+
+    終了済みの月は WorkHTMLCache に1度入れば再計算されないため、先読みは月ごとに1回で済む。
+    今月は refresh_seconds ごとに計算し直し、キャッシュもその間は計算し直さずに返す
+    （今日の行は /live の最初のメッセージが最新にする）。
+    今月への /data・/live の要求が _IDLE_REFRESHES 回分の間隔で途絶えたら、定期更新をやめる。
+    """
+
+    _IDLE_REFRESHES: int = 3
+
+    def __init__(self, cache: WorkHTMLCache, refresh_seconds: float = 60) -> None:
+        self._cache: WorkHTMLCache = cache
+        self._refresh_seconds: float = refresh_seconds
+        # None はスレッドの停止
+        self._queue: queue.Queue[MonthPeriod | None] = queue.Queue()
+        self._pending: set[tuple[str | None, str | None]] = set()
+        self._current: MonthPeriod | None = None
+        self._seen: float = 0.0
+        self._lock: threading.Lock = threading.Lock()
+
+    def start(self) -> None:
+        self._cache.fresh_seconds = self._refresh_seconds
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self) -> None:
+        """スレッドを止め、今月を毎回計算し直す動作に戻す"""
+        self._queue.put(None)
+        self._cache.fresh_seconds = 0
+
+    def schedule(self, period: MonthPeriod) -> None:
+        """表示した月の前後を先読みに積む（終了していない月は定期更新の対象にする）"""
+        self.touch(period)
+        with self._lock:
+            for neighbor in period.neighbors():
+                if neighbor.iso not in self._pending:
+                    self._pending.add(neighbor.iso)
+                    self._queue.put(neighbor)
+
+    def touch(self, period: MonthPeriod) -> None:
+        """今月が表示されていることを記録する（/data・/live の要求ごと）"""
+        if period.finished or period.ranged or not period.iso[0]:
+            return
+        with self._lock:
+            self._current = period
+            self._seen = time.monotonic()
+
+    def _run(self) -> None:
+        deadline: float = time.monotonic() + self._refresh_seconds
+        while True:
+            try:
+                period: MonthPeriod | None = self._queue.get(
+                    timeout=max(0.0, deadline - time.monotonic())
+                )
+                if period is None:
+                    return
+                try:
+                    self._compute(period, refresh=False)
+                finally:
+                    # 失敗した月も、次に表示されたときに積み直せるようにする
+                    with self._lock:
+                        self._pending.discard(period.iso)
+            except queue.Empty:
+                pass
+            if time.monotonic() >= deadline:
+                # 先読みが続いても、今月の更新は refresh_seconds ごとに割り込ませる
+                current: MonthPeriod | None = self._viewed()
+                if current is not None:
+                    self._compute(current, refresh=True)
+                deadline = time.monotonic() + self._refresh_seconds
+
+    def _viewed(self) -> MonthPeriod | None:
+        """定期更新する今月（要求が途絶えた月・終了した月は対象から外す）"""
+        idle: float = self._refresh_seconds * self._IDLE_REFRESHES
+        with self._lock:
+            if self._current is not None and (
+                self._current.finished or time.monotonic() - self._seen > idle
+            ):
+                self._current = None
+            return self._current
+
+    def _compute(self, period: MonthPeriod, refresh: bool) -> None:
+        try:
+            if refresh:
+                self._cache.refresh(period)
+            else:
+                self._cache.entry(period)
+        except (APIConnectionError, CLIError):
+            # 先読みは失敗しても表示時に計算し直せばよいため、次の要求を待つ
+            pass
+        except Exception as e:
+            # 想定外の失敗（壊れた応答・履歴DBのロックなど）でもスレッドは止めない
+            start, end = period.iso
+            print(
+                f"警告: {start}〜{end} の先読みに失敗しました: {e!r}", file=sys.stderr
+            )
@@ -1,13 +1,14 @@
 """HTML APIレスポンス生成"""
 
-from datetime import datetime, timedelta
+from datetime import date, timedelta
 
-from ..types import _TIMEZONE, AWEvent
 from ..domain.afk_events import AFKEvents
 from ..domain.daily_work import DailyWork
 from ..domain.holiday_calendar import HolidayCalendar
 from ..domain.month_period import MonthPeriod
+from ..domain.stage_clock import StageClock
 from ..domain.work_calendar import WorkCalendar
+from ..domain.work_day import WorkDay
 from ..domain.work_rule import WorkRule
 from .work_html_row import WorkHTMLRow
 
@@ -15,35 +16,45 @@ from .work_html_row import WorkHTMLRow
 class WorkHTMLResponse:
     """HTML APIレスポンス生成"""
 
-    def __init__(self, period: MonthPeriod) -> None:
+    def __init__(
+        self,
+        period: MonthPeriod,
+        computed: tuple[WorkCalendar, DailyWork, AFKEvents] | None = None,
+    ) -> None:
+        """computed はドメイン計算済みの結果（省略時は json() が from_period で計算する）"""
         self._period: MonthPeriod = period
+        self._computed: tuple[WorkCalendar, DailyWork, AFKEvents] | None = computed
 
     def json(self) -> dict:
-        calendar, daily_work, events = WorkCalendar.from_period(self._period)
-        holidays: HolidayCalendar = HolidayCalendar()
-        rows: list[WorkHTMLRow] = self._create_rows(calendar, daily_work, holidays)
-        self._populate_events(rows, events)
-        return {"rows": [r.to_dict() for r in rows]}
+        calendar, daily_work, events = self._computed or WorkCalendar.from_period(
+            self._period
+        )
+        with StageClock.measure("html_json"):
+            holidays: HolidayCalendar = HolidayCalendar()
+            days: dict[date, WorkDay] = calendar.work_days(daily_work)
+            rows: list[WorkHTMLRow] = self._create_rows(days, holidays)
+            self._populate_events(rows, events)
+            return {"rows": [r.to_dict() for r in rows]}
 
     def _create_rows(
-        self, calendar: WorkCalendar, daily_work: DailyWork, holidays: HolidayCalendar
+        self, days: dict[date, WorkDay], holidays: HolidayCalendar
     ) -> list[WorkHTMLRow]:
-        return [
-            WorkHTMLRow(d, calendar, daily_work, holidays)
-            for d in self._period.date_range()
-        ]
+        dates: list[date] = self._period.date_range()
+        if not dates and days:
+            first: date = min(days)
+            dates = [
+                first + timedelta(days=i) for i in range((max(days) - first).days + 1)
+            ]
+        return [WorkHTMLRow(d, days, holidays) for d in dates]
 
     def _populate_events(self, rows: list[WorkHTMLRow], events: AFKEvents) -> None:
-        not_afk: list[AWEvent] = [
-            e
-            for e in events.raw
-            if e["data"]["status"] == "not-afk"
-            and e["duration"] >= WorkRule.MIN_EVENT_SECONDS
-        ]
-        for ev in not_afk:
-            start: datetime = datetime.fromisoformat(ev["timestamp"]).astimezone(
-                _TIMEZONE
-            )
-            end: datetime = start + timedelta(seconds=ev["duration"])
-            for row in rows:
-                row.add_event(start, end, ev)
+        """各区間を重なる暦日（通常1〜2日）の行にだけ振り分ける"""
+        rows_by_date: dict[date, WorkHTMLRow] = {row.day: row for row in rows}
+        for interval in events.intervals:
+            if interval.duration < WorkRule.MIN_EVENT_SECONDS:
+                continue
+            current: date = interval.start.date()
+            while current <= interval.end.date():
+                if current in rows_by_date:
+                    rows_by_date[current].add_event(interval)
+                current += timedelta(days=1)
@@ -1,11 +1,10 @@
 """HTML用の日別行データ"""
 
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta
 
-from ..types import _WEEKDAYS, _TIMEZONE, AWEvent, HTMLEvent
-from ..domain.daily_work import DailyWork
+from ..types import _WEEKDAYS, _TIMEZONE, AFKInterval, HTMLEvent
 from ..domain.holiday_calendar import HolidayCalendar
-from ..domain.work_calendar import WorkCalendar
+from ..domain.work_day import WorkDay
 from ..domain.work_rule import WorkRule
 
 
@@ -15,38 +14,32 @@ class WorkHTMLRow:
     def __init__(
         self,
         d: date,
-        calendar: WorkCalendar,
-        daily_work: DailyWork,
+        days: dict[date, WorkDay],
         holidays: HolidayCalendar,
     ) -> None:
-        self._date: date = d
-        self._calendar: WorkCalendar = calendar
-        self._daily_work: DailyWork = daily_work
+        self._day: date = d
+        self._days: dict[date, WorkDay] = days
         self._holidays: HolidayCalendar = holidays
         self._events: list[HTMLEvent] = []
 
-    def add_event(self, start: datetime, end: datetime, event: AWEvent) -> None:
-        current: date = start.date()
-        while current <= end.date():
-            if current == self._date:
-                day_start: datetime = max(
-                    start,
-                    datetime.combine(current, datetime.min.time()).replace(
-                        tzinfo=_TIMEZONE
-                    ),
-                )
-                day_end_limit: datetime = datetime.combine(
-                    current + timedelta(days=1), datetime.min.time()
-                ).replace(tzinfo=_TIMEZONE)
-                day_end: datetime = min(end, day_end_limit)
-                if day_end > day_start:
-                    self._events.append(
-                        self._event_dict(day_start, day_end, current, event)
-                    )
-            current += timedelta(days=1)
+    @property
+    def day(self) -> date:
+        return self._day
+
+    @property
+    def events(self) -> list[HTMLEvent]:
+        return self._events
+
+    def add_event(self, interval: AFKInterval) -> None:
+        """区間のうちこの行の日付（0:00-24:00）に重なる部分を追加"""
+        midnight: datetime = datetime.combine(self._day, time.min, tzinfo=_TIMEZONE)
+        start: datetime = max(interval.start, midnight)
+        end: datetime = min(interval.end, midnight + timedelta(days=1))
+        if end > start:
+            self._events.append(self._event_dict(start, end, self._day, interval))
 
     def _event_dict(
-        self, start: datetime, end: datetime, current: date, event: AWEvent
+        self, start: datetime, end: datetime, current: date, interval: AFKInterval
     ) -> HTMLEvent:
         return {
             "startH": start.hour,
@@ -56,12 +49,12 @@ class WorkHTMLRow:
             "endM": end.minute if end.date() == current else 0,
             "endS": end.second if end.date() == current else 0,
             "duration": (end - start).total_seconds(),
-            "data": event["data"],
+            "data": interval.data,
         }
 
     def to_dict(self) -> dict:
-        d: date = self._date
-        has_work: bool = d in self._calendar.daily
+        d: date = self._day
+        has_work: bool = d in self._days
         is_holiday: bool = has_work and self._holidays.is_holiday(d)
         row: dict = {
             "date": d.isoformat(),
@@ -75,15 +68,12 @@ class WorkHTMLRow:
         return row
 
     def _add_work_fields(self, row: dict, d: date) -> None:
-        s, e = self._calendar.daily[d]
-        span: float = WorkRule.span_hours(s, e)
-        row["startH"] = WorkRule.adjusted_hour(s, d)
-        row["startM"] = s.minute
-        row["endH"] = WorkRule.adjusted_hour(e, d)
-        row["endM"] = e.minute
-        row["span"] = round(span, 1)
-        active_h: float = self._daily_work.active.get(d, 0) / 3600
-        afk: float = span - active_h
-        if afk >= 0.05:
-            row["afk"] = round(afk, 1)
-            row["maxGap"] = round(self._daily_work.gaps.get(d, 0) / 3600, 1)
+        day: WorkDay = self._days[d]
+        row["startH"] = WorkRule.adjusted_hour(day.start, d)
+        row["startM"] = day.start.minute
+        row["endH"] = WorkRule.adjusted_hour(day.end, d)
+        row["endM"] = day.end.minute
+        row["span"] = round(day.span, 1)
+        if day.afk >= 0.05:
+            row["afk"] = round(day.afk, 1)
+            row["maxGap"] = round(day.max_gap, 1)
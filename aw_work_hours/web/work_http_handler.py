@@ -1,15 +1,30 @@
 """HTTPリクエストハンドラ"""
 
+import cProfile
 import http.server
+import io
 import json
+import pstats
+import threading
+import time
+import urllib.parse
+from collections.abc import Iterator
 from typing import Any
-import urllib.error
-import urllib.request
 
+from ..types import APIConnectionError, CLIError
 from ..settings import Settings
 from ..domain.afk_bucket import AFKBucket
+from ..domain.api_client import APIClient
 from ..domain.month_period import MonthPeriod
+from ..domain.work_calendar import WorkCalendar
 from ..domain.work_rule import WorkRule
+from .api_proxy_cache import APIProxyCache
+from .content_encoding import ContentEncoding
+from .http_metrics import HTTPMetrics
+from .web_assets import WebAssets
+from .work_html_cache import WorkHTMLCache
+from .work_html_live import WorkHTMLLive
+from .work_html_prefetch import WorkHTMLPrefetch
 from .work_html_response import WorkHTMLResponse
 
 
@@ -17,6 +32,34 @@ class WorkHTTPHandler(http.server.SimpleHTTPRequestHandler):
     """HTTPリクエストハンドラ"""
 
     directory: str = ""
+    data_cache: WorkHTMLCache = WorkHTMLCache()
+    # WorkHTTPServer が起動時に設定する（未設定なら先読みしない）
+    prefetch: WorkHTMLPrefetch | None = None
+    api_cache: APIProxyCache = APIProxyCache()
+    metrics: HTTPMetrics = HTTPMetrics()
+    assets: WebAssets | None = None
+    _cache_control: str = "no-store, must-revalidate"
+    # 終了済みの月の /data（設定はクエリに含めるので、設定が変わればURLも変わる）
+    _FINISHED_CACHE_CONTROL: str = "max-age=31536000, immutable"
+    _status_code: int = 0
+    # /metrics のルート名（前方一致・先に一致したもの、該当なしは static）
+    _ROUTES: tuple[str, ...] = (
+        "/data/",
+        "/live/",
+        "/profile/",
+        "/api/",
+        "/settings/buckets",
+        "/settings",
+        "/status",
+        "/metrics",
+    )
+    # cProfile は同時に1つしか有効にできない
+    _profile_lock: threading.Lock = threading.Lock()
+    # /live はワーカーを占有し続けるため、同時接続数（server.stream_slots）と1接続の長さを制限する
+    # （200 のストリームが閉じた後は、EventSource が live_retry ミリ秒後に自動で再接続する）
+    live_interval: float = 5
+    live_seconds: float = 600
+    live_retry: int = 5000
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, directory=self.directory, **kwargs)
@@ -24,21 +67,52 @@ class WorkHTTPHandler(http.server.SimpleHTTPRequestHandler):
     def log_message(self, format: str, *args) -> None:
         pass
 
+    def handle_one_request(self) -> None:
+        """1リクエストのルート・ステータス・所要時間を記録する"""
+        started: float = time.perf_counter()
+        self._status_code = 0
+        super().handle_one_request()
+        if self._status_code:
+            # 要求行が壊れていると、400 を返した時点で path はまだ設定されていない
+            path: str | None = getattr(self, "path", None)
+            route: str = (
+                "invalid"
+                if path is None
+                else next(
+                    (r.rstrip("/") for r in self._ROUTES if path.startswith(r)),
+                    "static",
+                )
+            )
+            elapsed: float = time.perf_counter() - started
+            self.metrics.record(route, self._status_code, elapsed)
+
+    def send_response(self, code: int, message: str | None = None) -> None:
+        self._status_code = code
+        super().send_response(code, message)
+
     def end_headers(self) -> None:
-        self.send_header("Cache-Control", "no-store, must-revalidate")
+        self.send_header("Cache-Control", self._cache_control)
         super().end_headers()
 
     def do_GET(self) -> None:
         if self.path.startswith("/data/"):
             self._handle_data()
+        elif self.path.startswith("/live/"):
+            self._handle_live()
         elif self.path == "/settings":
             self._handle_get_settings()
         elif self.path == "/settings/buckets":
             self._handle_get_buckets()
+        elif self.path == "/status":
+            self._handle_status()
+        elif self.path == "/metrics":
+            self._handle_metrics()
+        elif self.path.startswith("/profile/data/"):
+            self._handle_profile()
         elif self.path.startswith("/api/"):
             self._proxy_api()
         else:
-            super().do_GET()
+            self._handle_static()
 
     def do_POST(self) -> None:
         if self.path == "/settings":
@@ -72,6 +146,31 @@ class WorkHTTPHandler(http.server.SimpleHTTPRequestHandler):
         except Exception as e:
             self.send_error(500, f"Error: {e}")
 
+    def _handle_status(self) -> None:
+        status: dict[str, object] = {
+            **getattr(self.server, "load", {}),
+            "client": APIClient.stats(),
+        }
+        self._send_json(json.dumps(status).encode("utf-8"))
+
+    def _handle_metrics(self) -> None:
+        body: bytes = self.metrics.exposition(getattr(self.server, "load", {})).encode()
+        self._send_body(body, "text/plain; version=0.0.4; charset=utf-8")
+
+    def _handle_profile(self) -> None:
+        """/profile/data/<月>: キャッシュを使わずに1回分の /data を cProfile で計測"""
+        try:
+            period: MonthPeriod = MonthPeriod.parse(self.path.split("/")[-1])
+            profile: cProfile.Profile = cProfile.Profile()
+            with self._profile_lock:
+                profile.runcall(lambda: json.dumps(WorkHTMLResponse(period).json()))
+            out: io.StringIO = io.StringIO()
+            pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(40)
+        except Exception as e:
+            self.send_error(500, f"Error: {e}")
+            return
+        self._send_body(out.getvalue().encode("utf-8"), "text/plain; charset=utf-8")
+
     def _handle_post_settings(self) -> None:
         try:
             length: int = int(self.headers.get("Content-Length", 0))
@@ -122,28 +221,197 @@ class WorkHTTPHandler(http.server.SimpleHTTPRequestHandler):
 
     def _handle_data(self) -> None:
         try:
-            month_str: str = self.path.split("/")[-1]
+            month_str: str = urllib.parse.urlsplit(self.path).path.split("/")[-1]
             period: MonthPeriod = MonthPeriod.parse(month_str)
-            response: WorkHTMLResponse = WorkHTMLResponse(period)
-            body: bytes = json.dumps(response.json(), ensure_ascii=False).encode(
-                "utf-8"
-            )
-            self._send_json(body)
+            body, etag, encoded = self.data_cache.entry(period)
         except Exception as e:
             self.send_error(500, f"Error: {e}")
+            return
+        # 終了済みの月はブラウザに保持させ、今月・全期間は毎回ETagで再検証させる
+        self._cache_control = (
+            self._FINISHED_CACHE_CONTROL if period.finished else "no-cache"
+        )
+        self._send_json(body, etag, encoded)
+        if self.prefetch:
+            self.prefetch.schedule(period)
+
+    def _handle_live(self) -> None:
+        """/live/<月>: 終了していない月の差分を Server-Sent Events で送り続ける"""
+        try:
+            period: MonthPeriod | None = self._live_period()
+        except Exception:
+            self._send_retry()
+            return
+        if period is None:
+            # 204 を受けた EventSource は再接続しない
+            self.send_response(204)
+            self.end_headers()
+            return
+        # 枠が空いているときだけ月全体の集計（WorkHTMLLive の生成）を行う
+        if not self.server.stream_slots.acquire(blocking=False):
+            self._send_retry()
+            return
+        try:
+            live: WorkHTMLLive = WorkHTMLLive(period)
+        except Exception:
+            self.server.stream_slots.release()
+            self._send_retry()
+            return
+        try:
+            self._stream_live(live, period)
+        finally:
+            self.server.stream_slots.release()
+
+    def _live_period(self) -> MonthPeriod | None:
+        """差分を送る月（無効・終了済みの月、ファイル入力、複数バケットは None）"""
+        try:
+            period: MonthPeriod = MonthPeriod.parse(self.path.split("/")[-1])
+        except CLIError:
+            return None
+        if period.finished or WorkCalendar.source() or len(AFKBucket.ids()) != 1:
+            return None
+        return period
 
-    def _send_json(self, body: bytes) -> None:
+    def _send_retry(self) -> None:
+        """retry だけを送って閉じる（503 や 500 と違い、EventSource は再接続する）"""
+        self._start_stream()
+        self.wfile.write(f"retry: {self.live_retry}\n\n".encode())
+
+    def _start_stream(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.close_connection = True
+        self.end_headers()
+
+    def _stream_live(self, live: WorkHTMLLive, period: MonthPeriod) -> None:
+        self._start_stream()
+        deadline: float = time.monotonic() + self.live_seconds
+        message: bytes | None = f"retry: {self.live_retry}\n\n".encode() + live.snapshot
+        try:
+            while True:
+                # 変化がなくてもコメント行を送り、切断されたクライアントを検出する
+                self.wfile.write(message or b": ping\n\n")
+                self.wfile.flush()
+                if self.prefetch:
+                    # 接続している間は今月が表示されているので、定期更新を続けさせる
+                    self.prefetch.touch(period)
+                if time.monotonic() >= deadline:
+                    return
+                time.sleep(self.live_interval)
+                try:
+                    message = live.poll()
+                except APIConnectionError:
+                    message = None
+        except OSError:
+            return
+
+    def _handle_static(self) -> None:
+        asset: tuple[str, dict[str, bytes]] | None = (
+            self.assets.find(self.path) if self.assets else None
+        )
+        if asset is None:
+            super().do_GET()
+            return
+        content_type, encoded = asset
+        self._send_body(encoded["identity"], content_type, None, encoded)
+
+    def _send_json(
+        self,
+        body: bytes,
+        etag: str | None = None,
+        encoded: dict[str, bytes] | None = None,
+    ) -> None:
+        self._send_body(body, "application/json; charset=utf-8", etag, encoded)
+
+    def _send_body(
+        self,
+        body: bytes,
+        content_type: str,
+        etag: str | None = None,
+        encoded: dict[str, bytes] | None = None,
+    ) -> None:
+        encoding: str | None = ContentEncoding.negotiate(
+            self.headers.get("Accept-Encoding"), len(body)
+        )
+        if etag:
+            etag = ContentEncoding.etag(etag, encoding)
+            if self.headers.get("If-None-Match") == etag:
+                self._send_not_modified(etag)
+                return
+        if encoding:
+            body = self._encoded(body, encoding, encoded)
         self.send_response(200)
-        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Type", content_type)
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if etag:
+            self.send_header("ETag", etag)
         self.send_header("Content-Length", str(len(body)))
         self.end_headers()
         self.wfile.write(body)
 
+    @staticmethod
+    def _encoded(body: bytes, encoding: str, encoded: dict[str, bytes] | None) -> bytes:
+        """圧縮済みの本文（キャッシュのエントリの encoded にあれば再利用し、無ければ作って入れる）"""
+        if encoded is None:
+            return ContentEncoding.compress(body, encoding)
+        if encoding not in encoded:
+            encoded[encoding] = ContentEncoding.compress(body, encoding)
+        return encoded[encoding]
+
+    def _send_not_modified(self, etag: str) -> None:
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+
     def _proxy_api(self) -> None:
-        url: str = f"http://127.0.0.1:5600{self.path}"
+        cached: tuple[str, bytes, str, dict[str, bytes]] | None = self.api_cache.entry(
+            self.path
+        )
+        if cached:
+            content_type, body, etag, encoded = cached
+            self._send_body(body, content_type, etag, encoded)
+            return
         try:
-            with urllib.request.urlopen(url, timeout=30) as resp:
-                body: bytes = resp.read()
-                self._send_json(body)
+            status, headers, chunks = APIClient.exchange(
+                f"http://127.0.0.1:5600{self.path}", timeout=30
+            )
         except Exception as e:
             self.send_error(502, f"API Error: {e}")
+            return
+        content_type: str = headers.get("Content-Type", "application/json")
+        if status == 200 and self.api_cache.cacheable(self.path):
+            # 終了済み期間は内容が変わらないため、一度だけ読み切って保存する
+            body: bytes = b"".join(chunks)
+            self._send_body(
+                body, content_type, self.api_cache.store(self.path, content_type, body)
+            )
+            return
+        self._stream(status, content_type, headers.get("Content-Length"), chunks)
+
+    def _stream(
+        self,
+        status: int,
+        content_type: str,
+        length: str | None,
+        chunks: Iterator[bytes],
+    ) -> None:
+        """上流の本文を溜めずに転送する（圧縮時は長さ不明のため接続を閉じて終端を示す）"""
+        encoding: str | None = ContentEncoding.negotiate(
+            self.headers.get("Accept-Encoding"),
+            int(length or ContentEncoding.MIN_BYTES),
+        )
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+            chunks = ContentEncoding.stream(chunks, encoding)
+        elif length:
+            self.send_header("Content-Length", length)
+        self.close_connection = encoding is not None or length is None
+        self.end_headers()
+        for chunk in chunks:
+            self.wfile.write(chunk)
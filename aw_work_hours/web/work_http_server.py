@@ -1,12 +1,14 @@
 """HTTPサーバー"""
 
-import http.server
 import socket
 import sys
 import threading
 import webbrowser
 
 from .. import PROJECT_DIR
+from .pooled_http_server import PooledHTTPServer
+from .web_assets import WebAssets
+from .work_html_prefetch import WorkHTMLPrefetch
 from .work_http_handler import WorkHTTPHandler
 
 
@@ -15,8 +17,9 @@ class WorkHTTPServer:
 
     _WEB_DIR: str = str(PROJECT_DIR / "web")
 
-    def __init__(self, port: int = 8600) -> None:
+    def __init__(self, port: int = 8600, workers: int = 8) -> None:
         self._port: int = port
+        self._workers: int = workers
 
     def start(self, init_month: str | None, quiet: bool) -> None:
         if not self._is_port_in_use():
@@ -31,15 +34,21 @@ class WorkHTTPServer:
 
     def _start_server(self, quiet: bool) -> None:
         WorkHTTPHandler.directory = self._WEB_DIR
+        WorkHTTPHandler.assets = WebAssets(PROJECT_DIR / "web")
+        WorkHTTPHandler.prefetch = WorkHTMLPrefetch(WorkHTTPHandler.data_cache)
+        WorkHTTPHandler.prefetch.start()
 
         def serve() -> None:
-            with http.server.HTTPServer(
-                ("127.0.0.1", self._port), WorkHTTPHandler
+            with PooledHTTPServer(
+                ("127.0.0.1", self._port), WorkHTTPHandler, self._workers
             ) as httpd:
                 httpd.serve_forever()
 
         threading.Thread(target=serve, daemon=True).start()
-        self._status(f"サーバー起動: http://localhost:{self._port}/", quiet)
+        self._status(
+            f"サーバー起動: http://localhost:{self._port}/ (workers: {self._workers})",
+            quiet,
+        )
 
     def _open_browser(self, init_month: str | None, quiet: bool) -> None:
         import time
@@ -0,0 +1 @@
+"""合成イベントによる処理段階ごとのベンチマーク"""
@@ -0,0 +1,76 @@
+"""ベンチマーク実行（python -m benchmarks.benchmark_main）"""
+
+import argparse
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from aw_work_hours import PROJECT_DIR
+from aw_work_hours.domain.month_period import MonthPeriod
+from aw_work_hours.types import _TIMEZONE
+
+from .benchmark_report import BenchmarkReport
+from .stage_timings import StageTimings
+from .synthetic_events import SyntheticEvents
+
+
+class BenchmarkMain:
+    """ベンチマーク実行（シナリオごとに合成イベントを生成して段階別に計測）"""
+
+    # シナリオ名 → 開始日・日数・バケット数
+    _SCENARIOS: dict[str, tuple[date, int, int]] = {
+        "month": (date(2025, 6, 1), 30, 1),
+        "year": (date(2025, 1, 1), 365, 1),
+        "year_3_buckets": (date(2025, 1, 1), 365, 3),
+        "five_years": (date(2021, 1, 1), 1826, 1),
+    }
+    _DIR: Path = PROJECT_DIR / "benchmarks"
+
+    def __init__(self) -> None:
+        self._args: argparse.Namespace = self._parse()
+
+    def _parse(self) -> argparse.Namespace:
+        p: argparse.ArgumentParser = argparse.ArgumentParser(
+            description="合成AFKイベントで処理段階ごとの所要時間を計測"
+        )
+        p.add_argument("--scenario", "-s", action="append", choices=self._SCENARIOS)
+        p.add_argument("--repeat", "-r", type=int, default=3, help="各段階の実行回数")
+        p.add_argument("--output", "-o", type=Path, default=self._DIR / "results.json")
+        p.add_argument("--thresholds", type=Path, default=self._DIR / "thresholds.json")
+        p.add_argument(
+            "--update-thresholds",
+            action="store_true",
+            help="今回の計測値から閾値ファイルを作り直す",
+        )
+        return p.parse_args()
+
+    def run(self) -> None:
+        results: dict[str, dict[str, object]] = {
+            name: self._scenario(name)
+            for name in self._args.scenario or self._SCENARIOS
+        }
+        report: BenchmarkReport = BenchmarkReport(results)
+        report.write(self._args.output)
+        if self._args.update_thresholds:
+            report.update_thresholds(self._args.thresholds)
+            return
+        regressions: list[str] = report.regressions(self._args.thresholds)
+        for line in regressions:
+            print(f"劣化: {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+    def _scenario(self, name: str) -> dict[str, object]:
+        start, days, buckets = self._SCENARIOS[name]
+        synthetic: SyntheticEvents = SyntheticEvents(start, days, buckets)
+        first: datetime = datetime.combine(start, datetime.min.time(), _TIMEZONE)
+        period: MonthPeriod = MonthPeriod(first, first + timedelta(days=days))
+        timings: StageTimings = StageTimings(synthetic, period, self._args.repeat)
+        stages: dict[str, float] = timings.run()
+        events: int = sum(len(e) for e in synthetic.events.values())
+        print(f"{name}: {events} events, {sum(stages.values()):.3f}s", file=sys.stderr)
+        return {"days": days, "buckets": buckets, "events": events, "stages": stages}
+
+
+if __name__ == "__main__":
+    BenchmarkMain().run()
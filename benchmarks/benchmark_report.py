@@ -0,0 +1,55 @@
+"""ベンチマーク結果と閾値"""
+
+import json
+import platform
+from datetime import datetime
+from pathlib import Path
+
+from aw_work_hours.types import _TIMEZONE
+
+
+class BenchmarkReport:
+    """ベンチマーク結果（JSON）と、シナリオ・段階ごとの秒数の閾値による劣化判定"""
+
+    # --update-thresholds で閾値を現在の計測値の何倍にするか（マシン差・揺らぎの吸収）
+    _MARGIN: float = 3.0
+
+    def __init__(self, results: dict[str, dict[str, object]]) -> None:
+        self._results: dict[str, dict[str, object]] = results
+
+    def write(self, result_abspath: Path) -> None:
+        report: dict[str, object] = {
+            "created": datetime.now(_TIMEZONE).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "scenarios": self._results,
+        }
+        with open(result_abspath, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+
+    def regressions(self, threshold_abspath: Path) -> list[str]:
+        """閾値を超えた段階（閾値のないシナリオ・段階は判定しない）"""
+        with open(threshold_abspath, encoding="utf-8") as f:
+            thresholds: dict[str, dict[str, float]] = json.load(f)
+        result: list[str] = []
+        for scenario, limits in thresholds.items():
+            stages: dict = self._results.get(scenario, {}).get("stages", {})
+            for stage, limit in limits.items():
+                if stage in stages and stages[stage] > limit:
+                    result.append(
+                        f"{scenario}/{stage}: {stages[stage]:.4f}s > {limit}s"
+                    )
+        return result
+
+    def update_thresholds(self, threshold_abspath: Path) -> None:
+        thresholds: dict[str, dict[str, float]] = {
+            scenario: {
+                stage: round(max(seconds * self._MARGIN, 0.001), 4)
+                for stage, seconds in entry["stages"].items()
+            }
+            for scenario, entry in self._results.items()
+        }
+        with open(threshold_abspath, "w", encoding="utf-8") as f:
+            json.dump(thresholds, f, indent=2)
+            f.write("\n")
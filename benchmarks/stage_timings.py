@@ -0,0 +1,106 @@
+"""処理段階ごとの所要時間"""
+
+import json
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from aw_work_hours.domain.afk_event_stream import AFKEventStream
+from aw_work_hours.domain.afk_events import AFKEvents
+from aw_work_hours.domain.daily_work import DailyWork
+from aw_work_hours.domain.event_snapshot import EventSnapshot
+from aw_work_hours.domain.holiday_calendar import HolidayCalendar
+from aw_work_hours.domain.month_period import MonthPeriod
+from aw_work_hours.domain.work_calendar import WorkCalendar
+from aw_work_hours.output.work_csv import WorkCSV
+from aw_work_hours.output.work_text import WorkText
+from aw_work_hours.web.work_html_response import WorkHTMLResponse
+
+from .synthetic_events import SyntheticEvents
+
+
+class StageTimings:
+    """処理段階ごとの所要時間（各段階を repeat 回実行した最短秒数）
+
+    各段階は前の段階の結果を入力にするため、段階の間の受け渡しは計測に含まない。
+    レスポンス本文のJSON化（サーバー側の処理）も計測外で、受信後のデコードから測る。
+    """
+
+    _CHUNK_BYTES: int = 64 * 1024
+
+    def __init__(
+        self, synthetic: SyntheticEvents, period: MonthPeriod, repeat: int = 3
+    ) -> None:
+        self._period: MonthPeriod = period
+        self._repeat: int = repeat
+        self._bodies: list[bytes] = [
+            json.dumps(events).encode() for events in synthetic.events.values()
+        ]
+        self._outputs: dict[str, object] = {}
+        self._snapshot_path: Path = (
+            Path(tempfile.gettempdir()) / f"aw-work-hours-bench-{os.getpid()}.snap"
+        )
+
+    def run(self) -> dict[str, float]:
+        """段階名 → 秒数"""
+        try:
+            return {name: self._best(name, stage) for name, stage in self._stages()}
+        finally:
+            self._snapshot_path.unlink(missing_ok=True)
+
+    def _stages(self) -> list[tuple[str, Callable[[], object]]]:
+        out: dict = self._outputs
+        return [
+            (
+                "fetch_decode",
+                lambda: [e for b in self._bodies for e in self._decode(b)],
+            ),
+            ("intervals", lambda: AFKEvents(out["fetch_decode"]).intervals),
+            ("daily_work", lambda: DailyWork(out["intervals"])),
+            ("calendar", lambda: WorkCalendar.from_blocks(out["daily_work"].blocks)),
+            ("work_days", lambda: out["calendar"].work_days(out["daily_work"])),
+            ("html_json", self._html_json),
+            (
+                "text",
+                lambda: WorkText(
+                    out["work_days"], self._period, HolidayCalendar()
+                ).content(),
+            ),
+            ("csv", lambda: WorkCSV(out["work_days"], self._period).content()),
+            (
+                "snapshot_write",
+                lambda: EventSnapshot.write(
+                    self._snapshot_path, "bench", out["intervals"]
+                ),
+            ),
+            (
+                "snapshot_read",
+                lambda: EventSnapshot(self._snapshot_path)
+                .events(*self._period.iso)
+                .intervals,
+            ),
+        ]
+
+    def _best(self, name: str, stage: Callable[[], object]) -> float:
+        best: float = float("inf")
+        for _ in range(self._repeat):
+            started: float = time.perf_counter()
+            self._outputs[name] = stage()
+            best = min(best, time.perf_counter() - started)
+        return round(best, 6)
+
+    def _decode(self, body: bytes) -> AFKEventStream:
+        size: int = self._CHUNK_BYTES
+        return AFKEventStream(body[i : i + size] for i in range(0, len(body), size))
+
+    def _html_json(self) -> dict:
+        """ドメイン計算は前段までの結果を使い、HTML向けの整形だけを測る"""
+        events: AFKEvents = AFKEvents.from_intervals(self._outputs["intervals"])
+        computed: tuple[WorkCalendar, DailyWork, AFKEvents] = (
+            self._outputs["calendar"],
+            self._outputs["daily_work"],
+            events,
+        )
+        return WorkHTMLResponse(self._period, computed).json()
@@ -0,0 +1,62 @@
+"""ベンチマーク用の合成勤務日"""
+
+import random
+from datetime import date, datetime, timedelta
+
+from aw_work_hours.types import _TIMEZONE
+
+
+class SyntheticDay:
+    """1日分の合成 not-afk 区間（日付とシードだけで決まる）
+
+    平日は9時前後から18〜19時頃まで、平均12分（30秒〜1時間半）の作業と短い離席・昼休みを繰り返す。
+    日境界の検証用に、5:00前後に始まる日・24時を越えて深夜まで続く日・
+    3時間超の中抜けがある日を混ぜる。休日はたまにしか働かない。
+    """
+
+    def __init__(self, d: date, seed: int) -> None:
+        self._date: date = d
+        self._rng: random.Random = random.Random(seed * 100_003 + d.toordinal())
+
+    @property
+    def rng(self) -> random.Random:
+        return self._rng
+
+    @property
+    def segments(self) -> list[tuple[datetime, datetime]]:
+        if self._rng.random() > (0.92 if self._date.weekday() < 5 else 0.12):
+            return []
+        t, end = self._span()
+        lunch: bool = False
+        result: list[tuple[datetime, datetime]] = []
+        while t < end:
+            work: timedelta = timedelta(
+                minutes=min(max(self._rng.expovariate(1 / 12), 0.5), 90)
+            )
+            result.append((t, min(t + work, end)))
+            t += work
+            if not lunch and t.hour >= 12:
+                lunch, t = True, t + timedelta(minutes=self._rng.uniform(40, 70))
+            else:
+                t += self._break()
+        return result
+
+    def _span(self) -> tuple[datetime, datetime]:
+        """始業・終業（5%は5:00前後に始業、10%は翌0:00〜3:30まで）"""
+        kind: float = self._rng.random()
+        start: float = (
+            self._rng.uniform(4.6, 5.4) if kind < 0.05 else self._rng.uniform(8.3, 10)
+        )
+        end: float = (
+            self._rng.uniform(24, 27.5) if kind > 0.9 else self._rng.uniform(17.5, 19.5)
+        )
+        midnight: datetime = datetime.combine(
+            self._date, datetime.min.time(), _TIMEZONE
+        )
+        return midnight + timedelta(hours=start), midnight + timedelta(hours=end)
+
+    def _break(self) -> timedelta:
+        """作業間の離席（1%は3時間超の中抜け）"""
+        if self._rng.random() < 0.01:
+            return timedelta(hours=self._rng.uniform(3.2, 5))
+        return timedelta(minutes=min(max(self._rng.expovariate(1 / 4), 0.3), 20))
@@ -0,0 +1,79 @@
+"""ベンチマーク用の合成AFKイベント"""
+
+from datetime import date, datetime, timedelta, timezone
+
+from aw_work_hours.types import AWEvent
+
+from .synthetic_day import SyntheticDay
+
+
+class SyntheticEvents:
+    """ベンチマーク用の合成AFKイベント（シード固定で毎回同じ内容）
+
+    複数バケット（PC）の場合は日ごとに使うPCを切り替え、10%の日は2台を併用する。
+    not-afk 区間の間は afk イベントで埋め、ActivityWatch と同じく連続したイベント列にする。
+    """
+
+    _AFK_SPLIT: timedelta = timedelta(minutes=30)
+
+    def __init__(self, start: date, days: int, buckets: int = 1, seed: int = 0) -> None:
+        self._start: date = start
+        self._days: int = days
+        self._bucket_ids: list[str] = [
+            f"aw-watcher-afk_BENCH-{i}" for i in range(buckets)
+        ]
+        self._seed: int = seed
+        self._events: dict[str, list[AWEvent]] = self._generate()
+
+    @property
+    def events(self) -> dict[str, list[AWEvent]]:
+        """バケットID → イベント一覧（APIと同じく新しい順）"""
+        return self._events
+
+    @property
+    def buckets(self) -> dict[str, dict[str, str]]:
+        """GET /buckets 相当のレスポンス"""
+        created: datetime = datetime.combine(
+            self._start - timedelta(days=1), datetime.min.time(), timezone.utc
+        )
+        return {
+            b: {"id": b, "created": created.isoformat(), "type": "afkstatus"}
+            for b in self._bucket_ids
+        }
+
+    def _generate(self) -> dict[str, list[AWEvent]]:
+        segments: dict[str, list[tuple[datetime, datetime]]] = {
+            b: [] for b in self._bucket_ids
+        }
+        for offset in range(self._days):
+            day: SyntheticDay = SyntheticDay(
+                self._start + timedelta(days=offset), self._seed
+            )
+            owners: list[str] = [self._bucket_ids[offset % len(self._bucket_ids)]]
+            if len(self._bucket_ids) > 1 and day.rng.random() < 0.1:
+                owners.append(self._bucket_ids[(offset + 1) % len(self._bucket_ids)])
+            for owner in owners:
+                segments[owner].extend(day.segments)
+        return {b: self._timeline(s) for b, s in segments.items()}
+
+    def _timeline(self, segments: list[tuple[datetime, datetime]]) -> list[AWEvent]:
+        """not-afk 区間の間を afk で埋めた連続イベント列（新しい順・id は古い順に採番）"""
+        spans: list[tuple[datetime, datetime, str]] = []
+        for start, end in sorted(segments):
+            previous: datetime | None = spans[-1][1] if spans else None
+            while previous is not None and start > previous:
+                # ActivityWatch と同じく長い離席は複数の afk イベントに分かれる
+                spans.append((previous, min(start, previous + self._AFK_SPLIT), "afk"))
+                previous = spans[-1][1]
+            start = max(start, previous) if previous is not None else start
+            if end > start:
+                spans.append((start, end, "not-afk"))
+        return [
+            {
+                "id": i + 1,
+                "timestamp": s.astimezone(timezone.utc).isoformat(),
+                "duration": round((e - s).total_seconds(), 3),
+                "data": {"status": status},
+            }
+            for i, (s, e, status) in enumerate(spans)
+        ][::-1]
@@ -1,16 +1,123 @@
+import http.client
+import io
+import json
+import threading
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from unittest.mock import MagicMock
+
 import pytest
 
+from aw_work_hours import PROJECT_DIR
 from aw_work_hours.domain.afk_bucket import AFKBucket
+from aw_work_hours.domain.afk_bucket_cache import AFKBucketCache
+from aw_work_hours.domain.afk_event_history import AFKEventHistory
+from aw_work_hours.domain.work_rollup import WorkRollup
 from aw_work_hours.domain.work_rule import WorkRule
+from aw_work_hours.types import AWEvent
+from aw_work_hours.web.pooled_http_server import PooledHTTPServer
+from aw_work_hours.web.work_html_cache import WorkHTMLCache
+from aw_work_hours.web.work_http_handler import WorkHTTPHandler
+
+_FIXTURES: Path = Path(__file__).parent.parent / "fixtures"
 
 
 @pytest.fixture(autouse=True)
 def _reset_bucket_state():
     """AFKBucket のクラス変数をテスト間でリセット"""
-    AFKBucket.clear_cache()
+    AFKBucket.pin(None)
     AFKBucket.set_preference(None)
     WorkRule.MIN_EVENT_SECONDS = 150
     yield
-    AFKBucket.clear_cache()
+    AFKBucket.pin(None)
     AFKBucket.set_preference(None)
     WorkRule.MIN_EVENT_SECONDS = 150
+
+
+@pytest.fixture(autouse=True)
+def _isolate_event_history(tmp_path, monkeypatch):
+    """ローカルイベント履歴・日別集計・バケットキャッシュをテストごとの一時ファイルに差し替え"""
+    monkeypatch.setattr(AFKEventHistory, "_PATH", tmp_path / "events.sqlite3")
+    monkeypatch.setattr(WorkRollup, "_PATH", tmp_path / "rollup.sqlite3")
+    monkeypatch.setattr(AFKBucketCache, "_PATH", tmp_path / "buckets.json")
+
+
+def _load_fixture(name: str) -> bytes:
+    return (_FIXTURES / name).read_bytes()
+
+
+def _event(event_id: int, timestamp: str, duration: float) -> AWEvent:
+    """not-afk のイベント"""
+    return {
+        "id": event_id,
+        "timestamp": timestamp,
+        "duration": duration,
+        "data": {"status": "not-afk"},
+    }
+
+
+def _mock_api(
+    events: str | list[AWEvent] | dict[str, list[AWEvent]],
+    buckets: dict[str, dict[str, str]] | None = None,
+    urls: list[str] | None = None,
+) -> Callable[..., MagicMock]:
+    """APIClient._request の代替
+
+    events は fixture の月名、イベントの配列（呼ばれた時点の内容を返す）、
+    またはバケットIDごとのイベントの配列。バケット一覧は buckets（省略時は fixture）。
+    urls を渡すとイベント取得のURLを記録する。
+    """
+    buckets_data: bytes = (
+        _load_fixture("api/buckets.json")
+        if buckets is None
+        else json.dumps(buckets).encode()
+    )
+    if isinstance(events, str):
+        events = json.loads(_load_fixture(f"api/events/{events}.json"))
+
+    def side_effect(url: str, **kwargs: object) -> MagicMock:
+        resp: MagicMock = MagicMock()
+        resp.status = 200
+        if "/events" in url:
+            if urls is not None:
+                urls.append(url)
+            body: bytes = _events_body(events, url)
+        elif "/buckets" in url:
+            body = buckets_data
+        else:
+            raise ValueError(f"Unexpected URL in test: {url}")
+        # チャンク読み込み（read(n)）にも対応させる
+        resp.read.side_effect = io.BytesIO(body).read
+        return resp
+
+    return side_effect
+
+
+def _events_body(events: list[AWEvent] | dict[str, list[AWEvent]], url: str) -> bytes:
+    """イベント取得のURLに対するレスポンス本文"""
+    if isinstance(events, dict):
+        events = next((e for b, e in events.items() if f"/{b}/events" in url), [])
+    return json.dumps(events[:1] if "limit=1" in url else events).encode()
+
+
+@pytest.fixture
+def server(monkeypatch: pytest.MonkeyPatch) -> Iterator[PooledHTTPServer]:
+    monkeypatch.setattr(WorkHTTPHandler, "directory", str(PROJECT_DIR / "web"))
+    monkeypatch.setattr(WorkHTTPHandler, "data_cache", WorkHTMLCache())
+    httpd: PooledHTTPServer = PooledHTTPServer(("127.0.0.1", 0), WorkHTTPHandler, 2)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _get(
+    httpd: PooledHTTPServer, path: str, headers: dict[str, str] | None = None
+) -> http.client.HTTPResponse:
+    conn: http.client.HTTPConnection = http.client.HTTPConnection(
+        "127.0.0.1", httpd.server_address[1]
+    )
+    conn.request("GET", path, headers=headers or {})
+    resp: http.client.HTTPResponse = conn.getresponse()
+    resp.read()
+    return resp
@@ -0,0 +1,64 @@
+"""AFKバケット解決のキャッシュテスト"""
+
+from unittest.mock import patch
+
+import pytest
+
+from aw_work_hours.domain.afk_bucket import AFKBucket
+from aw_work_hours.domain.afk_bucket_cache import AFKBucketCache
+from conftest import _mock_api
+
+
+def test_resolved_bucket_skips_api_on_next_start() -> None:
+    """TTL内なら、次回起動時は /buckets も最終イベントの問い合わせも行わない"""
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_mock_api("2025-01"),
+    ) as m:
+        resolved: str = AFKBucket.id()
+        # 候補3つの最終イベントを問い合わせる
+        assert sum("limit=1" in c.args[0] for c in m.call_args_list) == 3
+    AFKBucket.clear_cache()
+
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request", side_effect=AssertionError
+    ) as m:
+        assert AFKBucket.id() == resolved
+        assert m.call_count == 0
+
+
+def test_expired_resolution_probes_again(monkeypatch: pytest.MonkeyPatch) -> None:
+    """TTLを過ぎた解決結果・最終イベント時刻は使わない"""
+    monkeypatch.setattr(AFKBucketCache, "_TTL_SECONDS", 0)
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_mock_api("2025-01"),
+    ):
+        AFKBucket.id()
+    AFKBucket.clear_cache()
+
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_mock_api("2025-01"),
+    ) as m:
+        AFKBucket.id()
+        assert sum("limit=1" in c.args[0] for c in m.call_args_list) == 3
+
+
+def test_all_is_resolved_from_the_bucket_list_every_start() -> None:
+    """all の解決結果は保存せず、次回起動時は /buckets から新しいPCも含めて解決する"""
+    AFKBucket.set_preference("all")
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_mock_api("2025-01"),
+    ):
+        assert len(AFKBucket.ids()) == 3
+    AFKBucket.clear_cache()
+
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_mock_api("2025-01"),
+    ) as m:
+        assert len(AFKBucket.ids()) == 3
+        assert any(c.args[0].endswith("/buckets") for c in m.call_args_list)
+    assert "all" not in AFKBucketCache().fresh("resolved")
@@ -0,0 +1,61 @@
+"""ローカルイベント履歴の差分同期テスト"""
+
+from unittest.mock import patch
+
+from aw_work_hours.domain.afk_event_history import AFKEventHistory
+from aw_work_hours.types import AWEvent
+from conftest import _event, _mock_api
+
+_BUCKET: str = "aw-watcher-afk_test"
+_BUCKETS: dict[str, dict[str, str]] = {
+    _BUCKET: {"id": _BUCKET, "created": "2025-01-01T00:00:00+00:00"}
+}
+
+
+def test_sync_fetches_only_after_last_timestamp() -> None:
+    """2回目以降は最終イベントの開始時刻以降だけをAPIに問い合わせる"""
+    served: list[AWEvent] = [
+        _event(2, "2025-01-06T01:00:00+00:00", 600.0),
+        _event(1, "2025-01-06T00:00:00+00:00", 3000.0),
+    ]
+    urls: list[str] = []
+    history: AFKEventHistory = AFKEventHistory(_BUCKET)
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_mock_api(served, _BUCKETS, urls),
+    ):
+        history.events(None, None)
+        first_sync: int = len(urls)
+        # 最終イベントはハートビートで延長され、新しいイベントが追加されている
+        served[:] = [
+            _event(3, "2025-01-06T02:00:00+00:00", 300.0),
+            _event(2, "2025-01-06T01:00:00+00:00", 1200.0),
+        ]
+        events: list[AWEvent] = history.events(None, None).raw
+
+    assert "start=2025-01-01T09%3A00%3A00%2B09%3A00" in urls[0]
+    assert "start=2025-01-06T01%3A00%3A00%2B00%3A00" in urls[first_sync]
+    assert [(e["id"], e["duration"]) for e in events] == [
+        (3, 300.0),
+        (2, 1200.0),
+        (1, 3000.0),
+    ]
+
+
+def test_events_filters_by_overlapping_range() -> None:
+    """期間指定はAPIと同様に期間と重なるイベントを返す"""
+    served: list[AWEvent] = [
+        _event(3, "2025-01-07T00:00:00+00:00", 60.0),
+        _event(2, "2025-01-06T14:50:00+00:00", 1200.0),
+        _event(1, "2025-01-05T00:00:00+00:00", 60.0),
+    ]
+    history: AFKEventHistory = AFKEventHistory(_BUCKET)
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_mock_api(served, _BUCKETS),
+    ):
+        events: list[AWEvent] = history.events(
+            "2025-01-07T00:00:00+09:00", "2025-01-07T12:00:00+09:00"
+        ).raw
+
+    assert [e["id"] for e in events] == [3, 2]
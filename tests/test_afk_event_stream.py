@@ -0,0 +1,64 @@
+"""イベント配列レスポンスの逐次デコードテスト"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from aw_work_hours.domain.afk_event_stream import AFKEventStream
+from conftest import _FIXTURES
+
+
+@pytest.mark.parametrize("chunk_bytes", [1, 7, 64 * 1024])
+def test_stream_keeps_only_not_afk(chunk_bytes: int) -> None:
+    """チャンク境界に関係なく、not-afk イベントだけを元の順序で返す"""
+    body: bytes = (_FIXTURES / "api" / "events" / "2025-11.json").read_bytes()
+    expected: list[dict] = [
+        e for e in json.loads(body) if e["data"]["status"] == "not-afk"
+    ]
+    chunks: list[bytes] = [
+        body[i : i + chunk_bytes] for i in range(0, len(body), chunk_bytes)
+    ]
+
+    assert list(AFKEventStream(chunks)) == expected
+
+
+def test_stream_rejects_truncated_response() -> None:
+    """途中で途切れたレスポンスはエラーにする"""
+    body: bytes = b'[{"id": 1, "timestamp": "2025-11-04T00:00:00+00:00", "data": {'
+
+    with pytest.raises(ValueError):
+        list(AFKEventStream([body]))
+
+
+@pytest.mark.parametrize("chunk_bytes", [1, 5, 64 * 1024])
+def test_stream_handles_nested_and_quoted_braces(chunk_bytes: int) -> None:
+    """文字列中の括弧・入れ子の data・data の後のキー・複数バイト文字でも正しく切り出す"""
+    events: list[dict] = [
+        {"data": {"status": "not-afk", "note": "}{ 会議 {"}, "id": 1},
+        {"id": 2, "data": {"status": "afk", "meta": {"label": "not-afk"}}},
+        {"id": 3, "data": {"status": "not-afk", "meta": {"app": "x"}}, "duration": 1},
+        {"id": 4, "data": {"status": "not-afk"}, "title": '"not-afk" }'},
+    ]
+    body: bytes = json.dumps(events, ensure_ascii=False).encode()
+    chunks: list[bytes] = [
+        body[i : i + chunk_bytes] for i in range(0, len(body), chunk_bytes)
+    ]
+
+    assert [e["id"] for e in AFKEventStream(chunks)] == [1, 3, 4]
+
+
+@pytest.mark.parametrize("separators", [(", ", ": "), (",", ":")])
+def test_afk_events_are_never_decoded(separators: tuple[str, str]) -> None:
+    """aw-server の形式（空白の有無を問わない）の afk イベントはデコードせずに読み飛ばす"""
+    events: list[dict] = json.loads(
+        (_FIXTURES / "api" / "events" / "2025-11.json").read_bytes()
+    )
+    body: bytes = json.dumps(events, separators=separators).encode()
+
+    with patch("json.loads", wraps=json.loads) as loads:
+        kept: list[dict] = list(AFKEventStream([body]))
+
+    assert len(kept) == sum(e["data"]["status"] == "not-afk" for e in events)
+    assert loads.call_count > 0
+    assert all('"afk"' not in call.args[0] for call in loads.call_args_list)
@@ -0,0 +1,49 @@
+"""期間分割したAFKイベントのテスト"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from aw_work_hours.domain.afk_event_windows import AFKEventWindows
+from aw_work_hours.domain.afk_events import AFKEvents
+from aw_work_hours.types import _TIMEZONE, APIConnectionError
+
+
+def test_look_ahead_is_bounded_by_workers() -> None:
+    """読み手が止まっている間は、ワーカー数を超えて窓を取得しない"""
+    started: list[str] = []
+    lock: threading.Lock = threading.Lock()
+
+    def fetch(start: str, end: str, bucket_id: str) -> AFKEvents:
+        with lock:
+            started.append(start)
+        return AFKEvents([])
+
+    begin: datetime = datetime(2025, 1, 1, tzinfo=_TIMEZONE)
+    windows: AFKEventWindows = AFKEventWindows(
+        "b", begin, begin + timedelta(days=30 * 12), workers=3
+    )
+    with patch.object(AFKEvents, "fetch", side_effect=fetch):
+        iterator = iter(windows)
+        next(iterator)
+        time.sleep(0.2)
+        assert len(started) == 3
+        assert len(list(iterator)) == 11
+
+    assert len(started) == 12
+
+
+def test_failed_window_is_not_retried() -> None:
+    """接続の再試行は APIClient に任せ、失敗した窓はそのままエラーにする"""
+    begin: datetime = datetime(2025, 1, 1, tzinfo=_TIMEZONE)
+    windows: AFKEventWindows = AFKEventWindows("b", begin, begin + timedelta(days=10))
+    with patch.object(
+        AFKEvents, "fetch", side_effect=APIConnectionError("down")
+    ) as fetch:
+        with pytest.raises(APIConnectionError):
+            list(windows)
+
+    assert fetch.call_count == 1
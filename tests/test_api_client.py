@@ -0,0 +1,128 @@
+"""keep-alive HTTPクライアントのテスト"""
+
+import http.client
+import http.server
+import socket
+import threading
+import urllib.error
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from aw_work_hours.domain.api_client import APIClient
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version: str = "HTTP/1.1"
+
+    # パス → (ステータス, Location)
+    _REDIRECTS: dict[str, tuple[int, str]] = {
+        "/moved": (301, "/api/moved"),
+        "/relative": (307, "api/relative"),
+        "/loop": (302, "/loop"),
+        "/unmodified": (304, ""),
+    }
+
+    def do_GET(self) -> None:
+        body: bytes = b'{"path": "%s"}' % self.path.encode()
+        status, location = self._REDIRECTS.get(self.path, (200, ""))
+        self.send_response(404 if self.path == "/missing" else status)
+        if location:
+            self.send_header("Location", location)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    """受け付けたTCP接続の送信元ポートを記録するテスト用サーバー"""
+
+    ports: list[int]
+
+    def get_request(self) -> tuple:
+        request, address = super().get_request()
+        self.ports.append(address[1])
+        return request, address
+
+
+@pytest.fixture
+def server() -> Iterator[tuple[str, list[int]]]:
+    httpd: _Server = _Server(("127.0.0.1", 0), _Handler)
+    httpd.ports = []
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", httpd.ports
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_connection_is_reused(server: tuple[str, list[int]]) -> None:
+    """連続したリクエストは1本のTCP接続を使い回す"""
+    base, ports = server
+    before: float = APIClient.stats()["requests"]
+
+    for i in range(3):
+        assert APIClient.json(f"{base}/api/{i}") == {"path": f"/api/{i}"}
+
+    assert len(ports) == 1
+    assert APIClient.stats()["requests"] - before == 3
+
+
+def test_http_error_status(server: tuple[str, list[int]]) -> None:
+    """4xx/5xx は urlopen と同じく HTTPError になる"""
+    base, _ = server
+
+    with pytest.raises(urllib.error.HTTPError):
+        APIClient.read(f"{base}/missing")
+
+
+def test_redirects_are_followed(server: tuple[str, list[int]]) -> None:
+    """リダイレクトは urlopen と同じく追い、追わない 3xx や無限ループは HTTPError"""
+    base, _ = server
+
+    assert APIClient.json(f"{base}/moved") == {"path": "/api/moved"}
+    assert APIClient.json(f"{base}/relative") == {"path": "/api/relative"}
+    with pytest.raises(urllib.error.HTTPError):
+        APIClient.read(f"{base}/loop")
+    with pytest.raises(urllib.error.HTTPError):
+        APIClient.read(f"{base}/unmodified")
+
+
+def test_stale_pooled_connections_do_not_use_up_retries(
+    server: tuple[str, list[int]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """再試行回数より多い待機中の接続が相手に閉じられていても、新しい接続で取り直す"""
+    base, _ = server
+    host: tuple[str, str] = APIClient._host(base)
+    stale: list[http.client.HTTPConnection] = []
+    with socket.create_server(("127.0.0.1", 0)) as listener:
+        for _ in range(APIClient._ATTEMPTS + 2):
+            conn: http.client.HTTPConnection = http.client.HTTPConnection(host[1])
+            conn.sock = socket.create_connection(listener.getsockname())
+            listener.accept()[0].close()
+            stale.append(conn)
+    monkeypatch.setattr(APIClient, "_idle", {host: stale})
+
+    assert APIClient.json(f"{base}/api/fresh") == {"path": "/api/fresh"}
+    assert all(conn.sock is None for conn in stale)
+
+
+def test_timeouts_on_pooled_connections_count_as_attempts(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """応答しないサーバーへの待機中の接続のタイムアウトは、再試行回数に数える"""
+    with socket.create_server(("127.0.0.1", 0)) as listener:
+        base: str = f"http://127.0.0.1:{listener.getsockname()[1]}"
+        host: tuple[str, str] = APIClient._host(base)
+        pooled: http.client.HTTPConnection = http.client.HTTPConnection(host[1])
+        pooled.sock = socket.create_connection(listener.getsockname())
+        monkeypatch.setattr(APIClient, "_idle", {host: [pooled]})
+        monkeypatch.setattr(APIClient, "_BACKOFF_SECONDS", 0)
+        with patch.object(APIClient, "_request", wraps=APIClient._request) as request:
+            with pytest.raises(urllib.error.URLError):
+                APIClient.read(f"{base}/api/hung", timeout=0.1)
+
+    assert request.call_count == APIClient._ATTEMPTS
@@ -0,0 +1,57 @@
+"""/api プロキシのストリーミング・キャッシュのテスト"""
+
+import gzip
+import io
+from collections.abc import Callable
+from unittest.mock import MagicMock, patch
+
+from aw_work_hours.web.api_proxy_cache import APIProxyCache
+from aw_work_hours.web.pooled_http_server import PooledHTTPServer
+from aw_work_hours.web.work_http_handler import WorkHTTPHandler
+from conftest import _get
+
+_BODY: bytes = b'[{"id": 1, "data": {"status": "not-afk"}}]' * 100
+_PAST: str = "/api/0/buckets/b/events?start=2025-01-01T00:00:00%2B09:00&end=2025-02-01"
+
+
+def _upstream(status: int = 200) -> Callable[..., MagicMock]:
+    def side_effect(url: str, **kwargs: object) -> MagicMock:
+        resp: MagicMock = MagicMock()
+        resp.status = status
+        resp.msg = {"Content-Type": "text/plain", "Content-Length": str(len(_BODY))}
+        resp.read.side_effect = io.BytesIO(_BODY).read
+        return resp
+
+    return side_effect
+
+
+def test_past_range_is_cached(server: PooledHTTPServer, monkeypatch) -> None:
+    """end が過去のクエリは2回目から上流に問い合わせない"""
+    monkeypatch.setattr(WorkHTTPHandler, "api_cache", APIProxyCache())
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request", side_effect=_upstream()
+    ) as m:
+        first = _get(server, _PAST)
+        second = _get(server, _PAST)
+
+    assert m.call_count == 1
+    assert first.status == second.status == 200
+    assert first.getheader("Content-Type") == "text/plain"
+    assert first.getheader("Content-Length") == str(len(_BODY))
+
+
+def test_open_range_streams_upstream_status(
+    server: PooledHTTPServer, monkeypatch
+) -> None:
+    """end のないクエリは毎回転送し、上流のステータスと圧縮をそのまま反映する"""
+    monkeypatch.setattr(WorkHTTPHandler, "api_cache", APIProxyCache())
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_upstream(404),
+    ) as m:
+        _get(server, "/api/0/buckets/b/events")
+        resp = _get(server, "/api/0/buckets/b/events", {"Accept-Encoding": "gzip"})
+
+    assert m.call_count == 2
+    assert resp.status == 404
+    assert resp.getheader("Content-Encoding") == "gzip"
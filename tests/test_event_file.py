@@ -0,0 +1,104 @@
+"""入力ファイルからのイベントのテスト"""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from aw_work_hours.cli.cli_main import CLIMain
+from aw_work_hours.domain.afk_events import AFKEvents
+from aw_work_hours.domain.event_file import EventFile
+from aw_work_hours.domain.json_reader import JSONReader
+from aw_work_hours.domain.work_calendar import WorkCalendar
+from aw_work_hours.types import CLIError
+from conftest import _FIXTURES, _load_fixture
+
+_EVENTS: Path = _FIXTURES / "api" / "events" / "2025-03.json"
+
+
+def _export(path: Path, events: list[dict]) -> None:
+    """ウィンドウのバケットと2台分の AFK バケットを含むエクスポートを書く"""
+    window: list[dict] = [
+        {"timestamp": e["timestamp"], "duration": 1.0, "data": {"title": "not-afk"}}
+        for e in events[:50]
+    ]
+    buckets: dict = {
+        "aw-watcher-window_Mac": {"id": "aw-watcher-window_Mac", "events": window},
+        "aw-watcher-afk_Mac": {"id": "aw-watcher-afk_Mac", "events": events},
+        "aw-watcher-afk_PC": {"id": "aw-watcher-afk_PC", "events": events[:10]},
+    }
+    path.write_text(json.dumps({"buckets": buckets}, indent=2))
+
+
+def test_formats_match_api_events(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """イベント配列・エクスポート・NDJSON は、チャンク境界がどこでもAPIと同じ区間になる"""
+    monkeypatch.setattr(JSONReader, "_CHUNK_CHARS", 7)
+    events: list[dict] = json.loads(_load_fixture("api/events/2025-03.json"))
+    expected: AFKEvents = AFKEvents(events)
+    _export(tmp_path / "export.json", events)
+    (tmp_path / "events.ndjson").write_text(
+        "".join(json.dumps(e) + "\n" for e in reversed(events))
+    )
+
+    for name in ["export.json", "events.ndjson"]:
+        actual: AFKEvents = EventFile(tmp_path / name).events(None, None)
+        assert actual.intervals == expected.intervals, name
+    assert EventFile(_EVENTS).events(None, None).intervals == expected.intervals
+    assert len(EventFile(tmp_path / "export.json", "PC").events(None, None).raw) < 10
+
+
+def test_events_are_limited_to_period() -> None:
+    """期間を指定すると、その期間と重なる not-afk イベントだけが残る"""
+    events: AFKEvents = EventFile(_EVENTS).events(
+        "2025-03-10T00:00:00+09:00", "2025-03-11T00:00:00+09:00"
+    )
+
+    assert events.intervals
+    assert all(i.start.day <= 10 <= i.end.day for i in events.intervals)
+
+
+def test_month_output_from_input_needs_no_api(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """--input の集計は、APIを呼ばずにAPIから集計した月の出力と一致する"""
+    monkeypatch.setattr(WorkCalendar, "_source", None)
+    monkeypatch.setattr(
+        sys, "argv", ["aw-work-hours", "-q", "-m", "2025-03", "--input", str(_EVENTS)]
+    )
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=AssertionError("API must not be called"),
+    ):
+        CLIMain().run()
+
+    expected: str = (_FIXTURES / "expected" / "2025-03.txt").read_text()
+    assert capsys.readouterr().out == expected
+
+
+def test_rejects_broken_files(tmp_path: Path) -> None:
+    """途中で切れたファイルや複数PCの指定は CLIError"""
+    path: Path = tmp_path / "broken.json"
+    path.write_text(_EVENTS.read_text()[:5000])
+
+    with pytest.raises(CLIError):
+        EventFile(path).events(None, None)
+    with pytest.raises(CLIError):
+        EventFile(_EVENTS, "all")
+
+
+def test_export_bucket_selection(tmp_path: Path) -> None:
+    """PC名は大文字小文字を区別せず、該当がなければ候補を挙げて CLIError"""
+    events: list[dict] = json.loads(_EVENTS.read_text())
+    _export(tmp_path / "export.json", events)
+
+    pc: AFKEvents = EventFile(tmp_path / "export.json", "pc").events(None, None)
+    assert len(pc.raw) < 10
+    with pytest.raises(CLIError, match="利用可能なバケット:\n  Mac\n  PC"):
+        EventFile(tmp_path / "export.json", "Linux").events(None, None)
+    (tmp_path / "window.json").write_text(json.dumps({"buckets": {}}))
+    with pytest.raises(CLIError, match="AFKバケットが見つかりません"):
+        EventFile(tmp_path / "window.json").events(None, None)
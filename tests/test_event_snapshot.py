@@ -0,0 +1,112 @@
+"""スナップショットファイルのテスト"""
+
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from aw_work_hours.cli.cli_main import CLIMain
+from aw_work_hours.domain.afk_events import AFKEvents
+from aw_work_hours.domain.event_snapshot import EventSnapshot
+from aw_work_hours.domain.holiday_calendar import HolidayCalendar
+from aw_work_hours.domain.month_period import MonthPeriod
+from aw_work_hours.domain.work_calendar import WorkCalendar
+from aw_work_hours.output.work_text import WorkText
+from aw_work_hours.types import CLIError
+from conftest import _FIXTURES, _load_fixture, _mock_api
+
+
+def _fixture_events(month: str) -> AFKEvents:
+    return AFKEvents(json.loads(_load_fixture(f"api/events/{month}.json")))
+
+
+def test_events_match_fixture_intervals(tmp_path: Path) -> None:
+    """期間の切り出しは、その期間と重なる区間だけを元と同じ値で返す"""
+    events: AFKEvents = _fixture_events("2025-03")
+    path: Path = tmp_path / "aw.snap"
+    EventSnapshot.write(path, "aw-watcher-afk_Mac", events.intervals)
+    snapshot: EventSnapshot = EventSnapshot(path)
+
+    lower: datetime = events.intervals[100].end - timedelta(seconds=1)
+    upper: datetime = events.intervals[200].start
+    sliced: AFKEvents = snapshot.events(lower.isoformat(), upper.isoformat())
+
+    assert snapshot.bucket_id == "aw-watcher-afk_Mac"
+    assert snapshot.events(None, None).intervals == events.intervals
+    assert sliced.intervals == [
+        i for i in events.intervals if i.end >= lower and i.start <= upper
+    ]
+
+
+def test_month_output_from_snapshot_needs_no_api(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """スナップショットからの集計は、APIから集計した月の出力と一致する"""
+    path: Path = tmp_path / "aw.snap"
+    EventSnapshot.write(path, "b", _fixture_events("2025-03").intervals)
+    monkeypatch.setattr(WorkCalendar, "_source", EventSnapshot(path))
+    period: MonthPeriod = MonthPeriod.parse("2025-03")
+
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=AssertionError("API must not be called"),
+    ):
+        calendar, daily_work, _ = WorkCalendar.from_period(period)
+        text: str = WorkText(
+            calendar.work_days(daily_work), period, HolidayCalendar()
+        ).content()
+
+    assert text == (_FIXTURES / "expected" / "2025-03.txt").read_text()
+
+
+def test_snapshot_command_round_trip(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """snapshot コマンドで書き出したファイルを --from-snapshot で読み、同じ出力になる"""
+    path: Path = tmp_path / "aw.snap"
+    monkeypatch.setattr(WorkCalendar, "_source", None)
+    monkeypatch.setattr(
+        sys, "argv", ["aw-work-hours", "snapshot", "-q", "-o", str(path)]
+    )
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_mock_api("2025-03"),
+    ):
+        CLIMain().run()
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["aw-work-hours", "-q", "-m", "2025-03", "--from-snapshot", str(path)],
+    )
+    CLIMain().run()
+
+    expected: str = (_FIXTURES / "expected" / "2025-03.txt").read_text()
+    assert capsys.readouterr().out == expected
+
+
+def test_rejects_other_files(tmp_path: Path) -> None:
+    """スナップショット以外のファイルは CLIError"""
+    path: Path = tmp_path / "events.json"
+    path.write_bytes(_load_fixture("api/buckets.json"))
+
+    with pytest.raises(CLIError):
+        EventSnapshot(path)
+
+
+def test_rejects_truncated_or_corrupted_files(tmp_path: Path) -> None:
+    """列が途中で切れたファイルや、not-afk 以外の状態を含むファイルは CLIError"""
+    path: Path = tmp_path / "aw.snap"
+    EventSnapshot.write(path, "b", _fixture_events("2025-03").intervals)
+    data: bytes = path.read_bytes()
+
+    path.write_bytes(data[:-1])
+    with pytest.raises(CLIError, match="途中で切れています"):
+        EventSnapshot(path)
+    path.write_bytes(data[:-1] + b"\0")
+    with pytest.raises(CLIError, match="状態の列"):
+        EventSnapshot(path)
@@ -0,0 +1,103 @@
+"""規則による祝日判定のテスト"""
+
+import io
+import json
+import urllib.error
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from aw_work_hours.domain.holiday_calendar import HolidayCalendar
+from aw_work_hours.domain.holiday_rules import HolidayRules
+from conftest import _FIXTURES
+
+
+@pytest.mark.parametrize("year", [2025, 2026])
+def test_rules_match_api_fixture(year: int) -> None:
+    """規則から算出した日付・名称が holidays-jp API の応答と一致する"""
+    expected: dict[str, str] = json.loads(
+        (_FIXTURES / "holidays" / f"{year}.json").read_text()
+    )
+    assert {d.isoformat(): n for d, n in HolidayRules.names(year).items()} == expected
+
+
+def test_special_years() -> None:
+    """即位関連・東京五輪の特例と、振替休日・国民の休日の規則"""
+    assert {date(2019, 4, 30), date(2019, 5, 1), date(2019, 5, 2)} <= set(
+        HolidayRules.names(2019)
+    )
+    assert date(2019, 12, 23) not in HolidayRules.names(2019)
+    assert HolidayRules.names(2021)[date(2021, 8, 9)] == "山の日 振替休日"
+    assert date(2020, 10, 12) not in HolidayRules.names(2020)
+    assert HolidayRules.names(2015)[date(2015, 9, 22)] == "国民の休日"
+    assert HolidayRules.names(1999) == {}
+
+
+def test_lookup_never_touches_network() -> None:
+    """判定はネットワークに接続しない"""
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=OSError("offline"),
+    ) as m:
+        holidays: HolidayCalendar = HolidayCalendar()
+        assert holidays.is_holiday(date(2025, 11, 24))
+        assert holidays.is_holiday(date(2025, 11, 22))
+        assert not holidays.is_holiday(date(2025, 11, 25))
+    assert m.call_count == 0
+
+
+def test_cross_check_reports_differences() -> None:
+    """API 応答との差分を日付ごとに返す"""
+    remote: dict[str, str] = json.loads(
+        (_FIXTURES / "holidays" / "2025.json").read_text()
+    )
+    del remote["2025-11-24"]
+    resp: MagicMock = MagicMock()
+    resp.status = 200
+    resp.read.side_effect = io.BytesIO(json.dumps(remote).encode()).read
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request", return_value=resp
+    ), patch.object(HolidayCalendar, "_prepare_tls"):
+        differences: list[str] = HolidayCalendar().cross_check(2025)
+    assert differences == ["2025-11-24 規則: 勤労感謝の日 振替休日 / API: -"]
+
+
+def test_years_outside_rules_use_api(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """規則の範囲外の年は API から取得し、接続できなければ警告して土日だけにする"""
+    monkeypatch.setattr(HolidayCalendar, "_years", {})
+    resp: MagicMock = MagicMock()
+    resp.status = 200
+    resp.read.side_effect = io.BytesIO(b'{"2100-01-01": "\\u5143\\u65e5"}').read
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request", return_value=resp
+    ), patch.object(HolidayCalendar, "_prepare_tls"):
+        assert HolidayCalendar().is_holiday(date(2100, 1, 1))
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=urllib.error.URLError("offline"),
+    ), patch.object(HolidayCalendar, "_prepare_tls"):
+        holidays: HolidayCalendar = HolidayCalendar()
+        assert not holidays.is_holiday(date(1999, 1, 1))
+        assert holidays.is_holiday(date(1999, 1, 2))
+    assert "1999年の祝日は規則の範囲外" in capsys.readouterr().err
+
+
+def test_failed_year_is_fetched_again(monkeypatch: pytest.MonkeyPatch) -> None:
+    """祝日APIに接続できなかった年は登録せず、接続できるようになれば取得し直す"""
+    monkeypatch.setattr(HolidayCalendar, "_years", {})
+    holidays: HolidayCalendar = HolidayCalendar()
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=urllib.error.URLError("offline"),
+    ), patch.object(HolidayCalendar, "_prepare_tls"):
+        assert not holidays.is_holiday(date(2100, 1, 1))
+    resp: MagicMock = MagicMock()
+    resp.status = 200
+    resp.read.side_effect = io.BytesIO(b'{"2100-01-01": "\\u5143\\u65e5"}').read
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request", return_value=resp
+    ), patch.object(HolidayCalendar, "_prepare_tls"):
+        assert holidays.is_holiday(date(2100, 1, 1))
@@ -0,0 +1,108 @@
+"""/metrics・/profile と --profile のテスト"""
+
+import http.client
+import socket
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+from aw_work_hours.cli.cli_main import CLIMain
+from aw_work_hours.web.http_metrics import HTTPMetrics
+from aw_work_hours.web.pooled_http_server import PooledHTTPServer
+from aw_work_hours.web.work_http_handler import WorkHTTPHandler
+from conftest import _mock_api
+
+
+def _body(httpd: PooledHTTPServer, path: str) -> tuple[int, str]:
+    conn: http.client.HTTPConnection = http.client.HTTPConnection(
+        "127.0.0.1", httpd.server_address[1]
+    )
+    conn.request("GET", path)
+    resp: http.client.HTTPResponse = conn.getresponse()
+    return resp.status, resp.read().decode("utf-8")
+
+
+def _metrics(httpd: PooledHTTPServer, recorded: str) -> tuple[int, str]:
+    """/metrics を recorded が現れるまで取り直す（記録は応答の送信後のため）"""
+    for _ in range(50):
+        status, text = _body(httpd, "/metrics")
+        if recorded in text:
+            break
+        time.sleep(0.02)
+    return status, text
+
+
+def test_metrics_counts_routes_and_stages(
+    server: PooledHTTPServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """ルート・ステータスごとのリクエスト数と、処理段階のヒストグラムを出力する"""
+    monkeypatch.setattr(WorkHTTPHandler, "metrics", HTTPMetrics())
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_mock_api("2025-03"),
+    ):
+        assert _body(server, "/data/2025-03")[0] == 200
+        assert _body(server, "/nothing.txt")[0] == 404
+    status, text = _metrics(server, 'route="static",status="404"')
+
+    assert status == 200
+    assert 'aw_work_hours_http_requests_total{route="/data",status="200"} 1' in text
+    assert 'aw_work_hours_http_requests_total{route="static",status="404"} 1' in text
+    assert 'aw_work_hours_http_request_seconds_count{route="/data"} 1' in text
+    for stage in ("fetch", "fetch.network", "blocks", "html_json"):
+        assert f'aw_work_hours_stage_seconds_count{{stage="{stage}"}}' in text
+    assert 'aw_work_hours_server{stat="workers"} 2' in text
+
+
+def test_malformed_request_line_is_recorded(
+    server: PooledHTTPServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """壊れた要求行にも 400 を返し、path なしのルートとして記録する"""
+    monkeypatch.setattr(WorkHTTPHandler, "metrics", HTTPMetrics())
+    with socket.create_connection(("127.0.0.1", server.server_address[1])) as sock:
+        sock.sendall(b"GARBAGE\r\n\r\n")
+        reply: bytes = sock.recv(1024)
+    _, text = _metrics(server, 'route="invalid"')
+
+    assert b"400" in reply
+    assert 'aw_work_hours_http_requests_total{route="invalid",status="400"} 1' in text
+
+
+def test_profile_endpoint(server: PooledHTTPServer) -> None:
+    """/profile/data/<月> は cProfile の集計をテキストで返す"""
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_mock_api("2025-03"),
+    ):
+        status, text = _body(server, "/profile/data/2025-03")
+
+    assert status == 200
+    assert "cumulative" in text and "work_html_response.py" in text
+
+
+def test_cli_profile(
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """--profile で段階ごとの所要時間を標準エラーに出力する"""
+    monkeypatch.setattr(
+        sys, "argv", ["aw-work-hours", "-m", "2025-03", "-q", "--profile"]
+    )
+    with (
+        patch(
+            "aw_work_hours.domain.api_client.APIClient._request",
+            side_effect=_mock_api("2025-03"),
+        ),
+        patch("aw_work_hours.cli.cli_main.Settings") as settings,
+    ):
+        settings.return_value.min_event_seconds = 150
+        settings.return_value.bucket = None
+        settings.return_value.no_colon = False
+        CLIMain().run()
+
+    err: str = capsys.readouterr().err
+    assert "処理段階ごとの所要時間:" in err
+    for stage in ("history", "blocks", "text", "total"):
+        assert f"  {stage} " in err
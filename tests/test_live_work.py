@@ -0,0 +1,132 @@
+"""--watch の差分更新のテスト"""
+
+import sys
+from datetime import date, datetime
+from unittest.mock import patch
+
+import pytest
+
+from aw_work_hours.cli.cli_main import CLIMain
+from aw_work_hours.cli.cli_watch import CLIWatch
+from aw_work_hours.domain.afk_events import AFKEvents
+from aw_work_hours.domain.daily_work import DailyWork
+from aw_work_hours.domain.live_work import LiveWork
+from aw_work_hours.domain.month_period import MonthPeriod
+from aw_work_hours.domain.work_calendar import WorkCalendar
+from aw_work_hours.domain.work_day import WorkDay
+from aw_work_hours.types import _TIMEZONE, APIConnectionError, AWEvent
+from conftest import _event
+
+_SINCE: datetime = datetime(2025, 3, 3, 9, tzinfo=_TIMEZONE)
+
+
+def _live(initial: list[AWEvent]) -> tuple[LiveWork, DailyWork]:
+    events: AFKEvents = AFKEvents(initial)
+    daily_work: DailyWork = DailyWork(events.intervals)
+    return LiveWork("aw-watcher-afk_Mac", daily_work, events), daily_work
+
+
+def _poll(live: LiveWork, fetched: list[AWEvent]) -> dict[date, WorkDay]:
+    with patch(
+        "aw_work_hours.domain.afk_events.AFKEvents.fetch",
+        return_value=AFKEvents(fetched),
+    ):
+        return live.poll(_SINCE)
+
+
+def test_incremental_updates_match_full_recompute() -> None:
+    """ハートビートの延長・新しい区間を差分で反映した結果が、全件の再計算と一致する"""
+    first: AWEvent = _event(1, "2025-03-03T00:00:00+00:00", 3600)
+    short: AWEvent = _event(2, "2025-03-03T01:30:00+00:00", 60)
+    live, daily_work = _live([short, first])
+
+    # 閾値未満だった区間が延長で閾値を超え、さらに新しい区間が始まる
+    grown: AWEvent = _event(2, "2025-03-03T01:30:00+00:00", 400)
+    latest: AWEvent = _event(3, "2025-03-03T02:00:00+00:00", 300)
+    _poll(live, [latest, grown])
+    stretched: AWEvent = _event(3, "2025-03-03T02:00:00+00:00", 1200)
+    changed: dict[date, WorkDay] = _poll(live, [stretched])
+
+    full: DailyWork = DailyWork(AFKEvents([stretched, grown, first]).intervals)
+    expected: dict[date, WorkDay] = WorkCalendar.from_blocks(full.blocks).work_days(
+        full
+    )
+    assert daily_work.active == full.active
+    assert daily_work.gaps == full.gaps
+    assert daily_work.blocks == full.blocks
+    assert [(d, vars(w)) for d, w in changed.items()] == [
+        (d, vars(w)) for d, w in expected.items()
+    ]
+    assert _poll(live, [stretched]) == {}
+
+
+def test_changed_line_is_redrawn_in_place(
+    capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """端末では変わった日の行だけをカーソル移動で書き換える"""
+    live, daily_work = _live([_event(1, "2025-03-03T00:00:00+00:00", 3600)])
+    days: dict[date, WorkDay] = WorkCalendar.from_blocks(daily_work.blocks).work_days(
+        daily_work
+    )
+    watch: CLIWatch = CLIWatch(live, days, MonthPeriod.parse("2025-03"), False)
+    monkeypatch.setattr("time.sleep", lambda _: None)
+    monkeypatch.setattr(sys.stdout, "isatty", lambda: True)
+    fetched: list[AWEvent] = [_event(1, "2025-03-03T00:00:00+00:00", 7200)]
+    with patch(
+        "aw_work_hours.domain.afk_events.AFKEvents.fetch",
+        side_effect=[AFKEvents(fetched), KeyboardInterrupt],
+    ):
+        watch.run(1)
+
+    initial, redraw = capsys.readouterr().out.split("\n2025-03-31")
+    line: str = "2025-03-03 月   09:00 - 11:00   (2.0h)"
+    assert "2025-03-03 月   09:00 - 10:00   (1.0h)\n" in initial
+    # 3日の行は末尾（31日の次の行）から29行上にある
+    assert redraw == f" 月\n\x1b[29F\x1b[2K{line}\x1b[29E"
+
+
+def test_watch_rejects_month_ranges(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """小計の行を含む月範囲の表示は差分更新できないため、APIに触れる前に CLIError"""
+    monkeypatch.setattr(WorkCalendar, "_source", None)
+    monkeypatch.setattr(
+        sys, "argv", ["aw-work-hours", "-q", "--watch", "-m", "2025-01..2025-02"]
+    )
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=AssertionError("API must not be called"),
+    ), pytest.raises(SystemExit):
+        CLIMain().run()
+
+    assert "月範囲" in capsys.readouterr().err
+
+
+def test_error_on_terminal_keeps_cursor_math(
+    capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """端末では接続エラーを表の直下の行に改行せずに出し、次の再描画の行数をずらさない"""
+    live, daily_work = _live([_event(1, "2025-03-03T00:00:00+00:00", 3600)])
+    days: dict[date, WorkDay] = WorkCalendar.from_blocks(daily_work.blocks).work_days(
+        daily_work
+    )
+    watch: CLIWatch = CLIWatch(live, days, MonthPeriod.parse("2025-03"), False)
+    monkeypatch.setattr("time.sleep", lambda _: None)
+    monkeypatch.setattr(sys.stdout, "isatty", lambda: True)
+    monkeypatch.setattr(sys.stderr, "isatty", lambda: True)
+    fetched: list[AWEvent] = [_event(1, "2025-03-03T00:00:00+00:00", 7200)]
+    with patch(
+        "aw_work_hours.domain.afk_events.AFKEvents.fetch",
+        side_effect=[
+            APIConnectionError("エラー: 接続できません\n詳細"),
+            AFKEvents(fetched),
+            KeyboardInterrupt,
+        ],
+    ):
+        watch.run(1)
+
+    captured = capsys.readouterr()
+    line: str = "2025-03-03 月   09:00 - 11:00   (2.0h)"
+    assert captured.err.startswith("\x1b[2Kエラー: 接続できません\r")
+    # エラーの行を消してから、同じ29行上の3日の行を書き換える
+    assert captured.out.endswith(f" 月\n\x1b[2K\x1b[29F\x1b[2K{line}\x1b[29E")
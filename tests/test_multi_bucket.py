@@ -0,0 +1,65 @@
+"""複数PCのバケット合算のテスト"""
+
+from datetime import date
+from unittest.mock import patch
+
+from aw_work_hours.domain.afk_bucket import AFKBucket
+from aw_work_hours.domain.afk_events import AFKEvents
+from aw_work_hours.domain.daily_work import DailyWork
+from aw_work_hours.domain.month_period import MonthPeriod
+from aw_work_hours.domain.work_calendar import WorkCalendar
+from aw_work_hours.types import AWEvent
+from conftest import _event, _mock_api
+
+
+def test_overlapping_machines_are_not_double_counted() -> None:
+    """PC間で重なる区間は和集合にまとめ、重ならない区間はそのまま残す"""
+    laptop: AFKEvents = AFKEvents(
+        [
+            _event(1, "2025-03-03T00:00:00+00:00", 3600),
+            _event(2, "2025-03-03T03:00:00+00:00", 600),
+        ]
+    )
+    desktop: AFKEvents = AFKEvents(
+        [
+            _event(1, "2025-03-03T00:30:00+00:00", 3600),
+            _event(2, "2025-03-03T00:40:00+00:00", 60),
+        ]
+    )
+    merged: AFKEvents = AFKEvents.merged([laptop, desktop])
+
+    assert [i.duration for i in merged.intervals] == [5400, 600]
+    assert len(merged.raw) == 4
+    assert DailyWork(merged.intervals).active == {date(2025, 3, 3): 6000}
+
+
+def test_all_buckets_with_identical_history_match_single() -> None:
+    """同じ記録を持つ3つのバケットを合算しても、1つのバケットの和集合と同じ集計になる"""
+    period: MonthPeriod = MonthPeriod.parse("2025-03")
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_mock_api("2025-03"),
+    ):
+        _, _, single = WorkCalendar.from_period(period)
+        AFKBucket.clear_cache()
+        AFKBucket.set_preference("all")
+        assert len(AFKBucket.ids()) == 3
+        _, daily_work, events = WorkCalendar.from_period(period)
+
+    expected: DailyWork = DailyWork(AFKEvents.merged([single]).intervals)
+    assert len(events.raw) == 3 * len(single.raw)
+    assert daily_work.active == expected.active
+    assert daily_work.blocks == expected.blocks
+
+
+def test_comma_separated_preference() -> None:
+    """カンマ区切りのPC名は、それぞれ1つのバケットに解決する"""
+    AFKBucket.set_preference("Mac, PC-MC2408N0009B.local")
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_mock_api("2025-03"),
+    ):
+        assert AFKBucket.ids() == [
+            "aw-watcher-afk_Mac",
+            "aw-watcher-afk_PC-MC2408N0009B.local",
+        ]
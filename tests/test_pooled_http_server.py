@@ -0,0 +1,59 @@
+"""ワーカー数上限付きHTTPサーバーのテスト"""
+
+import http.client
+import http.server
+import threading
+from collections.abc import Iterator
+
+import pytest
+
+from aw_work_hours.web.pooled_http_server import PooledHTTPServer
+
+_release: threading.Event = threading.Event()
+
+
+class _BlockingHandler(http.server.BaseHTTPRequestHandler):
+    """_release が立つまでワーカーを占有する"""
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        _release.wait(5)
+        self.send_response(204)
+        self.end_headers()
+
+
+@pytest.fixture
+def busy() -> Iterator[PooledHTTPServer]:
+    """ワーカー1・待ち行列1のサーバー"""
+    _release.clear()
+    httpd: PooledHTTPServer = PooledHTTPServer(
+        ("127.0.0.1", 0), _BlockingHandler, 1, backlog=1
+    )
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    _release.set()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _request(httpd: PooledHTTPServer) -> http.client.HTTPConnection:
+    conn: http.client.HTTPConnection = http.client.HTTPConnection(
+        "127.0.0.1", httpd.server_address[1], timeout=5
+    )
+    conn.request("GET", "/")
+    return conn
+
+
+def test_full_backlog_is_rejected_with_503(busy: PooledHTTPServer) -> None:
+    """処理中と待ち行列が上限に達したら積まずに 503 を返し、空けば受け付ける"""
+    held: list[http.client.HTTPConnection] = [_request(busy), _request(busy)]
+    rejected: http.client.HTTPResponse = _request(busy).getresponse()
+
+    assert rejected.status == 503
+    assert rejected.getheader("Retry-After") == "1"
+    assert busy.load["rejected"] == 1
+    _release.set()
+    assert [c.getresponse().status for c in held] == [204, 204]
+    assert _request(busy).getresponse().status == 204
@@ -0,0 +1,50 @@
+"""CLI起動時のimportのテスト"""
+
+import subprocess
+import sys
+
+from aw_work_hours import PROJECT_DIR
+
+# テキスト・CSV出力では使わないモジュール（--html・並列集計・祝日API接続時だけ読み込む）
+_DEFERRED: tuple[str, ...] = (
+    "aw_work_hours.web",
+    "http.server",
+    "webbrowser",
+    "truststore",
+    "multiprocessing",
+    "cProfile",
+)
+# cli_main の import にかかる累積時間の上限（計測値 約120ms の2倍程度）
+_BUDGET_US: int = 250_000
+
+
+def _importtime() -> dict[str, int]:
+    """モジュール名 → 累積import時間（マイクロ秒）"""
+    result: subprocess.CompletedProcess[str] = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import aw_work_hours.cli.cli_main"],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_text_mode_skips_deferred_modules() -> None:
+    """HTTPサーバー・TLS設定・multiprocessing を起動時に読み込まない"""
+    loaded: list[str] = [
+        name
+        for name in _importtime()
+        if any(name == m or name.startswith(f"{m}.") for m in _DEFERRED)
+    ]
+    assert loaded == []
+
+
+def test_startup_budget() -> None:
+    """cli_main の import が予算内（3回の最小値で揺らぎを除く）"""
+    best: int = min(_importtime()["aw_work_hours.cli.cli_main"] for _ in range(3))
+    assert best < _BUDGET_US
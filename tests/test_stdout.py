@@ -4,11 +4,7 @@ fixtures/ 内のAPIレスポンスを使い、ActivityWatch APIに接続せず
 各月のstdout出力がリファクタリング前と一致することを検証する。
 """
 
-import json
-from collections.abc import Callable
-from pathlib import Path
-from typing import Any
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 
@@ -16,60 +12,24 @@ from aw_work_hours.domain.holiday_calendar import HolidayCalendar
 from aw_work_hours.domain.month_period import MonthPeriod
 from aw_work_hours.domain.work_calendar import WorkCalendar
 from aw_work_hours.output.work_text import WorkText
+from conftest import _FIXTURES, _mock_api
 
-_FIXTURES: Path = Path(__file__).parent.parent / "fixtures"
 _MONTHS: list[str] = [f"2025-{m:02d}" for m in range(1, 13)] + ["2026-01"]
 
 
-def _load_fixture(name: str) -> bytes:
-    return (_FIXTURES / name).read_bytes()
-
-
-def _mock_urlopen(month: str) -> Callable[..., MagicMock]:
-    """urllib.request.urlopen の代替: fixtureからレスポンスを返す"""
-    buckets_data: bytes = _load_fixture("api/buckets.json")
-    events_data: bytes = _load_fixture(f"api/events/{month}.json")
-    events_first: bytes = json.dumps(json.loads(events_data)[:1]).encode()
-
-    def side_effect(url: str, **kwargs: object) -> MagicMock:
-        resp: MagicMock = MagicMock()
-        resp.__enter__ = lambda s: s
-        resp.__exit__ = MagicMock(return_value=False)
-        if "/events" in url:
-            if "limit=1" in url:
-                resp.read.return_value = events_first
-            else:
-                resp.read.return_value = events_data
-        elif "/buckets" in url:
-            resp.read.return_value = buckets_data
-        else:
-            raise ValueError(f"Unexpected URL in test: {url}")
-        resp.read.return_value = resp.read.return_value
-        return resp
-
-    return side_effect
-
-
 @pytest.mark.parametrize("month", _MONTHS)
 def test_stdout(month: str) -> None:
     """リファクタリング後のstdout出力がfixture期待値と一致する"""
     expected: str = (_FIXTURES / "expected" / f"{month}.txt").read_text()
 
     with patch(
-        "urllib.request.urlopen",
-        side_effect=_mock_urlopen(month),
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_mock_api(month),
     ):
         period = MonthPeriod.parse(month)
         calendar, daily_work, _events = WorkCalendar.from_period(period)
         holidays = HolidayCalendar()
-        holidays._cache_dir = _FIXTURES / "holidays"
-        text = WorkText(
-            calendar.daily,
-            daily_work.active,
-            daily_work.gaps,
-            period,
-            holidays,
-        )
+        text = WorkText(calendar.work_days(daily_work), period, holidays)
         actual: str = text.content()
 
     assert actual == expected, (
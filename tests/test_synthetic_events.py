@@ -0,0 +1,61 @@
+"""ベンチマーク用の合成イベント・段階別計測テスト"""
+
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from aw_work_hours.domain.afk_events import AFKEvents
+from aw_work_hours.domain.month_period import MonthPeriod
+from aw_work_hours.types import _TIMEZONE, AFKInterval
+from benchmarks.benchmark_report import BenchmarkReport
+from benchmarks.stage_timings import StageTimings
+from benchmarks.synthetic_events import SyntheticEvents
+
+
+def test_deterministic_and_ordered() -> None:
+    """同じシードなら同じ内容で、APIと同じく新しい順・id は時刻順"""
+    events = SyntheticEvents(date(2025, 1, 1), 60, buckets=2).events
+    assert events == SyntheticEvents(date(2025, 1, 1), 60, buckets=2).events
+    assert events != SyntheticEvents(date(2025, 1, 1), 60, buckets=2, seed=1).events
+    for bucket_events in events.values():
+        ids: list[int] = [e["id"] for e in bucket_events]
+        assert ids == sorted(ids, reverse=True)
+        stamps: list[str] = [e["timestamp"] for e in bucket_events]
+        assert stamps == sorted(stamps, reverse=True)
+
+
+def test_boundary_cases() -> None:
+    """5:00前後の始業と、0:00を越える勤務を含む"""
+    events = SyntheticEvents(date(2025, 1, 1), 365).events["aw-watcher-afk_BENCH-0"]
+    intervals: list[AFKInterval] = AFKEvents(events).intervals
+    hours: set[int] = {i.start.hour for i in intervals}
+    assert 4 in hours and 5 in hours
+    assert any(i.start.hour < 4 for i in intervals)
+
+
+def test_stage_timings_and_regressions(tmp_path: Path) -> None:
+    """全段階を計測でき、閾値を超えた段階だけが劣化として報告される"""
+    synthetic = SyntheticEvents(date(2025, 6, 1), 30)
+    start: datetime = datetime(2025, 6, 1, tzinfo=_TIMEZONE)
+    period: MonthPeriod = MonthPeriod(start, start + timedelta(days=30))
+    stages = StageTimings(synthetic, period, 1).run()
+    assert list(stages) == [
+        "fetch_decode",
+        "intervals",
+        "daily_work",
+        "calendar",
+        "work_days",
+        "html_json",
+        "text",
+        "csv",
+        "snapshot_write",
+        "snapshot_read",
+    ]
+    # 閾値の判定は実測に左右されないよう、固定の所要時間で確かめる
+    fixed: dict[str, float] = {name: 0.01 for name in stages}
+    report = BenchmarkReport({"month": {"stages": fixed}})
+    report.write(tmp_path / "results.json")
+    report.update_thresholds(tmp_path / "thresholds.json")
+    assert report.regressions(tmp_path / "thresholds.json") == []
+    slower = BenchmarkReport({"month": {"stages": {**fixed, "csv": 60.0}}})
+    regressions: list[str] = slower.regressions(tmp_path / "thresholds.json")
+    assert len(regressions) == 1 and regressions[0].startswith("month/csv: 60.0000s")
@@ -0,0 +1,96 @@
+"""チームの勤務集計のテスト"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from aw_work_hours.cli.cli_main import CLIMain
+from aw_work_hours.domain.event_file import EventFile
+from aw_work_hours.domain.month_period import MonthPeriod
+from aw_work_hours.domain.team_work import TeamWork
+from aw_work_hours.domain.work_calendar import WorkCalendar
+from aw_work_hours.output.work_csv import WorkCSV
+from aw_work_hours.types import CLIError
+from conftest import _FIXTURES
+
+_EVENTS: Path = _FIXTURES / "api" / "events" / "2025-03.json"
+
+
+def _team(directory: Path) -> Path:
+    """配列・NDJSON・壊れたファイル・AFK バケットのないエクスポートの4人分"""
+    directory.mkdir()
+    events: list[dict] = json.loads(_EVENTS.read_text())
+    (directory / "alice.json").write_text(_EVENTS.read_text())
+    (directory / "bob.ndjson").write_text(
+        "".join(json.dumps(e) + "\n" for e in events[: len(events) // 2])
+    )
+    (directory / "carol.json").write_text(_EVENTS.read_text()[:3000])
+    # ウィンドウのバケットしかないエクスポート（AFK バケットなし）
+    window: dict = {"id": "aw-watcher-window_Mac", "events": events[:10]}
+    (directory / "dave.json").write_text(
+        json.dumps({"buckets": {"aw-watcher-window_Mac": window}})
+    )
+    (directory / "notes.txt").write_text("not an export")
+    return directory
+
+
+def test_parallel_matches_serial(tmp_path: Path) -> None:
+    """プロセス並列でも1プロセスでも、人ごとの集計と読めなかった人は同じ"""
+    directory: Path = _team(tmp_path / "exports")
+    period: MonthPeriod = MonthPeriod.parse("2025-03")
+    serial: TeamWork = TeamWork(directory, period, 1, None)
+    parallel: TeamWork = TeamWork(directory, period, 3, None)
+    expected: dict = serial.aggregate()
+    actual: dict = parallel.aggregate()
+
+    assert list(actual) == ["alice", "bob"]
+    for person in expected:
+        assert {d: vars(w) for d, w in actual[person].items()} == {
+            d: vars(w) for d, w in expected[person].items()
+        }
+    assert sorted(serial.failures) == sorted(parallel.failures) == ["carol", "dave"]
+    assert "AFKバケットが見つかりません" in serial.failures["dave"]
+
+
+def test_batch_command_writes_combined_csv(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """batch は人の列付きの1つのCSVと人ごとの合計を出し、読めないファイルは警告だけ"""
+    directory: Path = _team(tmp_path / "exports")
+    output: Path = tmp_path / "team.csv"
+    monkeypatch.setattr(WorkCalendar, "_source", None)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["aw-work-hours", "batch", "-i", str(directory), "-m", "2025-03"]
+        + ["-o", str(output), "-j", "2"],
+    )
+    CLIMain().run()
+
+    lines: list[str] = output.read_text(encoding="utf-8-sig").splitlines()
+    monkeypatch.setattr(WorkCalendar, "_source", EventFile(_EVENTS))
+    calendar, daily_work, _ = WorkCalendar.from_period(MonthPeriod.parse("2025-03"))
+    solo: list[str] = (
+        WorkCSV(calendar.work_days(daily_work), MonthPeriod.parse("2025-03"))
+        .content()
+        .splitlines()
+    )
+    captured = capsys.readouterr()
+    assert lines[0] == "person," + solo[0]
+    assert lines[1:32] == ["alice," + row for row in solo[1:]]
+    assert [line.split(",")[0] for line in lines[32:]] == ["bob"] * 31
+    assert [line.split()[0] for line in captured.out.splitlines()] == ["alice", "bob"]
+    assert "carol" in captured.err and "dave" in captured.err
+
+
+def test_rejects_duplicate_names(tmp_path: Path) -> None:
+    """拡張子だけが違うファイルは同じ人になるため、集計せずに CLIError"""
+    directory: Path = _team(tmp_path / "exports")
+    (directory / "alice.ndjson").write_text("")
+
+    with pytest.raises(CLIError, match="alice"):
+        TeamWork(directory, MonthPeriod.parse("2025-03"), 1, None)
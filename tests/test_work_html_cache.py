@@ -0,0 +1,124 @@
+"""/data レスポンスキャッシュのテスト"""
+
+import http.client
+from unittest.mock import patch
+
+import pytest
+
+from aw_work_hours.domain.event_file import EventFile
+from aw_work_hours.domain.month_period import MonthPeriod
+from aw_work_hours.domain.work_calendar import WorkCalendar
+from aw_work_hours.domain.work_rule import WorkRule
+from aw_work_hours.web.content_encoding import ContentEncoding
+from aw_work_hours.web.pooled_http_server import PooledHTTPServer
+from aw_work_hours.web.work_html_cache import WorkHTMLCache
+from aw_work_hours.web.work_html_response import WorkHTMLResponse
+from conftest import _FIXTURES, _get, _mock_api
+
+
+def test_finished_month_is_served_from_cache(server: PooledHTTPServer) -> None:
+    """終了済みの月は再計算せず、同じETagなら304を返す"""
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_mock_api("2025-01"),
+    ) as m:
+        first: http.client.HTTPResponse = _get(server, "/data/2025-01")
+        calls: int = m.call_count
+        etag: str | None = first.getheader("ETag")
+        second: http.client.HTTPResponse = _get(server, "/data/2025-01")
+        revalidated: http.client.HTTPResponse = _get(
+            server, "/data/2025-01", {"If-None-Match": etag or ""}
+        )
+
+    assert first.status == 200
+    assert first.getheader("Cache-Control") == "max-age=31536000, immutable"
+    assert second.getheader("ETag") == etag
+    assert revalidated.status == 304
+    assert m.call_count == calls
+
+
+def test_unfinished_period_is_revalidated(server: PooledHTTPServer) -> None:
+    """終了していない期間はブラウザに毎回ETagで再検証させる（設定のクエリは無視する）"""
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_mock_api("2025-01"),
+    ):
+        resp: http.client.HTTPResponse = _get(
+            server, "/data/all?bucket=&min_event_seconds=150"
+        )
+
+    assert resp.status == 200
+    assert resp.getheader("Cache-Control") == "no-cache"
+
+
+def test_entries_survive_settings_changes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """設定ごとに別のエントリなので、設定を戻せば終了済みの月は計算し直さない"""
+    cache: WorkHTMLCache = WorkHTMLCache()
+    january: MonthPeriod = MonthPeriod.parse("2025-01")
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_mock_api("2025-01"),
+    ) as m:
+        first: tuple[bytes, str, dict[str, bytes]] = cache.entry(january)
+        monkeypatch.setattr(WorkRule, "MIN_EVENT_SECONDS", 60)
+        cache.entry(january)
+        calls: int = m.call_count
+        monkeypatch.setattr(WorkRule, "MIN_EVENT_SECONDS", 150)
+        assert cache.entry(january) == first
+
+    assert m.call_count == calls
+    assert len(cache) == 2
+
+
+def test_data_is_compressed_when_accepted(server: PooledHTTPServer) -> None:
+    """Accept-Encoding に応じて圧縮し、ETagも圧縮形式ごとに区別する"""
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_mock_api("2025-01"),
+    ):
+        plain: http.client.HTTPResponse = _get(server, "/data/2025-01")
+        gzipped: http.client.HTTPResponse = _get(
+            server, "/data/2025-01", {"Accept-Encoding": "gzip"}
+        )
+
+    assert plain.getheader("Content-Encoding") is None
+    assert gzipped.getheader("Content-Encoding") == "gzip"
+    assert gzipped.getheader("ETag") == f'{plain.getheader("ETag")[:-1]}-gzip"'
+
+
+def test_compressed_body_is_kept_with_the_entry(server: PooledHTTPServer) -> None:
+    """圧縮はエントリごとに1回だけ行い、2回目以降はエントリに保持した本文を返す"""
+    with (
+        patch(
+            "aw_work_hours.domain.api_client.APIClient._request",
+            side_effect=_mock_api("2025-01"),
+        ),
+        patch(
+            "aw_work_hours.web.work_http_handler.ContentEncoding.compress",
+            wraps=ContentEncoding.compress,
+        ) as compress,
+    ):
+        first: http.client.HTTPResponse = _get(
+            server, "/data/2025-01", {"Accept-Encoding": "gzip"}
+        )
+        second: http.client.HTTPResponse = _get(
+            server, "/data/2025-01", {"Accept-Encoding": "gzip"}
+        )
+
+    assert compress.call_count == 1
+    assert first.getheader("ETag") == second.getheader("ETag")
+    assert first.getheader("Content-Length") == second.getheader("Content-Length")
+
+
+def test_response_from_computed_inputs(monkeypatch: pytest.MonkeyPatch) -> None:
+    """計算済みの結果を渡すと from_period を呼ばずに同じレスポンスを作る"""
+    period: MonthPeriod = MonthPeriod.parse("2025-03")
+    source: EventFile = EventFile(_FIXTURES / "api" / "events" / "2025-03.json")
+    monkeypatch.setattr(WorkCalendar, "_source", source)
+    computed: tuple = WorkCalendar.from_period(period)
+    expected: dict = WorkHTMLResponse(period).json()
+
+    with patch.object(
+        WorkCalendar, "from_period", side_effect=AssertionError("computed again")
+    ):
+        assert WorkHTMLResponse(period, computed).json() == expected
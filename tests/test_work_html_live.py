@@ -0,0 +1,141 @@
+"""/live のServer-Sent Events のテスト"""
+
+import http.client
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from aw_work_hours.domain.afk_events import AFKEvents
+from aw_work_hours.domain.daily_work import DailyWork
+from aw_work_hours.domain.month_period import MonthPeriod
+from aw_work_hours.domain.work_calendar import WorkCalendar
+from aw_work_hours.domain.work_rule import WorkRule
+from aw_work_hours.types import _TIMEZONE, APIConnectionError, AWEvent
+from aw_work_hours.web.pooled_http_server import PooledHTTPServer
+from aw_work_hours.web.work_html_live import WorkHTMLLive
+from aw_work_hours.web.work_http_handler import WorkHTTPHandler
+from conftest import _event, _get
+
+
+def _payload(message: bytes) -> dict:
+    event, data = message.decode().strip().split("\n")
+    assert event == "event: update"
+    return json.loads(data.removeprefix("data: "))
+
+
+def test_poll_sends_extended_event_and_day_totals() -> None:
+    """延長された区間と、その勤務日の行の集計だけを送る"""
+    now: datetime = datetime.now(_TIMEZONE).replace(microsecond=0)
+    latest: datetime = now - timedelta(minutes=10)
+    started: str = latest.astimezone(timezone.utc).isoformat()
+    initial: AFKEvents = AFKEvents([_event(1, started, 300)])
+    daily_work: DailyWork = DailyWork(initial.intervals)
+    with (
+        patch.object(
+            WorkCalendar,
+            "from_period",
+            return_value=(
+                WorkCalendar.from_blocks(daily_work.blocks),
+                daily_work,
+                initial,
+            ),
+        ),
+        patch("aw_work_hours.domain.afk_bucket.AFKBucket.id", return_value="b"),
+    ):
+        live: WorkHTMLLive = WorkHTMLLive(MonthPeriod.parse("this"))
+    with patch.object(
+        AFKEvents, "fetch", return_value=AFKEvents([_event(1, started, 600)])
+    ):
+        update: dict = _payload(live.poll() or b"")
+    with patch.object(
+        AFKEvents, "fetch", return_value=AFKEvents([_event(1, started, 600)])
+    ):
+        unchanged: bytes | None = live.poll()
+
+    snapshot: dict = _payload(live.snapshot)
+    assert now.date().isoformat() in [r["date"] for r in snapshot["rows"]]
+    assert [r["date"] for r in update["rows"]] == [
+        WorkRule.work_date(latest).isoformat()
+    ]
+    assert "events" not in update["rows"][0]
+    assert sum(e["duration"] for e in update["events"]) == 600
+    assert unchanged is None
+
+
+def test_finished_month_has_no_stream(server: PooledHTTPServer) -> None:
+    """終了済みの月は 204 を返して EventSource に再接続させない"""
+    assert _get(server, "/live/2025-01").status == 204
+
+
+def test_stream_sends_snapshot_then_pings(
+    server: PooledHTTPServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """接続直後に今日の行を送り、変化がない間はコメント行で接続を確かめる"""
+    monkeypatch.setattr(WorkHTTPHandler, "live_interval", 0.01)
+    monkeypatch.setattr(WorkHTTPHandler, "live_seconds", 0.05)
+    live: MagicMock = MagicMock()
+    live.snapshot = b"event: update\ndata: {}\n\n"
+    live.poll.return_value = None
+    with (
+        patch("aw_work_hours.web.work_http_handler.WorkHTMLLive", return_value=live),
+        patch("aw_work_hours.domain.afk_bucket.AFKBucket.ids", return_value=["b"]),
+    ):
+        conn: http.client.HTTPConnection = http.client.HTTPConnection(
+            "127.0.0.1", server.server_address[1]
+        )
+        conn.request("GET", "/live/this")
+        resp: http.client.HTTPResponse = conn.getresponse()
+        body: bytes = resp.read()
+
+    assert resp.getheader("Content-Type") == "text/event-stream; charset=utf-8"
+    assert body.startswith(b"retry: 5000\n\n" + live.snapshot)
+    assert b": ping\n\n" in body
+    assert live.poll.call_count >= 1
+
+
+def _live(httpd: PooledHTTPServer) -> tuple[int, bytes]:
+    conn: http.client.HTTPConnection = http.client.HTTPConnection(
+        "127.0.0.1", httpd.server_address[1]
+    )
+    conn.request("GET", "/live/this")
+    resp: http.client.HTTPResponse = conn.getresponse()
+    return resp.status, resp.read()
+
+
+def test_full_slots_skip_the_month_aggregation(
+    server: PooledHTTPServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """同時接続の枠が埋まっていれば、月全体を集計する前に断る"""
+    # 2ワーカーのサーバーでは /live は1接続まで（残りの1つは /data などのため）
+    assert server.stream_slots.acquire(blocking=False)
+    assert not server.stream_slots.acquire(blocking=False)
+    with (
+        patch("aw_work_hours.web.work_http_handler.WorkHTMLLive") as live,
+        patch("aw_work_hours.domain.afk_bucket.AFKBucket.ids", return_value=["b"]),
+    ):
+        status, body = _live(server)
+
+    server.stream_slots.release()
+    # 503 では EventSource が再接続しないため、retry だけのストリームを返す
+    assert (status, body) == (200, b"retry: 5000\n\n")
+    live.assert_not_called()
+
+
+def test_failed_aggregation_asks_for_a_retry(
+    server: PooledHTTPServer,
+) -> None:
+    """月の集計に失敗しても retry だけのストリームを返し、枠を戻す"""
+    with (
+        patch(
+            "aw_work_hours.web.work_http_handler.WorkHTMLLive",
+            side_effect=APIConnectionError("down"),
+        ),
+        patch("aw_work_hours.domain.afk_bucket.AFKBucket.ids", return_value=["b"]),
+    ):
+        status, body = _live(server)
+
+    assert (status, body) == (200, b"retry: 5000\n\n")
+    assert server.stream_slots.acquire(blocking=False)
+    server.stream_slots.release()
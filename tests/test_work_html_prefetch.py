@@ -0,0 +1,129 @@
+"""/data の先読みのテスト"""
+
+import time
+from collections.abc import Callable
+from unittest.mock import patch
+
+import pytest
+
+from aw_work_hours.domain.afk_bucket import AFKBucket
+from aw_work_hours.domain.event_file import EventFile
+from aw_work_hours.domain.month_period import MonthPeriod
+from aw_work_hours.domain.work_calendar import WorkCalendar
+from aw_work_hours.web.pooled_http_server import PooledHTTPServer
+from aw_work_hours.web.work_html_cache import WorkHTMLCache
+from aw_work_hours.web.work_html_prefetch import WorkHTMLPrefetch
+from aw_work_hours.web.work_html_response import WorkHTMLResponse
+from aw_work_hours.web.work_http_handler import WorkHTTPHandler
+from conftest import _FIXTURES, _get
+
+
+@pytest.fixture(autouse=True)
+def _input_source(monkeypatch: pytest.MonkeyPatch) -> None:
+    """APIの代わりに2025-03のイベント配列から集計する"""
+    source: EventFile = EventFile(_FIXTURES / "api" / "events" / "2025-03.json")
+    monkeypatch.setattr(WorkCalendar, "_source", source)
+    AFKBucket.pin(source.bucket_id)
+
+
+def _wait(condition: Callable[[], bool]) -> bool:
+    deadline: float = time.monotonic() + 5
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_neighbors_are_prefetched(
+    server: PooledHTTPServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """表示した月の前後は裏で計算され、移動したときは計算し直さずに返す"""
+    cache: WorkHTMLCache = WorkHTTPHandler.data_cache
+    prefetch: WorkHTMLPrefetch = WorkHTMLPrefetch(cache)
+    monkeypatch.setattr(WorkHTTPHandler, "prefetch", prefetch)
+    prefetch.start()
+    try:
+        assert _get(server, "/data/2025-03").status == 200
+        assert _wait(lambda: len(cache) == 3)
+    finally:
+        prefetch.stop()
+    with patch.object(
+        WorkHTMLResponse, "json", side_effect=AssertionError("computed again")
+    ):
+        moved = _get(server, "/data/2025-02")
+
+    assert moved.status == 200
+    assert MonthPeriod.parse("2025-04") in cache
+    assert [p.iso for p in MonthPeriod.parse("2025-03").neighbors()] == [
+        MonthPeriod.parse("2025-02").iso,
+        MonthPeriod.parse("2025-04").iso,
+    ]
+    assert len(MonthPeriod.parse("this").neighbors()) == 1
+    assert MonthPeriod.parse("2025-01..2025-03").neighbors() == []
+
+
+def test_current_month_is_refreshed_periodically() -> None:
+    """今月は定期的に計算し直し、その間の表示はキャッシュから返す"""
+    cache: WorkHTMLCache = WorkHTMLCache()
+    prefetch: WorkHTMLPrefetch = WorkHTMLPrefetch(cache, refresh_seconds=0.05)
+    this: MonthPeriod = MonthPeriod.parse("this")
+    prefetch.schedule(this)
+    with patch.object(WorkHTMLCache, "refresh", autospec=True) as refresh:
+        refresh.return_value = (b"{}", '"etag"')
+        prefetch.start()
+        try:
+            assert _wait(lambda: refresh.call_count >= 2)
+        finally:
+            prefetch.stop()
+
+    cache.fresh_seconds = 60
+    first: tuple[bytes, str, dict[str, bytes]] = cache.entry(this)
+    with patch.object(
+        WorkHTMLResponse, "json", side_effect=AssertionError("computed again")
+    ):
+        assert cache.entry(this) == first
+
+
+def test_refresh_stops_when_the_month_is_no_longer_viewed() -> None:
+    """今月への要求が途絶えたら定期更新をやめ、touch で再開する"""
+    cache: WorkHTMLCache = WorkHTMLCache()
+    prefetch: WorkHTMLPrefetch = WorkHTMLPrefetch(cache, refresh_seconds=0.02)
+    this: MonthPeriod = MonthPeriod.parse("this")
+    prefetch.touch(this)
+    with patch.object(WorkHTMLCache, "refresh", autospec=True) as refresh:
+        prefetch.start()
+        try:
+            # 3回分の間隔（0.06秒）を過ぎると、それ以上は計算し直さない
+            time.sleep(0.3)
+            stopped: int = refresh.call_count
+            time.sleep(0.2)
+            assert refresh.call_count == stopped <= 4
+            prefetch.touch(this)
+            assert _wait(lambda: refresh.call_count > stopped)
+        finally:
+            prefetch.stop()
+
+
+def test_unexpected_failure_keeps_the_thread_running(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """想定外の例外でもスレッドは止まらず、失敗した月は次の表示で積み直せる"""
+    cache: WorkHTMLCache = WorkHTMLCache()
+    prefetch: WorkHTMLPrefetch = WorkHTMLPrefetch(cache)
+    errors: list[str] = []
+
+    def warned() -> bool:
+        errors.append(capsys.readouterr().err)
+        return "broken" in "".join(errors)
+
+    prefetch.start()
+    try:
+        with patch.object(WorkHTMLResponse, "json", side_effect=ValueError("broken")):
+            prefetch.schedule(MonthPeriod.parse("2025-03"))
+            assert _wait(warned)
+        # 失敗した月が積まれたままなら、積み直しても計算されない
+        march: MonthPeriod = MonthPeriod.parse("2025-03")
+        assert _wait(
+            lambda: prefetch.schedule(march) or MonthPeriod.parse("2025-04") in cache
+        )
+    finally:
+        prefetch.stop()
@@ -0,0 +1,68 @@
+"""勤務月ごとの並列集計テスト"""
+
+import json
+from datetime import date
+from unittest.mock import patch
+
+from aw_work_hours.domain.afk_bucket import AFKBucket
+from aw_work_hours.domain.month_period import MonthPeriod
+from aw_work_hours.domain.work_calendar import WorkCalendar
+from aw_work_hours.types import AWEvent
+from conftest import _FIXTURES, _event, _mock_api
+
+
+def _all_events() -> list[AWEvent]:
+    """全fixture月のイベントを id で重複排除して1つにまとめる"""
+    events: dict[int, AWEvent] = {}
+    for path in sorted((_FIXTURES / "api" / "events").glob("*.json")):
+        for e in json.loads(path.read_bytes()):
+            events[e["id"]] = e
+    return sorted(events.values(), key=lambda e: e["timestamp"])
+
+
+def test_parallel_matches_serial() -> None:
+    """勤務月ごとの並列集計が全期間の一括集計と完全に一致する"""
+    period: MonthPeriod = MonthPeriod.parse("all")
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_mock_api(_all_events()),
+    ):
+        calendar, daily_work, events = WorkCalendar.from_period(period)
+        parallel, parallel_work, count = WorkCalendar.from_period_parallel(period, 3)
+
+    assert count == len(events.raw)
+    assert parallel.daily == calendar.daily
+    assert parallel_work.blocks == daily_work.blocks
+    assert parallel_work.active == daily_work.active
+    assert parallel_work.gaps == daily_work.gaps
+
+
+def test_two_buckets_overlapping_at_month_boundary() -> None:
+    """勤務月の境界（3/1 5:00）をまたいで2台の区間が重なっても、並列集計は一括集計と一致する"""
+    events: dict[str, list[AWEvent]] = {
+        "aw-watcher-afk_Mac": [
+            _event(3, "2025-03-03T00:00:00+00:00", 3600),
+            # 3/1 4:50〜5:20（JST）: 2月の勤務月の担当
+            _event(2, "2025-02-28T19:50:00+00:00", 1800),
+            _event(1, "2025-02-10T00:00:00+00:00", 3600),
+        ],
+        "aw-watcher-afk_PC-MC2408N0009B.local": [
+            _event(2, "2025-03-04T00:00:00+00:00", 3600),
+            # 3/1 5:10〜5:30（JST）: 3月の勤務月の担当だが、上の区間と重なる
+            _event(1, "2025-02-28T20:10:00+00:00", 1200),
+        ],
+    }
+    AFKBucket.set_preference("Mac, PC-MC2408N0009B.local")
+    period: MonthPeriod = MonthPeriod.parse("all")
+    with patch(
+        "aw_work_hours.domain.api_client.APIClient._request",
+        side_effect=_mock_api(events),
+    ):
+        _, daily_work, _ = WorkCalendar.from_period(period)
+        _, parallel_work, count = WorkCalendar.from_period_parallel(period, 2)
+
+    assert count == 5
+    assert parallel_work.active == daily_work.active
+    assert parallel_work.gaps == daily_work.gaps
+    assert parallel_work.blocks == daily_work.blocks
+    assert daily_work.active[date(2025, 2, 28)] == 2400
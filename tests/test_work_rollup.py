@@ -0,0 +1,105 @@
+"""月範囲と日別集計キャッシュのテスト"""
+
+import json
+from datetime import date
+from unittest.mock import patch
+
+from aw_work_hours.domain.holiday_calendar import HolidayCalendar
+from aw_work_hours.domain.month_period import MonthPeriod
+from aw_work_hours.domain.work_calendar import WorkCalendar
+from aw_work_hours.domain.work_day import WorkDay
+from aw_work_hours.domain.work_rollup import WorkRollup
+from aw_work_hours.domain.work_rule import WorkRule
+from aw_work_hours.output.work_text import WorkText
+from aw_work_hours.types import AWEvent
+from conftest import _FIXTURES, _load_fixture, _mock_api
+
+_RANGE: str = "2025-01..2025-02"
+_BUCKET: str = "aw-watcher-afk_PC-MC2408N0009B.local"
+
+
+def _range_events() -> list[AWEvent]:
+    """1月・2月の fixture をつないだイベント列（月境界で切れた重複イベントは除く）"""
+    return json.loads(_load_fixture("api/events/2025-02.json"))[:-1] + json.loads(
+        _load_fixture("api/events/2025-01.json")
+    )
+
+
+def _days(fetched: list[str]) -> tuple[dict[date, WorkDay], int]:
+    """範囲の集計（fetched にはイベントから集計し直した期間の開始時刻を追加）"""
+    with (
+        patch(
+            "aw_work_hours.domain.api_client.APIClient._request",
+            side_effect=_mock_api(_range_events()),
+        ),
+        patch.object(
+            WorkCalendar, "from_period", wraps=WorkCalendar.from_period
+        ) as from_period,
+    ):
+        result: tuple[dict[date, WorkDay], int] = WorkRollup(_BUCKET).days(
+            MonthPeriod.parse(_RANGE)
+        )
+    fetched += [c.args[0].iso[0] for c in from_period.call_args_list]
+    return result
+
+
+def test_range_matches_single_months() -> None:
+    """月範囲の日別の行は、各月を個別に出力した行と一致する"""
+    days, recomputed = _days([])
+    text: str = WorkText(days, MonthPeriod.parse(_RANGE), HolidayCalendar()).content()
+
+    expected: list[str] = [
+        line
+        for month in ("2025-01", "2025-02")
+        for line in (_FIXTURES / "expected" / f"{month}.txt").read_text().splitlines()
+    ]
+    assert recomputed == 31 + 28
+    assert [line for line in text.splitlines() if line[:10].count("-") == 2] == expected
+
+
+def test_settled_days_are_read_from_rollup() -> None:
+    """2回目は最後の勤務日だけを集計し直し、それ以外は保存済みの集計を使う"""
+    first, _ = _days([])
+    fetched: list[str] = []
+    second, recomputed = _days(fetched)
+
+    # 最後の勤務ブロックは延長されうるため、その日（と前日からの続き）だけを集計する
+    assert recomputed == 1
+    assert fetched == ["2025-02-27T00:00:00+09:00"]
+    assert {d: vars(w) for d, w in second.items()} == {
+        d: vars(w) for d, w in first.items()
+    }
+
+
+def test_rollup_is_keyed_by_rule() -> None:
+    """判定パラメーターが変わると保存済みの集計は使わない"""
+    _days([])
+    WorkRule.MIN_EVENT_SECONDS = 60
+    _, recomputed = _days([])
+
+    assert recomputed == 31 + 28
+
+
+def test_subtotals_follow_weeks_and_months() -> None:
+    """日曜と月末の後に小計、末尾に合計を出す"""
+    days, _ = _days([])
+    lines: list[str] = (
+        WorkText(days, MonthPeriod.parse(_RANGE), HolidayCalendar())
+        .content()
+        .splitlines()
+    )
+
+    sunday: int = next(
+        i for i, line in enumerate(lines) if line.startswith("2025-01-05")
+    )
+    month_end: int = next(
+        i for i, line in enumerate(lines) if line.startswith("2025-01-31")
+    )
+    assert lines[sunday + 1].startswith("  週計")
+    assert lines[month_end + 1].startswith("2025-01 月計")
+    assert [line.split()[0] for line in lines if "月計" in line] == [
+        "2025-01",
+        "2025-02",
+    ]
+    total: float = round(sum(w.span for d, w in days.items() if d.year == 2025), 1)
+    assert lines[-1].startswith(f"合計   {len(days)}日   ({total:.1f}h)")
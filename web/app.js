@@ -1,4 +1,13 @@
 let noColon = false;
+// /data のクエリ（終了済みの月はブラウザが保持するので、集計に効く設定ごとにURLを分ける）
+let dataQuery = '';
+
+function setDataQuery(settings) {
+    dataQuery = new URLSearchParams({
+        bucket: settings.bucket || '',
+        min_event_seconds: settings.min_event_seconds
+    }).toString();
+}
 
 function formatTime(h, m) {
     const sep = noColon ? '' : ':';
@@ -49,14 +58,59 @@ async function loadMonth(ym) {
     status.textContent = '読み込み中...';
     let data;
     try {
-        const res = await fetch(`/data/${ym}`);
+        const res = await fetch(`/data/${ym}?${dataQuery}`);
         data = await res.json();
     } catch (e) {
         status.textContent = 'エラー: データを取得できません';
         return;
     }
-    status.textContent = `勤務: ${data.rows.filter(r => r.hasWork).length}日`;
+    currentRows = data.rows;
+    showStatus();
     render(data.rows);
+    connectLive(ym);
+}
+
+function showStatus() {
+    const status = document.getElementById('status');
+    status.textContent = `勤務: ${currentRows.filter(r => r.hasWork).length}日`;
+}
+
+// 開いている月の差分（/live の Server-Sent Events）で変わった行だけを描き直す
+let liveSource = null;
+let currentRows = [];
+
+function connectLive(ym) {
+    if (liveSource) liveSource.close();
+    // 終了済みの月は 204 が返り、EventSource は再接続しない
+    liveSource = new EventSource(`/live/${ym}`);
+    liveSource.addEventListener('update', e => applyUpdate(JSON.parse(e.data)));
+}
+
+function applyUpdate(update) {
+    const index = new Map(currentRows.map((r, i) => [r.date, i]));
+    const touched = new Set();
+    for (const row of update.rows) {
+        const i = index.get(row.date);
+        if (i === undefined) continue;
+        currentRows[i] = {...row, events: row.events ?? currentRows[i].events};
+        touched.add(i);
+    }
+    for (const {date, ...event} of update.events) {
+        const i = index.get(date);
+        if (i === undefined) continue;
+        // 延長されたイベントは開始時刻が同じ既存のバーを置き換える
+        const events = currentRows[i].events;
+        const j = events.findIndex(e => e.startH === event.startH && e.startM === event.startM && e.startS === event.startS);
+        if (j === -1) events.push(event); else events[j] = event;
+        touched.add(i);
+    }
+    const table = document.getElementById('table');
+    for (const i of touched) {
+        // 1行目は時刻ラベル
+        table.rows[i + 1].outerHTML = rowHTML(currentRows[i]);
+        bindRow(table.rows[i + 1]);
+    }
+    if (touched.size) showStatus();
 }
 
 function render(rows) {
@@ -64,42 +118,48 @@ function render(rows) {
     let html = '<tr class="hour-labels"><td></td><td></td><td></td><td></td><td><div>';
     for (let h = 0; h < 24; h += 4) html += `<span>${String(h).padStart(2,'0')}:00</span>`;
     html += '</div></td></tr>';
-    for (const row of rows) {
-        const holClass = row.holiday ? ' class="holiday"' : '';
-        const holMark = row.holiday ? '*' : '';
-        const dateCol = `${row.date} ${row.weekday}${holMark}`;
-        let timeCol = '', durCol = '', afkCol = '';
-        if (row.hasWork) {
-            const startRaw = rawTime(row.startH, row.startM);
-            const endRaw = rawTime(row.endH, row.endM);
-            timeCol = `<span class="time-copy cursor-pointer hover:bg-yellow-100 rounded px-0.5" data-copy="${startRaw}">${formatTime(row.startH, row.startM)}</span> - <span class="time-copy cursor-pointer hover:bg-yellow-100 rounded px-0.5" data-copy="${endRaw}">${formatTime(row.endH, row.endM)}</span>`;
-            durCol = `(${row.span.toFixed(1)}h)`;
-            if (row.afk !== undefined) afkCol = `-${row.afk.toFixed(1)}h (max:-${row.maxGap.toFixed(1)}h)`;
-        }
-        const hourMarks = [4,8,12,16,20].map(h => `<div class="hour-mark" style="left:${(h/24)*100}%"></div>`).join('');
-        let eventBars = '';
-        for (const ev of row.events || []) {
-            const startSec = ev.startH * 3600 + ev.startM * 60 + ev.startS;
-            const endSec = ev.endH * 3600 + ev.endM * 60 + ev.endS;
-            const left = (startSec / 86400) * 100;
-            const width = Math.max(0.1, ((endSec - startSec) / 86400) * 100);
-            const startTime = `${String(ev.startH).padStart(2,'0')}:${String(ev.startM).padStart(2,'0')}:${String(ev.startS).padStart(2,'0')}`;
-            const endTime = `${String(ev.endH).padStart(2,'0')}:${String(ev.endM).padStart(2,'0')}:${String(ev.endS).padStart(2,'0')}`;
-            eventBars += `<div class="event" style="left:${left.toFixed(2)}%;width:${width.toFixed(2)}%;">
+    html += rows.map(rowHTML).join('');
+    table.innerHTML = html;
+    bindRow(table);
+}
+
+function rowHTML(row) {
+    const holClass = row.holiday ? ' class="holiday"' : '';
+    const holMark = row.holiday ? '*' : '';
+    const dateCol = `${row.date} ${row.weekday}${holMark}`;
+    let timeCol = '', durCol = '', afkCol = '';
+    if (row.hasWork) {
+        const startRaw = rawTime(row.startH, row.startM);
+        const endRaw = rawTime(row.endH, row.endM);
+        timeCol = `<span class="time-copy cursor-pointer hover:bg-yellow-100 rounded px-0.5" data-copy="${startRaw}">${formatTime(row.startH, row.startM)}</span> - <span class="time-copy cursor-pointer hover:bg-yellow-100 rounded px-0.5" data-copy="${endRaw}">${formatTime(row.endH, row.endM)}</span>`;
+        durCol = `(${row.span.toFixed(1)}h)`;
+        if (row.afk !== undefined) afkCol = `-${row.afk.toFixed(1)}h (max:-${row.maxGap.toFixed(1)}h)`;
+    }
+    const hourMarks = [4,8,12,16,20].map(h => `<div class="hour-mark" style="left:${(h/24)*100}%"></div>`).join('');
+    let eventBars = '';
+    for (const ev of row.events || []) {
+        const startSec = ev.startH * 3600 + ev.startM * 60 + ev.startS;
+        const endSec = ev.endH * 3600 + ev.endM * 60 + ev.endS;
+        const left = (startSec / 86400) * 100;
+        const width = Math.max(0.1, ((endSec - startSec) / 86400) * 100);
+        const startTime = `${String(ev.startH).padStart(2,'0')}:${String(ev.startM).padStart(2,'0')}:${String(ev.startS).padStart(2,'0')}`;
+        const endTime = `${String(ev.endH).padStart(2,'0')}:${String(ev.endM).padStart(2,'0')}:${String(ev.endS).padStart(2,'0')}`;
+        eventBars += `<div class="event" style="left:${left.toFixed(2)}%;width:${width.toFixed(2)}%;">
 <div class="tooltip">
 <div class="tooltip-row"><span class="tooltip-label">Start</span>${startTime}</div>
 <div class="tooltip-row"><span class="tooltip-label">Stop</span>${endTime}</div>
 <div class="tooltip-row"><span class="tooltip-label">Duration</span>${formatDuration(ev.duration)}</div>
 <div class="tooltip-row"><span class="tooltip-label">Data</span>${JSON.stringify(ev.data)}</div>
 </div></div>`;
-        }
-        html += `<tr${holClass}><td class="date">${dateCol}</td><td class="time">${timeCol}</td><td class="dur">${durCol}</td><td class="afk">${afkCol}</td><td class="timeline-cell"><div class="timeline"><div class="hour-marks">${hourMarks}</div>${eventBars}</div></td></tr>`;
     }
-    table.innerHTML = html;
-    document.querySelectorAll('.time-copy').forEach(el => {
+    return `<tr${holClass}><td class="date">${dateCol}</td><td class="time">${timeCol}</td><td class="dur">${durCol}</td><td class="afk">${afkCol}</td><td class="timeline-cell"><div class="timeline"><div class="hour-marks">${hourMarks}</div>${eventBars}</div></td></tr>`;
+}
+
+function bindRow(root) {
+    root.querySelectorAll('.time-copy').forEach(el => {
         el.addEventListener('click', () => copyTime(el.dataset.copy));
     });
-    document.querySelectorAll('.event').forEach(el => {
+    root.querySelectorAll('.event').forEach(el => {
         const tooltip = el.querySelector('.tooltip');
         el.addEventListener('mouseenter', () => {
             tooltip.style.display = 'block';
@@ -140,11 +200,17 @@ async function openSettings() {
         document.getElementById('s-min-event').value = settings.min_event_seconds;
         const sel = document.getElementById('s-bucket');
         sel.innerHTML = '<option value="">自動選択</option>';
-        for (const h of buckets) {
+        const choices = buckets.map(h => [h, h]);
+        // 複数PCの合算（all またはカンマ区切りの設定値）
+        if (buckets.length > 1) choices.push(['all', 'すべてのPCを合算']);
+        if (settings.bucket && !choices.some(([v]) => v === settings.bucket)) {
+            choices.push([settings.bucket, settings.bucket]);
+        }
+        for (const [value, label] of choices) {
             const opt = document.createElement('option');
-            opt.value = h;
-            opt.textContent = h;
-            if (settings.bucket === h) opt.selected = true;
+            opt.value = value;
+            opt.textContent = label;
+            if (settings.bucket === value) opt.selected = true;
             sel.appendChild(opt);
         }
     } catch (e) {
@@ -166,6 +232,7 @@ async function saveSettings() {
         });
         const saved = await res.json();
         noColon = saved.no_colon;
+        setDataQuery(saved);
         document.getElementById('noColon').checked = noColon;
         hideDialog();
         loadMonth(document.getElementById('month').value);
@@ -194,6 +261,7 @@ async function init() {
         const res = await fetch('/settings');
         const settings = await res.json();
         noColon = settings.no_colon;
+        setDataQuery(settings);
         document.getElementById('noColon').checked = noColon;
     } catch (e) {
         // use defaults